@@ -0,0 +1,213 @@
+# =====================================================================
+# METEOR DODGER - FRAME ANIMATION
+# =====================================================================
+# Plays image sequences such as 'images/explosion/0.png' ... '20.png'.
+# Each sequence is gathered from the asset registry once into a shared
+# FrameStrip (scaled to the size it is shown at, with an optional
+# collision mask per frame). Animated sprites only hold an index into a
+# strip, so advancing an animation is an integer step and drawing it is a
+# single blit; explosions are additionally recycled through an object pool
+# so a burst of them allocates nothing.
+
+# --- Third-Party Imports ---
+import pygame  # Used for sprites and scaling frames.
+
+# --- Local Application Imports ---
+import collisionEngine as cE
+import objectPool as oP
+
+
+class FrameStrip:
+    """An ordered, immutable sequence of animation frames that is shared by every sprite playing it."""
+
+    def __init__(self, frames, masks=None):
+        """
+        Initializes the strip.
+
+        Args:
+            frames (list): The frame surfaces, in playback order. All frames should be the same size.
+            masks (list): One collision mask per frame, or None if the strip is never collided with.
+        """
+        self.frames = tuple(frames)
+        self.masks = tuple(masks) if masks is not None else None
+        self.size = self.frames[0].get_size()
+
+    def __len__(self):
+        return len(self.frames)
+
+
+def frameNumber(name):
+    """Returns the frame number of an image name like 'explosion/12.png', used to sort frames."""
+    stem = name.rsplit('/', 1)[-1].rsplit('.', 1)[0]
+    return int(stem) if stem.isdigit() else stem
+
+
+# Every strip built so far, keyed by (folder or names, size, withMasks).
+strips = {}
+
+
+def loadStrip(assets, source, size=None, withMasks=False):
+    """
+    Returns the shared frame strip for an image sequence, building it on first use.
+
+    Args:
+        assets (AssetRegistry): The registry holding the decoded images.
+        source (str | tuple): A folder inside 'images' whose numbered images are the
+            frames (e.g., 'explosion'), or a tuple of image names in playback order.
+        size (tuple): The (width, height) to scale every frame to. None keeps the original size.
+        withMasks (bool): Whether to build a collision mask for every frame.
+
+    Returns:
+        FrameStrip: The strip, shared with every other caller asking for the same one.
+    """
+    key = (source, size, withMasks)
+    strip = strips.get(key)
+    if strip is not None:
+        return strip
+
+    # 1. Find the frames, in numeric order for a folder ('2.png' before '10.png').
+    if isinstance(source, str):
+        prefix = source.rstrip('/') + '/'
+        names = sorted((name for name in assets.surfaces if name.startswith(prefix)), key=frameNumber)
+    else:
+        names = list(source)
+    if not names:
+        raise ValueError(f"No animation frames found for {source!r}")
+
+    # 2. Scale the frames once, here, so playing them never has to.
+    frames = [assets.get(name) for name in names]
+    if size is not None:
+        frames = [frame if frame.get_size() == tuple(size) else pygame.transform.smoothscale(frame, size)
+                  for frame in frames]
+
+    # 3. Optionally build (and share through the mask cache) one collision mask per frame.
+    masks = [cE.masks.get(frame) for frame in frames] if withMasks else None
+
+    strip = FrameStrip(frames, masks)
+    strips[key] = strip
+    return strip
+
+
+class Animator:
+    """
+    Steps through a frame strip at a fixed frame rate, looping or playing once.
+
+    The animator only keeps an index and the time spent on the current frame,
+    so advancing it allocates nothing.
+    """
+
+    def __init__(self, strip, frameRate, loop=True):
+        """
+        Initializes the animator on the first frame.
+
+        Args:
+            strip (FrameStrip): The frames to play.
+            frameRate (float): Frames per second.
+            loop (bool): Whether to start over after the last frame, or stop on it.
+        """
+        self.strip = strip
+        self.frameTime = 1 / frameRate
+        self.loop = loop
+        self.index = 0
+        self.elapsed = 0.0
+        self.finished = False
+
+    def restart(self):
+        """Goes back to the first frame."""
+        self.index = 0
+        self.elapsed = 0.0
+        self.finished = False
+
+    def advance(self, dt):
+        """
+        Moves the animation forward in time.
+
+        Args:
+            dt (float): The time in seconds that passed.
+
+        Returns:
+            bool: True if the current frame changed.
+        """
+        if self.finished:
+            return False
+        self.elapsed += dt
+        if self.elapsed < self.frameTime:
+            return False
+
+        # Skip as many frames as the time covers, carrying the remainder over.
+        steps = int(self.elapsed / self.frameTime)
+        self.elapsed -= steps * self.frameTime
+        count = len(self.strip)
+        index = self.index + steps
+        if index >= count:
+            if self.loop:
+                index %= count
+            else:
+                # Stop on the last frame. The animation only finishes when time runs past a
+                # last frame that was already shown, so it is never skipped.
+                self.finished = self.index == count - 1
+                index = count - 1
+        changed = index != self.index
+        self.index = index
+        return changed
+
+    @property
+    def image(self):
+        """The current frame."""
+        return self.strip.frames[self.index]
+
+    @property
+    def mask(self):
+        """The current frame's collision mask (the strip must have been built with masks)."""
+        return self.strip.masks[self.index]
+
+
+class Explosion(oP.Pooled, pygame.sprite.Sprite):
+    """
+    A short-lived explosion that plays a frame strip once and then returns to its pool.
+
+    Explosions are purely visual: they don't collide with anything.
+    """
+
+    def __init__(self, strip, frameRate):
+        """
+        Initializes the explosion.
+
+        Args:
+            strip (FrameStrip): The explosion frames.
+            frameRate (float): Frames per second.
+        """
+        super().__init__()
+        self.animator = Animator(strip, frameRate, loop=False)
+        self.image = strip.frames[0]
+        # A float-based rectangle, reused for every explosion this object plays.
+        self.rect = self.image.get_frect()
+        self.reset((0, 0))
+
+    def reset(self, center):
+        """
+        Restarts the explosion at a new position. Called by the explosion pool on reuse.
+
+        Args:
+            center (tuple): The (x, y) center of the explosion.
+        """
+        self.animator.restart()
+        self.image = self.animator.image
+        # Start from the origin, so a reused explosion lands exactly where a new one would.
+        self.rect.topleft = (0, 0)
+        self.rect.center = center
+        # Explosions don't move, so there is nothing to interpolate.
+        self.previous = self.rect.topleft
+
+    def update(self, dt):
+        """
+        Advances the explosion and removes it after its last frame.
+
+        Args:
+            dt (float): Delta time, for frame-rate independent playback.
+        """
+        animator = self.animator
+        if animator.advance(dt):
+            self.image = animator.image
+        if animator.finished:
+            self.kill()
@@ -0,0 +1,279 @@
+# =====================================================================
+# METEOR DODGER - ASSET PACK
+# =====================================================================
+# Packs every image into a single archive of ready-to-use pixel data, so
+# startup opens one file instead of decoding dozens of PNGs. For each
+# image the archive holds its raw 32-bit BGRA pixels (the layout pygame
+# converts alpha images to) and its collision mask as an 8-bit plane.
+# At runtime the archive is memory-mapped and surfaces are built straight
+# from the mapped bytes, with no PNG decoding at all.
+#
+# The archive records the size and modification time of every source
+# image. If any image changed, was added or was removed, the archive is
+# considered stale and the game falls back to decoding the PNGs.
+#
+# Build it (from the 'code' directory) after changing any image:
+#     python assetPack.py
+#
+# File layout (little-endian):
+#   header:  magic b'MDAP', format version (uint16), index length (uint32)
+#   index:   UTF-8 JSON list with one entry per image (name, size, offsets, source stamp)
+#   data:    starts at the next multiple of 16 bytes; holds the pixel buffers and
+#            mask planes, each aligned to 16 bytes (index offsets are relative to it)
+
+# --- Standard Library Imports ---
+import json  # Used for the archive's index.
+import mmap  # Used to map the archive into memory instead of reading it.
+import os  # Used to walk the images directory and read file stamps.
+import struct  # Used to pack the fixed-size file header.
+from os import path  # Used for creating operating-system-independent file paths.
+
+# --- Third-Party Imports ---
+import pygame  # Used to decode images, build surfaces and build collision masks.
+
+# --- Local Application Imports ---
+import gameSettings as gS
+
+# The project's root directory.
+projectRoot = path.dirname(path.dirname(path.abspath(__file__)))
+
+
+def packPath(fileName):
+    """Returns the archive location for an 'assetPackFile' setting, or None if it is not set."""
+    return path.join(projectRoot, fileName) if fileName else None
+
+
+# The archive location from gameSettings.py.
+defaultPackPath = packPath(gS.assetPackFile)
+
+# The file signature and format version written at the start of every archive.
+magic = b'MDAP'
+formatVersion = 1
+headerFormat = '<4sHI'
+headerSize = struct.calcsize(headerFormat)
+# Every buffer starts at a multiple of this many bytes.
+alignment = 16
+# The byte order of the stored pixels.
+pixelFormat = 'BGRA'
+
+# File extensions that are treated as images.
+imageExtensions = ('.png',)
+
+
+def findImages(root):
+    """
+    Lists every image below a directory.
+
+    Args:
+        root (str): The images directory.
+
+    Returns:
+        dict: Maps each image name (its path relative to 'root' with '/' separators,
+            e.g., 'explosion/0.png') to its full file path, in sorted name order.
+    """
+    images = {}
+    for folder, _, files in os.walk(root):
+        for fileName in files:
+            if fileName.lower().endswith(imageExtensions):
+                filePath = path.join(folder, fileName)
+                images[path.relpath(filePath, root).replace(os.sep, '/')] = filePath
+    return dict(sorted(images.items()))
+
+
+def dataOffset(indexLength):
+    """Returns where the data area starts in an archive whose index is 'indexLength' bytes long."""
+    end = headerSize + indexLength
+    return end + (-end % alignment)
+
+
+def sourceStamp(filePath):
+    """Returns the (size, modification time) pair used to notice that a source image changed."""
+    stat = os.stat(filePath)
+    return [stat.st_size, stat.st_mtime_ns]
+
+
+def buildPack(root, packPath):
+    """
+    Decodes every image below 'root' and writes them into an archive.
+
+    Args:
+        root (str): The images directory.
+        packPath (str): The archive file to write.
+
+    Returns:
+        int: The number of images packed.
+    """
+    index = []
+    blobs = []
+    position = 0
+
+    def addBlob(data):
+        # Place the buffer at the next aligned position and return its (offset, size) in the data area.
+        nonlocal position
+        padding = -position % alignment
+        blobs.append(b'\0' * padding)
+        position += padding
+        offset = position
+        blobs.append(data)
+        position += len(data)
+        return [offset, len(data)]
+
+    for name, filePath in findImages(root).items():
+        # 1. Decode the image and keep its straight-alpha pixels.
+        image = pygame.image.load(filePath)
+        pixels = pygame.image.tobytes(image, pixelFormat)
+
+        # 2. The collision mask as one byte per pixel (1 = solid), built the same way the game does.
+        mask = pygame.mask.from_surface(image)
+        maskSurface = mask.to_surface(setcolor=(1, 1, 1, 255), unsetcolor=(0, 0, 0, 255))
+        plane = pygame.image.tobytes(maskSurface, 'RGB')[::3]
+
+        index.append({
+            'name': name,
+            'size': list(image.get_size()),
+            'pixels': addBlob(pixels),
+            'mask': addBlob(plane),
+            'source': sourceStamp(filePath),
+        })
+
+    # 3. Write the header, the index and the data. Offsets in the index are relative to the data start.
+    indexBytes = json.dumps(index).encode('utf-8')
+    dataStart = dataOffset(len(indexBytes))
+
+    folder = path.dirname(packPath)
+    if folder:
+        os.makedirs(folder, exist_ok=True)
+    with open(packPath, 'wb') as f:
+        f.write(struct.pack(headerFormat, magic, formatVersion, len(indexBytes)))
+        f.write(indexBytes)
+        f.write(b'\0' * (dataStart - headerSize - len(indexBytes)))
+        for blob in blobs:
+            f.write(blob)
+    return len(index)
+
+
+class AssetPack:
+    """A memory-mapped asset archive that builds surfaces and masks straight from its bytes."""
+
+    def __init__(self, filePath):
+        """
+        Opens and maps an archive.
+
+        Args:
+            filePath (str): The archive file.
+
+        Raises:
+            ValueError: If the file is not an asset pack or uses an unknown format version.
+        """
+        self.filePath = filePath
+        with open(filePath, 'rb') as f:
+            self.map = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        self.view = memoryview(self.map)
+
+        if len(self.map) < headerSize:
+            self.close()
+            raise ValueError("Not an asset pack: too short")
+        fileMagic, version, indexLength = struct.unpack_from(headerFormat, self.map)
+        if fileMagic != magic or version != formatVersion:
+            self.close()
+            raise ValueError(f"Not a supported asset pack: {filePath}")
+        index = json.loads(bytes(self.view[headerSize:headerSize + indexLength]))
+        self.entries = {entry['name']: entry for entry in index}
+        self.dataStart = dataOffset(indexLength)
+
+    @classmethod
+    def open(cls, filePath):
+        """Opens an archive, or returns None if there is no usable archive at that path."""
+        if not filePath or not path.exists(filePath):
+            return None
+        try:
+            return cls(filePath)
+        except (OSError, ValueError) as error:
+            print(f"Warning: Ignoring asset pack '{filePath}' ({error}).")
+            return None
+
+    def isCurrent(self, sources):
+        """
+        Checks that the archive holds exactly the given images, unchanged since it was built.
+
+        Args:
+            sources (dict): Maps image names to their file paths, as returned by findImages().
+
+        Returns:
+            bool: True if the archive can be used instead of the source files.
+        """
+        if sources.keys() != self.entries.keys():
+            return False
+        return all(sourceStamp(filePath) == self.entries[name]['source'] for name, filePath in sources.items())
+
+    def _buffer(self, location):
+        """Returns a zero-copy view of one buffer in the mapped file."""
+        offset, size = location
+        offset += self.dataStart
+        return self.view[offset:offset + size]
+
+    def surface(self, name):
+        """
+        Builds the display-optimized surface for an image from the mapped pixels.
+
+        A display mode must have been set before calling this.
+
+        Args:
+            name (str): The image name.
+
+        Returns:
+            pygame.Surface: A surface that owns its pixels (it doesn't reference the archive).
+        """
+        entry = self.entries[name]
+        buffer = self._buffer(entry['pixels'])
+        mapped = pygame.image.frombuffer(buffer, entry['size'], pixelFormat)
+        # The stored layout already matches the usual display format, so this is a plain copy.
+        surface = mapped.convert_alpha()
+        del mapped
+        buffer.release()
+        return surface
+
+    def mask(self, name):
+        """
+        Builds an image's collision mask from its stored 8-bit plane.
+
+        Args:
+            name (str): The image name.
+
+        Returns:
+            pygame.mask.Mask: The mask, identical to one built from the image's alpha.
+        """
+        entry = self.entries[name]
+        buffer = self._buffer(entry['mask'])
+        # An 8-bit surface whose colorkey is 0: every non-zero pixel becomes a set mask bit.
+        plane = pygame.image.frombuffer(buffer, entry['size'], 'P')
+        plane.set_colorkey(0)
+        mask = pygame.mask.from_surface(plane)
+        del plane
+        buffer.release()
+        return mask
+
+    def close(self):
+        """Unmaps the archive. Surfaces and masks already built stay valid."""
+        self.view.release()
+        self.map.close()
+
+
+def main():
+    """Command-line entry point: rebuilds the asset pack from the images directory."""
+    # Decoding doesn't need a window, so use SDL's dummy video driver.
+    os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+    os.environ.setdefault('PYGAME_HIDE_SUPPORT_PROMPT', '1')
+    pygame.display.init()
+    pygame.display.set_mode((1, 1))
+
+    if defaultPackPath is None:
+        print("assetPackFile is not set in gameSettings.py; nothing to build.")
+        return
+    count = buildPack(path.join(projectRoot, 'images'), defaultPackPath)
+    print(f"Packed {count} images into {defaultPackPath} ({path.getsize(defaultPackPath)} bytes)")
+    pygame.quit()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,181 @@
+# =====================================================================
+# METEOR DODGER - BACKGROUND COMPOSITOR
+# =====================================================================
+# Pre-renders everything behind the moving sprites (fill color, starfield
+# and sidebars) into one opaque surface in the display's pixel format, so
+# drawing the background costs a single blit per frame. The surface is
+# only rebuilt when one of the settings it depends on changes.
+#
+# Optional parallax star layers are rendered once into their own cached
+# surfaces and scrolled by blitting two offset slices of each layer.
+#
+# Everything is laid out in logical (screenSize) coordinates and then
+# scaled once to the render target's resolution.
+
+# --- Standard Library Imports ---
+import random  # Used to place the stars of the parallax layers.
+
+# --- Third-Party Imports ---
+import pygame  # Used for building and blitting the cached surfaces.
+
+# --- Local Application Imports ---
+import gameSettings as gS
+
+# The color used as the transparent color key of the parallax layers.
+transparentKey = (255, 0, 255)
+
+
+def settingsKey():
+    """Returns the settings the background depends on, to detect when it must be rebuilt."""
+    return (
+        gS.screenSize,
+        gS.screenColor,
+        gS.numberOfStars,
+        gS.randomSeed,
+        tuple(gS.parallaxSpeeds),
+        gS.starsPerParallaxLayer,
+    )
+
+
+class BackgroundCompositor:
+    """
+    Builds and draws the cached background and the sidebar overlay.
+
+    The sidebars sit on top of the sprites, so besides being part of the
+    background they are also kept as an overlay. The overlay is split into
+    one small strip per sidebar so covering the sprites costs only the area
+    of the sidebars rather than a full-screen alpha blit.
+    """
+
+    def __init__(self, stars, sidebarImage, target=None):
+        """
+        Initializes the compositor and builds the cached surfaces.
+
+        Args:
+            stars (Stars): The static starfield drawn into the background.
+            sidebarImage (pygame.Surface): The full-screen sidebar image with transparency.
+            target (RenderTarget): The render target whose resolution the surfaces are
+                built at. None keeps them at screenSize.
+        """
+        self.stars = stars
+        self.sidebarImage = sidebarImage
+        self.target = target
+        # The settings used for the last build, and a counter bumped on every build.
+        self.key = None
+        self.version = 0
+        self.refresh()
+
+    @property
+    def animated(self):
+        """True when parallax layers are scrolling, so the background changes every frame."""
+        return bool(self.layers)
+
+    def refresh(self):
+        """
+        Rebuilds the cached surfaces if the settings changed since the last build.
+
+        Returns:
+            bool: True if the background was rebuilt.
+        """
+        key = settingsKey()
+        if key == self.key:
+            return False
+        self.key = key
+        self.build()
+        return True
+
+    def build(self):
+        """Renders the background, the sidebar overlay and any parallax layers."""
+        size = gS.screenSize
+
+        # 1. Sidebar overlay: every pixel is made either fully opaque or fully
+        # transparent, so blending it over the same pixel twice changes nothing.
+        opaqueSidebars = pygame.Surface(size, pygame.SRCALPHA)
+        opaqueSidebars.blit(self.sidebarImage.convert(), (0, 0))
+        sidebarMask = pygame.mask.from_surface(self.sidebarImage, 127)
+        self.overlay = sidebarMask.to_surface(
+            pygame.Surface(size, pygame.SRCALPHA),
+            setsurface=opaqueSidebars,
+            unsetcolor=(0, 0, 0, 0),
+        ).convert_alpha()
+
+        # Scaled without filtering, so its pixels stay fully opaque or fully transparent.
+        self.overlay = self._fit(self.overlay, smooth=False)
+        size = self.overlay.get_size()
+
+        # Crop the overlay to the visible part of each half of the screen.
+        self.overlayStrips = []
+        halfWidth = size[0] // 2
+        for half in (pygame.Rect(0, 0, halfWidth, size[1]), pygame.Rect(halfWidth, 0, size[0] - halfWidth, size[1])):
+            bounds = self.overlay.subsurface(half).get_bounding_rect()
+            if bounds.width and bounds.height:
+                bounds.move_ip(half.topleft)
+                self.overlayStrips.append((self.overlay.subsurface(bounds), bounds.topleft))
+
+        # 2. Parallax layers: each one is a full-height strip of stars scrolled on its own.
+        self.layers = []
+        for index, speed in enumerate(gS.parallaxSpeeds):
+            layer = pygame.Surface(gS.screenSize).convert()
+            if index == 0:
+                # The deepest layer is opaque and carries the fill color.
+                layer.fill(gS.screenColor)
+            else:
+                layer.fill(transparentKey)
+                layer.set_colorkey(transparentKey)
+            self._scatterStars(layer, random.Random(gS.randomSeed + index + 1))
+            # Color-keyed layers are scaled without filtering, so the key color stays exact.
+            layer = self._fit(layer, smooth=False if index else None)
+            if index:
+                layer.set_colorkey(transparentKey)
+            # The scroll speed in render pixels per second.
+            self.layers.append((layer, speed * size[1] / gS.screenHeight))
+
+        # 3. The static background: fill color, fixed starfield and sidebars in one opaque surface.
+        background = pygame.Surface(gS.screenSize).convert()
+        background.fill(gS.screenColor)
+        self.stars.randStarPose = []
+        self.stars.draw(background)
+        self.surface = self._fit(background)
+        self.surface.blit(self.overlay, (0, 0))
+
+        self.version += 1
+
+    def _fit(self, surface, smooth=None):
+        """Scales a screenSize surface to the render target's resolution."""
+        if self.target is None:
+            return surface
+        return self.target.scaleSurface(surface, smooth=smooth)
+
+    def _scatterStars(self, layer, rng):
+        """Draws the stars of one parallax layer at random positions inside the play area."""
+        image = self.stars.image
+        for _ in range(gS.starsPerParallaxLayer):
+            x = rng.randint(gS.playSpace[0] - 10, gS.playSpace[1] - 5)
+            y = rng.randint(0, gS.screenHeight)
+            layer.blit(image, (x, y))
+
+    def draw(self, surface, time=0.0):
+        """
+        Draws the background onto a surface.
+
+        Args:
+            surface (pygame.Surface): The surface to draw on (usually the display).
+            time (float): The game time in seconds, used to scroll the parallax layers.
+        """
+        if not self.layers:
+            surface.blit(self.surface, (0, 0))
+            return
+
+        # Scroll every layer by blitting its two slices around the wrap point.
+        width, height = self.surface.get_size()
+        for layer, speed in self.layers:
+            offset = int(time * speed) % height
+            surface.blit(layer, (0, offset), (0, 0, width, height - offset))
+            if offset:
+                surface.blit(layer, (0, 0), (0, height - offset, width, offset))
+        self.drawOverlay(surface)
+
+    def drawOverlay(self, surface):
+        """Draws the sidebars on top of whatever has been drawn so far."""
+        for strip, position in self.overlayStrips:
+            surface.blit(strip, position)
@@ -0,0 +1,290 @@
+# =====================================================================
+# METEOR DODGER - BENCHMARK SUITE
+# =====================================================================
+# Runs scripted, seeded scenarios through the real game loop under SDL's
+# dummy video and audio drivers and measures what each part of a frame
+# costs: the update (spawning, input and movement), collision and draw
+# phases are timed separately with the frame profiler. Results are
+# written as JSON, and a stored baseline can be compared against to flag
+# regressions, so every change to the hot loop can be measured.
+#
+# Usage (from the 'code' directory):
+#     python benchmark.py --output benchmarks/baseline.json
+#     python benchmark.py --baseline benchmarks/baseline.json
+#     python benchmark.py --scenario meteors1000 --frames 600
+
+# --- Standard Library Imports ---
+import argparse  # Used to read the benchmark options from the command line.
+import json  # Used to write and read the machine-readable results.
+import os  # Used to select SDL's dummy drivers and create the output folder.
+import platform  # Used to record the machine and Python version with the results.
+import statistics  # Used for the mean of each phase.
+import sys  # Used for the exit code of the comparison mode.
+
+# SDL reads these when pygame is initialized, so they must be set before the game starts.
+os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+os.environ.setdefault('SDL_AUDIODRIVER', 'dummy')
+os.environ.setdefault('PYGAME_HIDE_SUPPORT_PROMPT', '1')
+
+# --- Third-Party Imports ---
+import pygame  # Used for the display the game draws into.
+
+# --- Local Application Imports ---
+import gameSettings as gS
+import profiler as pf
+import replay as rP
+from main import Shooter
+
+# The reported phases. 'update' covers spawning, input and movement.
+reportedPhases = ('update', 'collision', 'draw', 'total')
+# Phase differences smaller than this (in milliseconds) are treated as noise when comparing.
+noiseFloor = 0.02
+
+
+class Scenario:
+    """A scripted benchmark situation: how the game is set up and what the player does."""
+
+    def __init__(self, name, description, meteors=0, fire=False, difficultySteps=0, spawning=False):
+        """
+        Initializes the scenario.
+
+        Args:
+            name (str): The scenario's name in the results.
+            description (str): A short human-readable description.
+            meteors (int): The number of meteors kept on screen at all times.
+            fire (bool): Whether the player fires a laser every step, with unlimited ammo.
+            difficultySteps (int): How many times difficulty() is applied before measuring.
+            spawning (bool): Whether the normal spawn scheduler runs.
+        """
+        self.name = name
+        self.description = description
+        self.meteors = meteors
+        self.fire = fire
+        self.difficultySteps = difficultySteps
+        self.spawning = spawning
+
+
+scenarios = [
+    Scenario('idle', "Nothing spawns; the player holds still."),
+    Scenario('meteors100', "100 meteors kept on screen.", meteors=100),
+    Scenario('meteors1000', "1,000 meteors kept on screen.", meteors=1000),
+    Scenario('meteors5000', "5,000 meteors kept on screen.", meteors=5000),
+    Scenario('laserSpam', "A laser fired every step into 100 meteors.", meteors=100, fire=True),
+    Scenario('lateGame', "Normal spawning after 30 difficulty increases.", difficultySteps=30, spawning=True),
+]
+
+
+def setUp(game, scenario, seed):
+    """
+    Resets the game and arranges it for a scenario.
+
+    Args:
+        game (Shooter): A headless game instance.
+        scenario (Scenario): The scenario to set up.
+        seed (int): The seed for the game's random numbers.
+    """
+    # 1. A clean, seeded session.
+    game.reset(seed)
+
+    # 2. Difficulty and spawning. Without spawning, every scheduled spawn is pushed past the end of time.
+    for _ in range(scenario.difficultySteps):
+        game.difficulty()
+    game.spawner.reset(game.gameTime if scenario.spawning else float('inf'))
+
+    # 3. Fill the screen with meteors, spread over its whole height.
+    rng = game.rng
+    for _ in range(scenario.meteors):
+        game.spawnMeteor(rng.randint(gS.playSpace[0], gS.playSpace[1]), rng.randint(0, gS.screenHeight))
+
+    # 4. Scripted input: the ship sweeps left and right, firing every step if requested.
+    state = {'step': 0}
+
+    def scriptedInput():
+        state['step'] += 1
+        if scenario.fire:
+            game.ammo = 1
+        keys = rP.keyA if (state['step'] // 60) % 2 else rP.keyD
+        return rP.TickInput(keys=keys, fires=1 if scenario.fire else 0)
+
+    game.inputSource = scriptedInput
+
+
+def maintain(game, scenario):
+    """Keeps the player alive and replaces meteors that were destroyed or left the screen."""
+    game.player.health = 100
+    if not scenario.meteors:
+        return
+    missing = scenario.meteors - game.entityCounts()[0]
+    rng = game.rng
+    for _ in range(missing):
+        game.spawnMeteor(rng.randint(gS.playSpace[0], gS.playSpace[1]), gS.droppingSpawnPosition)
+
+
+def summarize(values):
+    """Returns the mean, median and 99th percentile of a list of timings."""
+    return {
+        'mean': statistics.fmean(values) if values else 0.0,
+        'p50': pf.percentile(values, 0.50),
+        'p99': pf.percentile(values, 0.99),
+    }
+
+
+def runScenario(game, scenario, frames, warmup, seed):
+    """
+    Runs one scenario and measures each phase of every frame.
+
+    Each frame is one fixed simulation step followed by a full draw and
+    present, timed with the game's frame profiler.
+
+    Args:
+        game (Shooter): A headless game instance.
+        scenario (Scenario): The scenario to run.
+        frames (int): The number of measured frames.
+        warmup (int): The number of frames run first and not measured.
+        seed (int): The seed for the game's random numbers.
+
+    Returns:
+        dict: The mean, p50 and p99 of each reported phase in milliseconds, and entity counts.
+    """
+    setUp(game, scenario, seed)
+    dt = 1 / gS.simulationRate
+    profiler = pf.FrameProfiler(game.entityCounts, capacity=frames, enabled=True)
+    game.profiler = profiler
+
+    for frame in range(warmup + frames):
+        # The warmup frames fill caches and pools; only the frames after them are kept.
+        if frame == warmup:
+            profiler.count = profiler.next = profiler.frames = 0
+        maintain(game, scenario)
+        profiler.beginFrame()
+        game.step(dt)
+        game.renderer.draw(1.0)
+        profiler.lap('draw')
+        game.renderer.present()
+        profiler.lap('present')
+        profiler.endFrame()
+
+    # Spawning, input and movement together make up the update cost.
+    history = {name: profiler.history(name) for name in pf.phases + ('total',) + pf.counters}
+    history['update'] = [
+        spawn + events + update
+        for spawn, events, update in zip(history['spawn'], history['events'], history['update'])
+    ]
+    history['draw'] = [draw + present for draw, present in zip(history['draw'], history['present'])]
+
+    result = {name: summarize(history[name]) for name in reportedPhases}
+    result['entities'] = {name: round(statistics.fmean(history[name]), 1) for name in pf.counters}
+    result['description'] = scenario.description
+    return result
+
+
+def runSuite(names=None, frames=300, warmup=30, seed=0):
+    """
+    Runs the selected scenarios.
+
+    Args:
+        names (list): The scenario names to run. All scenarios are run if omitted.
+        frames (int): The number of measured frames per scenario.
+        warmup (int): The number of unmeasured frames before each scenario.
+        seed (int): The seed for the game's random numbers.
+
+    Returns:
+        dict: The environment the suite ran in and the results of every scenario.
+    """
+    selected = [scenario for scenario in scenarios if names is None or scenario.name in names]
+    game = Shooter(headless=True)
+    results = {}
+    for scenario in selected:
+        results[scenario.name] = runScenario(game, scenario, frames, warmup, seed)
+        print(formatResult(scenario.name, results[scenario.name]))
+    pygame.quit()
+
+    return {
+        'environment': {
+            'python': platform.python_version(),
+            'pygame': pygame.version.ver,
+            'machine': platform.machine(),
+            'system': platform.system(),
+            'entityBackend': gS.entityBackend,
+            'dirtyRects': gS.dirtyRects,
+        },
+        'settings': {'frames': frames, 'warmup': warmup, 'seed': seed},
+        'scenarios': results,
+    }
+
+
+def formatResult(name, result):
+    """Returns a one-line summary of a scenario's p50 timings."""
+    phases = '  '.join(f"{phase} {result[phase]['p50']:.3f}" for phase in reportedPhases)
+    return f"{name:<14} p50 ms: {phases}"
+
+
+def compare(current, baseline, threshold):
+    """
+    Compares results against a baseline and lists the phases that got slower.
+
+    A phase regressed when its median grew by more than 'threshold' percent
+    and by more than the noise floor.
+
+    Args:
+        current (dict): The results of this run.
+        baseline (dict): The stored baseline results.
+        threshold (float): The allowed slowdown in percent.
+
+    Returns:
+        list: One message per regression.
+    """
+    regressions = []
+    for name, result in current['scenarios'].items():
+        stored = baseline['scenarios'].get(name)
+        if stored is None:
+            print(f"{name}: not in the baseline, skipped")
+            continue
+        for phase in reportedPhases:
+            now = result[phase]['p50']
+            before = stored[phase]['p50']
+            change = (now - before) / before * 100 if before else 0.0
+            print(f"{name:<14} {phase:<10} {before:8.3f} -> {now:8.3f} ms ({change:+.1f}%)")
+            if now - before > noiseFloor and change > threshold:
+                regressions.append(f"{name} {phase}: {before:.3f} -> {now:.3f} ms ({change:+.1f}%)")
+    return regressions
+
+
+def main(argv=None):
+    """Command-line entry point: runs the suite, writes the results and compares them to a baseline."""
+    parser = argparse.ArgumentParser(description="Benchmark the Meteor Dodger game loop without a display.")
+    parser.add_argument('--scenario', action='append', choices=[scenario.name for scenario in scenarios],
+                        help="Run only this scenario. Can be given more than once.")
+    parser.add_argument('--frames', type=int, default=300, help="Measured frames per scenario.")
+    parser.add_argument('--warmup', type=int, default=30, help="Unmeasured frames before each scenario.")
+    parser.add_argument('--seed', type=int, default=0, help="Seed for the game's random numbers.")
+    parser.add_argument('--output', metavar='FILE', help="Write the results to this JSON file.")
+    parser.add_argument('--baseline', metavar='FILE', help="Compare the results against this JSON file.")
+    parser.add_argument('--threshold', type=float, default=10.0,
+                        help="Allowed slowdown against the baseline, in percent.")
+    args = parser.parse_args(argv)
+
+    results = runSuite(args.scenario, args.frames, args.warmup, args.seed)
+
+    if args.output:
+        folder = os.path.dirname(args.output)
+        if folder:
+            os.makedirs(folder, exist_ok=True)
+        with open(args.output, 'w') as f:
+            json.dump(results, f, indent=2)
+
+    if args.baseline:
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+        regressions = compare(results, baseline, args.threshold)
+        if regressions:
+            print(f"{len(regressions)} regression(s) over {args.threshold:g}%:")
+            for message in regressions:
+                print(f"  {message}")
+            return 1
+        print("No regressions.")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,418 @@
+# =====================================================================
+# METEOR DODGER - GAMEPLAY CAPTURE
+# =====================================================================
+# Records gameplay video for bug reports and highlight reels without
+# stalling the frame loop.
+#
+#   * The game thread only copies each captured frame's pixels, in one
+#     block copy straight from the display surface's buffer, into a free
+#     slot of a fixed ring of shared memory frames. Nothing is allocated
+#     or converted per frame.
+#   * An encoder process (so encoding never competes with the game for
+#     the GIL) takes the filled slots, handles them and hands them back.
+#     When it falls behind and every slot is still waiting, new frames are
+#     dropped instead of making the game wait.
+#   * While capture is on, the encoder keeps the last instantReplaySeconds
+#     of frames, compressed in memory. F9 saves them as a PNG sequence.
+#   * F10 starts or stops recording to disk, as a PNG sequence or as a raw
+#     video file (plus a .json file describing its pixel format).
+#
+# Files are written to captureDir (by default a 'captures' folder in the
+# player's data folder). Enabled with capture = True in gameSettings.py.
+
+# --- Standard Library Imports ---
+import json  # Used to describe raw video files.
+import multiprocessing as mp  # Used for the encoder process and its command pipe.
+import os  # Used to create the capture folders.
+import threading  # Used to save instant replays while the encoder keeps running.
+import time  # Used to time captures and to name the files.
+import zlib  # Used to compress the instant-replay frames.
+from collections import deque  # Used for the time-bounded instant-replay buffer.
+from multiprocessing import shared_memory  # Used for the ring of frames shared with the encoder.
+from os import path  # Used for creating operating-system-independent file paths.
+
+# --- Third-Party Imports ---
+import pygame  # Used to read the display surface and to write PNG files.
+
+# --- Local Application Imports ---
+import gameSettings as gS
+import leaderboard as lB
+
+# The ffmpeg pixel format of each (byte-order independent) 32-bit channel layout,
+# for the raw video description. Keys are the surface's (R, G, B) masks.
+rawFormats = {
+    (0xFF0000, 0x00FF00, 0x0000FF): 'bgr0',
+    (0x0000FF, 0x00FF00, 0xFF0000): 'rgb0',
+}
+
+# The file formats recordings can be written in.
+fileFormats = ('png', 'raw')
+
+
+def captureDir():
+    """Returns the folder captures are written to. The 'captureDir' setting overrides it."""
+    return gS.captureDir or path.join(lB.userDataDir(), 'captures')
+
+
+def stamp():
+    """Returns the current local time for file names, e.g. '20240131-235959'."""
+    return time.strftime('%Y%m%d-%H%M%S')
+
+
+class FrameCapture:
+    """
+    The game-thread side of capturing: a ring of shared frame slots and the encoder process.
+
+    Only grab() runs every frame. It copies the surface into a free slot at
+    most fps times per second and returns at once, dropping the frame when
+    no slot is free.
+    """
+
+    def __init__(self, surface, folder=None, fps=gS.captureFps, slots=gS.captureSlots,
+                 replaySeconds=gS.instantReplaySeconds, fileFormat=gS.captureFormat):
+        """
+        Allocates the frame ring and starts the encoder process.
+
+        Args:
+            surface (pygame.Surface): The display surface that will be captured. Every grabbed
+                surface must have its size and pixel format.
+            folder (str): Where recordings and instant replays are written. None = captureDir().
+            fps (float): The most frames captured per second.
+            slots (int): The number of frames that can wait for the encoder.
+            replaySeconds (float): The length of the instant-replay buffer. 0 = no buffer.
+            fileFormat (str): How recordings are written: 'png' or 'raw'.
+
+        Raises:
+            ValueError: If the surface isn't 32-bit or fileFormat is unknown.
+        """
+        if surface.get_bytesize() != 4:
+            raise ValueError(f"Only 32-bit surfaces can be captured, not {surface.get_bitsize()}-bit")
+        if fileFormat not in fileFormats:
+            raise ValueError(f"Unknown capture format {fileFormat!r}, expected one of {fileFormats}")
+        self.size = surface.get_size()
+        self.interval = 1 / fps
+        self.nextGrab = 0.0
+        self.recording = False
+        # False once the encoder has gone away; nothing is captured after that.
+        self.active = True
+        # Frames skipped because the encoder had no free slot.
+        self.dropped = 0
+        self.grabbed = 0
+
+        # 1. The ring: one shared block holding every slot, each the size of the surface's pixels.
+        self.frameBytes = surface.get_pitch() * self.size[1]
+        self.block = shared_memory.SharedMemory(create=True, size=self.frameBytes * slots)
+        self.slots = [self.block.buf[index * self.frameBytes:(index + 1) * self.frameBytes]
+                      for index in range(slots)]
+        # The slots the encoder is done with. Only the game thread uses this list.
+        self.slotCount = slots
+        self.free = list(range(slots))
+
+        # 2. The encoder. 'spawn' starts it from a clean interpreter, without the game's SDL state.
+        frameFormat = {
+            'size': self.size,
+            'pitch': surface.get_pitch(),
+            'bitsize': surface.get_bitsize(),
+            'masks': surface.get_masks(),
+        }
+        options = {
+            'folder': folder or captureDir(),
+            'fps': fps,
+            'replaySeconds': replaySeconds,
+            'fileFormat': fileFormat,
+        }
+        context = mp.get_context('spawn')
+        self.connection, encoderConnection = context.Pipe()
+        self.encoder = context.Process(
+            target=_runEncoder,
+            args=(encoderConnection, self.block.name, slots, self.frameBytes, frameFormat, options),
+            name='captureEncoder',
+            daemon=True,
+        )
+        self.encoder.start()
+        encoderConnection.close()
+
+    def _collect(self):
+        """Takes back the slots the encoder has finished with and prints its messages."""
+        connection = self.connection
+        while connection.poll():
+            kind, value = connection.recv()
+            if kind == 'free':
+                self.free.append(value)
+            else:
+                print(value)
+
+    def grab(self, surface):
+        """
+        Captures the drawn frame, if one is due. Called by the game thread every frame.
+
+        Args:
+            surface (pygame.Surface): The finished frame, before it is presented.
+        """
+        now = time.perf_counter()
+        if now < self.nextGrab or not self.active:
+            return
+        # Keep to the capture rate without trying to catch up on missed frames.
+        self.nextGrab = max(self.nextGrab + self.interval, now)
+        try:
+            self._collect()
+        except (EOFError, OSError) as error:
+            self._lost(error)
+            return
+        if not self.free:
+            self.dropped += 1
+            return
+
+        # One block copy from the surface's pixel buffer into the shared slot.
+        index = self.free.pop()
+        self.slots[index][:] = surface.get_buffer()
+        self.grabbed += 1
+        self._send('frame', (index, now))
+
+    def _send(self, command, value):
+        """Sends a command to the encoder, turning capture off if the encoder has gone away."""
+        if not self.active:
+            return
+        try:
+            self.connection.send((command, value))
+        except OSError as error:
+            self._lost(error)
+
+    def _lost(self, error):
+        """Turns capture off after the encoder process exited unexpectedly."""
+        self.active = False
+        print(f"Warning: Capture stopped, the encoder exited ({error}).")
+
+    def toggleRecording(self):
+        """Starts recording to disk, or stops the recording that is running."""
+        self.recording = not self.recording
+        self._send('record', self.recording)
+
+    def saveReplay(self):
+        """Saves the instant-replay buffer (the last replaySeconds of frames) as a PNG sequence."""
+        self._send('saveReplay', None)
+
+    def stats(self):
+        """Returns a dictionary with the capture counters."""
+        return {
+            'grabbed': self.grabbed,
+            'dropped': self.dropped,
+            'waiting': self.slotCount - len(self.free) if self.slots else 0,
+            'recording': self.recording,
+        }
+
+    def close(self, timeout=10.0):
+        """
+        Finishes the frames that are waiting, closes any recording and stops the encoder.
+
+        Args:
+            timeout (float): The longest time in seconds to wait for the encoder.
+        """
+        if self.encoder is None:
+            return
+        try:
+            self.connection.send(('stop', None))
+            # Wait until the encoder has finished and is no longer reading the slots.
+            while self.connection.poll(timeout):
+                kind, value = self.connection.recv()
+                if kind == 'stopped':
+                    break
+                if kind != 'free':
+                    print(value)
+        except (BrokenPipeError, EOFError, OSError):
+            pass
+        self.encoder.join(timeout)
+        if self.encoder.is_alive():
+            self.encoder.terminate()
+        self.encoder = None
+
+        # The slot views must be released before the block can be closed.
+        for slot in self.slots:
+            slot.release()
+        self.slots = []
+        self.block.close()
+        self.block.unlink()
+        if self.dropped:
+            print(f"Capture: {self.dropped} of {self.grabbed + self.dropped} frames were dropped.")
+
+
+# --- Encoder process ---
+
+class Encoder:
+    """The encoder process's state: the instant-replay buffer and the running recording."""
+
+    def __init__(self, connection, frameFormat, options):
+        """
+        Initializes the encoder.
+
+        Args:
+            connection (multiprocessing.connection.Connection): The pipe to FrameCapture.
+            frameFormat (dict): The size, pitch, bitsize and masks of the captured surface.
+            options (dict): The folder, fps, replaySeconds and fileFormat.
+        """
+        self.connection = connection
+        self.frameFormat = frameFormat
+        self.folder = options['folder']
+        self.fps = options['fps']
+        self.replaySeconds = options['replaySeconds']
+        self.fileFormat = options['fileFormat']
+
+        # (capture time, compressed pixels) of the newest frames, oldest first.
+        self.replay = deque()
+        # The running recording: its folder or raw file, and its frame count.
+        self.recordPath = None
+        self.rawFile = None
+        self.recorded = 0
+        # The threads writing saved instant replays, and the lock that lets them share the pipe.
+        self.savers = []
+        self.sendLock = threading.Lock()
+
+    def send(self, kind, value):
+        """Sends a message to FrameCapture. Safe to call from the saver threads."""
+        with self.sendLock:
+            self.connection.send((kind, value))
+
+    def frameSurface(self):
+        """Returns a new surface with the captured pixel format, to write PNG files from."""
+        frameFormat = self.frameFormat
+        return pygame.Surface(frameFormat['size'], 0, frameFormat['bitsize'], frameFormat['masks'])
+
+    def handleFrame(self, slot, capturedAt, surface):
+        """
+        Adds one captured frame to the instant-replay buffer and the recording.
+
+        Args:
+            slot (memoryview): The frame's pixels in the shared ring.
+            capturedAt (float): When the frame was captured (the game's perf_counter()).
+            surface (pygame.Surface): A surface in the captured format, reused for PNG files.
+        """
+        # 1. The instant-replay buffer, trimmed to the newest replaySeconds.
+        if self.replaySeconds > 0:
+            replay = self.replay
+            replay.append((capturedAt, zlib.compress(slot, 1)))
+            while capturedAt - replay[0][0] > self.replaySeconds:
+                replay.popleft()
+
+        # 2. The recording.
+        if self.rawFile is not None:
+            self.rawFile.write(slot)
+            self.recorded += 1
+        elif self.recordPath is not None:
+            surface.get_buffer().write(bytes(slot))
+            pygame.image.save(surface, path.join(self.recordPath, f'frame{self.recorded:06d}.png'))
+            self.recorded += 1
+
+    def startRecording(self):
+        """Opens a new recording in the capture folder."""
+        os.makedirs(self.folder, exist_ok=True)
+        self.recorded = 0
+        if self.fileFormat == 'raw':
+            self.recordPath = path.join(self.folder, f'capture-{stamp()}.raw')
+            self.rawFile = open(self.recordPath, 'wb')
+        else:
+            self.recordPath = path.join(self.folder, f'capture-{stamp()}')
+            os.makedirs(self.recordPath, exist_ok=True)
+        self.send('message', f"Capture: Recording to {self.recordPath}")
+
+    def stopRecording(self):
+        """Closes the running recording and reports where it is."""
+        if self.recordPath is None:
+            return
+        if self.rawFile is not None:
+            self.rawFile.close()
+            self.rawFile = None
+            self.describeRaw()
+        self.send('message', f"Capture: Saved {self.recorded} frames to {self.recordPath}")
+        self.recordPath = None
+
+    def describeRaw(self):
+        """Writes the .json file that says how to read a raw video file."""
+        frameFormat = self.frameFormat
+        width, height = frameFormat['size']
+        pixelFormat = rawFormats.get(tuple(frameFormat['masks'][:3]), 'unknown')
+        description = {
+            'width': width,
+            'height': height,
+            'pitch': frameFormat['pitch'],
+            'pixelFormat': pixelFormat,
+            'fps': self.fps,
+            'frames': self.recorded,
+            'ffmpeg': f"ffmpeg -f rawvideo -pix_fmt {pixelFormat} -s {width}x{height} -r {self.fps} "
+                      f"-i {path.basename(self.recordPath)} capture.mp4",
+        }
+        with open(path.splitext(self.recordPath)[0] + '.json', 'w') as f:
+            json.dump(description, f, indent=2)
+
+    def saveReplay(self):
+        """Writes the instant-replay buffer as a PNG sequence, on a thread of its own."""
+        if not self.replay:
+            self.send('message', "Capture: The instant-replay buffer is empty.")
+            return
+        os.makedirs(self.folder, exist_ok=True)
+        folder = path.join(self.folder, f'replay-{stamp()}')
+        saver = threading.Thread(target=self._writeReplay, args=(folder, list(self.replay)), daemon=True)
+        saver.start()
+        self.savers.append(saver)
+
+    def _writeReplay(self, folder, frames):
+        """Decompresses and writes saved instant-replay frames. Runs on a saver thread."""
+        os.makedirs(folder, exist_ok=True)
+        surface = self.frameSurface()
+        for number, (_, pixels) in enumerate(frames):
+            surface.get_buffer().write(zlib.decompress(pixels))
+            pygame.image.save(surface, path.join(folder, f'frame{number:06d}.png'))
+        seconds = frames[-1][0] - frames[0][0]
+        self.send('message', f"Capture: Saved the last {seconds:.0f} s ({len(frames)} frames) to {folder}")
+
+
+def _runEncoder(connection, blockName, slotCount, frameBytes, frameFormat, options):
+    """
+    The body of the encoder process: handles captured frames and commands until told to stop.
+
+    Args:
+        connection (multiprocessing.connection.Connection): The pipe to FrameCapture.
+        blockName (str): The name of the shared frame ring.
+        slotCount (int): The number of slots in the ring.
+        frameBytes (int): The size of one slot.
+        frameFormat (dict): The size, pitch, bitsize and masks of the captured surface.
+        options (dict): The Encoder options.
+    """
+    # Encoding is background work: let the game's process win whenever they compete for a core.
+    if hasattr(os, 'nice'):
+        os.nice(10)
+    block = shared_memory.SharedMemory(name=blockName)
+    slots = [block.buf[index * frameBytes:(index + 1) * frameBytes] for index in range(slotCount)]
+    encoder = Encoder(connection, frameFormat, options)
+    surface = encoder.frameSurface()
+
+    try:
+        while True:
+            command, value = connection.recv()
+            if command == 'frame':
+                index, capturedAt = value
+                try:
+                    encoder.handleFrame(slots[index], capturedAt, surface)
+                except (OSError, pygame.error) as error:
+                    encoder.send('message', f"Warning: Capture stopped ({error}).")
+                    encoder.rawFile = encoder.recordPath = None
+                # Hand the slot back to the game.
+                encoder.send('free', index)
+            elif command == 'record':
+                if value:
+                    encoder.startRecording()
+                else:
+                    encoder.stopRecording()
+            elif command == 'saveReplay':
+                encoder.saveReplay()
+            else:
+                break
+        encoder.stopRecording()
+        for saver in encoder.savers:
+            saver.join()
+        encoder.send('stopped', None)
+    except (KeyboardInterrupt, EOFError, BrokenPipeError):
+        pass
+    finally:
+        for slot in slots:
+            slot.release()
+        block.close()
@@ -0,0 +1,262 @@
+# =====================================================================
+# METEOR DODGER - COLLISION ENGINE
+# =====================================================================
+# Finds every player-vs-dropping and laser-vs-meteor hit in one pass.
+# Falling objects are bucketed into a uniform spatial hash over the play
+# area, so each query only looks at nearby objects. Candidates are then
+# filtered by their rectangles, and only overlapping pairs pay for a
+# pixel-perfect mask test using one shared mask per image.
+
+# --- Third-Party Imports ---
+import pygame  # Used for building collision masks from images.
+
+# --- Local Application Imports ---
+import gameSettings as gS
+
+
+class MaskCache:
+    """
+    Builds and shares one collision mask per image.
+
+    Every sprite that uses the same Surface (for example, every meteor)
+    shares the same mask object instead of building a new one on spawn.
+    """
+
+    def __init__(self):
+        """Initializes an empty cache."""
+        # Maps a Surface object to the mask built from it.
+        self.masks = {}
+
+    def get(self, surface):
+        """
+        Returns the shared mask for a surface, building it on first use.
+
+        Args:
+            surface (pygame.Surface): The image to build the mask from.
+
+        Returns:
+            pygame.mask.Mask: The pixel-perfect collision mask.
+        """
+        mask = self.masks.get(surface)
+        if mask is None:
+            mask = pygame.mask.from_surface(surface)
+            self.masks[surface] = mask
+        return mask
+
+    def put(self, surface, mask):
+        """Stores a mask that was built ahead of time (e.g., loaded from the asset pack)."""
+        self.masks[surface] = mask
+
+    def __len__(self):
+        return len(self.masks)
+
+
+# The game-wide mask cache shared by every sprite.
+masks = MaskCache()
+
+
+class SpatialHash:
+    """
+    A uniform grid that buckets sprites by the cell holding their center.
+
+    The grid starts at the left edge of the play space. Cells are square and
+    are only created when a sprite is inserted into them. Because each sprite
+    is stored in exactly one cell, queries widen their search area by half of
+    the largest sprite inserted so nothing that overlaps is missed.
+    """
+
+    def __init__(self, cellSize=128, originX=gS.playSpace[0]):
+        """
+        Initializes an empty grid.
+
+        Args:
+            cellSize (int): The width and height of one grid cell in pixels.
+            originX (int): The horizontal position where the first column starts.
+        """
+        self.cellSize = cellSize
+        self.originX = originX
+        # Maps a (column, row) pair to the list of sprites centered in that cell.
+        self.cells = {}
+        # Half of the largest width or height inserted since the last clear().
+        self.margin = 0
+
+    def clear(self):
+        """Removes every sprite from the grid."""
+        self.cells.clear()
+        self.margin = 0
+
+    def insertGroup(self, sprites):
+        """
+        Adds many sprites to the grid in one call.
+
+        This is the hot path of the broadphase, so the cell lookup is kept
+        inline instead of calling insert() for every sprite.
+
+        Args:
+            sprites (iterable): Sprites with a 'rect' attribute.
+        """
+        size = self.cellSize
+        originX = self.originX
+        cells = self.cells
+        largest = 0
+        for sprite in sprites:
+            rect = sprite.rect
+            x, y = rect.center
+            key = (int((x - originX) // size), int(y // size))
+            bucket = cells.get(key)
+            if bucket is None:
+                cells[key] = [sprite]
+            else:
+                bucket.append(sprite)
+            width, height = rect.size
+            if width > largest:
+                largest = width
+            if height > largest:
+                largest = height
+        if largest / 2 > self.margin:
+            self.margin = largest / 2
+
+    def insert(self, sprite):
+        """Adds a single sprite to the cell that holds its center."""
+        self.insertGroup((sprite,))
+
+    def query(self, rect):
+        """
+        Returns the sprites whose rectangles overlap the given rectangle.
+
+        Args:
+            rect (pygame.Rect | pygame.FRect): The area to search.
+
+        Returns:
+            list: The overlapping sprites.
+        """
+        size = self.cellSize
+        originX = self.originX
+        margin = self.margin
+        left = int((rect.left - margin - originX) // size)
+        right = int((rect.right + margin - originX) // size)
+        top = int((rect.top - margin) // size)
+        bottom = int((rect.bottom + margin) // size)
+
+        cells = self.cells
+        found = []
+        for column in range(left, right + 1):
+            for row in range(top, bottom + 1):
+                bucket = cells.get((column, row))
+                if not bucket:
+                    continue
+                for sprite in bucket:
+                    # Rectangle prefilter: skip the mask test when the boxes don't touch.
+                    if rect.colliderect(sprite.rect):
+                        found.append(sprite)
+        return found
+
+
+def masksOverlap(a, b):
+    """
+    Returns True when the masks of two sprites overlap at their current positions.
+
+    Args:
+        a (pygame.sprite.Sprite): The first sprite, with 'rect' and 'mask' attributes.
+        b (pygame.sprite.Sprite): The second sprite, with 'rect' and 'mask' attributes.
+    """
+    offset = (int(b.rect.left - a.rect.left), int(b.rect.top - a.rect.top))
+    return a.mask.overlap(b.mask, offset) is not None
+
+
+class CollisionEngine:
+    """
+    Answers all of the game's collision queries in a single pass per frame.
+
+    The meteors and pickups are inserted into a spatial hash once. The
+    player and every laser then only test the few objects that share
+    their grid cells.
+    """
+
+    def __init__(self, cellSize=128):
+        """
+        Initializes the engine.
+
+        Args:
+            cellSize (int): The grid cell size used by the broadphase.
+        """
+        self.grid = SpatialHash(cellSize)
+
+    def detect(self, player, lasers, droppings):
+        """
+        Finds and resolves every collision for the current frame.
+
+        Sprites that are hit are killed, just like pygame's spritecollide with
+        dokill=True: the player removes the meteors and pickups it touches,
+        and a laser and the meteors it touches remove each other.
+
+        Args:
+            player (Player): The player's ship, or None to only check the lasers.
+            lasers (pygame.sprite.Group): All active lasers.
+            droppings (dict): Maps a kind ('meteor', 'ammo', 'health', 'life')
+                to the sprite group holding objects of that kind. Each sprite's
+                'itemType' must match the kind of its group.
+
+        Returns:
+            dict: Maps 'player', 'laser' and each pickup kind to the list of
+            sprites hit this frame. The 'player' list holds the meteors that
+            hit the player, and 'laser' holds the meteors destroyed by lasers.
+        """
+        grid = self.grid
+        grid.clear()
+
+        # 1. Broadphase: bucket every falling object.
+        for group in droppings.values():
+            grid.insertGroup(group)
+
+        hits = {'player': [], 'laser': []}
+        for kind in droppings:
+            if kind != 'meteor':
+                hits[kind] = []
+
+        # 2. Player queries: meteors damage the ship, pickups are collected.
+        if player is not None:
+            for sprite in grid.query(player.rect):
+                if masksOverlap(player, sprite):
+                    kind = sprite.itemType
+                    hits['player' if kind == 'meteor' else kind].append(sprite)
+                    sprite.kill()
+
+        # 3. Laser queries: only meteors can be shot.
+        for laser in lasers.sprites():
+            laserHit = False
+            for sprite in grid.query(laser.rect):
+                if sprite.itemType != 'meteor' or not sprite.alive():
+                    continue
+                if masksOverlap(laser, sprite):
+                    hits['laser'].append(sprite)
+                    sprite.kill()
+                    laserHit = True
+            if laserHit:
+                laser.kill()
+
+        return hits
+
+    def detectPlayer(self, player, kinds):
+        """
+        Finds the hits of another ship (co-op), using the grid built by the last detect().
+
+        Objects already removed this frame (by detect() or an earlier ship) are skipped.
+
+        Args:
+            player (Player): The ship.
+            kinds (iterable): The kinds of falling objects, as in detect()'s 'droppings'.
+
+        Returns:
+            dict: The same layout as detect()'s result, with an empty 'laser' list.
+        """
+        hits = {'player': [], 'laser': []}
+        for kind in kinds:
+            if kind != 'meteor':
+                hits[kind] = []
+        for sprite in self.grid.query(player.rect):
+            if sprite.alive() and masksOverlap(player, sprite):
+                kind = sprite.itemType
+                hits['player' if kind == 'meteor' else kind].append(sprite)
+                sprite.kill()
+        return hits
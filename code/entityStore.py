@@ -0,0 +1,295 @@
+# =====================================================================
+# METEOR DODGER - NUMPY ENTITY STORE
+# =====================================================================
+# An alternative backend for falling objects (meteors and pickups).
+# Instead of one pygame Sprite per object, the positions, speeds, kinds
+# and alive flags of every dropping live in NumPy arrays (a struct of
+# arrays). Movement and off-screen culling are a few vectorized array
+# operations per step, drawing is a single batched Surface.blits() call,
+# and collision tests are filtered with vectorized rectangle checks before
+# the few remaining candidates get a pixel-perfect mask test.
+#
+# Selected with entityBackend = 'numpy' in gameSettings.py. NumPy is only
+# needed when this backend is used.
+
+# --- Third-Party Imports ---
+import pygame  # Used for rectangles and drawing.
+
+try:
+    import numpy as np  # Used for the vectorized entity arrays.
+except ImportError:  # NumPy is optional; the default sprite backend doesn't need it.
+    np = None
+
+# --- Local Application Imports ---
+import gameSettings as gS
+import collisionEngine as cE
+
+
+class EntityHit:
+    """A record of one stored entity that was hit, shaped like a sprite for collision handling."""
+
+    __slots__ = ('itemType', 'rect')
+
+    def __init__(self, itemType, rect):
+        self.itemType = itemType
+        self.rect = rect
+
+
+class DroppingStore:
+    """
+    Holds every falling object in parallel NumPy arrays.
+
+    Live entities are always packed into the first 'count' slots of the
+    arrays. Culling an entity compacts the arrays, so every operation only
+    ever touches the live range. The arrays grow automatically if more
+    entities are spawned than the current capacity.
+    """
+
+    # The array names that together describe one entity.
+    fields = ('x', 'y', 'previousY', 'speed', 'kind', 'alive')
+
+    def __init__(self, images, speeds, capacity=gS.entityCapacity):
+        """
+        Initializes an empty store.
+
+        Args:
+            images (dict): Maps each kind name (e.g., 'meteor') to its image.
+            speeds (dict): Maps each kind name to its downward speed in pixels per second.
+            capacity (int): The number of entities the arrays can hold before growing.
+        """
+        if np is None:
+            raise ImportError("The 'numpy' entity backend needs NumPy: pip install numpy")
+
+        # 1. Per-kind lookup tables, indexed by the small integer stored in 'kind'.
+        self.kindNames = list(images)
+        self.kindIndex = {name: index for index, name in enumerate(self.kindNames)}
+        self.images = [images[name] for name in self.kindNames]
+        self.masks = [cE.masks.get(image) for image in self.images]
+        self.halfWidths = np.array([image.get_width() / 2 for image in self.images], dtype=np.float32)
+        self.halfHeights = np.array([image.get_height() / 2 for image in self.images], dtype=np.float32)
+        self.speeds = np.array([speeds[name] for name in self.kindNames], dtype=np.float32)
+
+        # 2. The entity arrays. Positions are the centers of the objects.
+        self.count = 0
+        self._allocate(capacity)
+
+    def _allocate(self, capacity):
+        """Creates the entity arrays with room for 'capacity' entities, keeping live ones."""
+        old = {name: getattr(self, name, None) for name in self.fields}
+        self.capacity = capacity
+        self.x = np.zeros(capacity, dtype=np.float32)
+        self.y = np.zeros(capacity, dtype=np.float32)
+        self.previousY = np.zeros(capacity, dtype=np.float32)
+        self.speed = np.zeros(capacity, dtype=np.float32)
+        self.kind = np.zeros(capacity, dtype=np.int8)
+        self.alive = np.zeros(capacity, dtype=bool)
+        if old['x'] is not None:
+            for name in self.fields:
+                getattr(self, name)[:self.count] = old[name][:self.count]
+
+    def __len__(self):
+        return self.count
+
+    def countOf(self, kind):
+        """Returns the number of live entities of one kind."""
+        return int(np.count_nonzero(self.kind[:self.count] == self.kindIndex[kind]))
+
+    def clear(self):
+        """Removes every entity."""
+        self.count = 0
+
+    def snapshot(self):
+        """Returns the live entities as one bytes object per field (see worldState.py)."""
+        count = self.count
+        return tuple(getattr(self, name)[:count].tobytes() for name in self.fields)
+
+    def restore(self, snapshot):
+        """Replaces every entity with the ones saved by snapshot()."""
+        self.count = 0
+        count = len(snapshot[0]) // self.x.itemsize
+        if count > self.capacity:
+            self._allocate(max(count, self.capacity * 2))
+        for name, data in zip(self.fields, snapshot):
+            array = getattr(self, name)
+            array[:count] = np.frombuffer(data, dtype=array.dtype)
+        self.count = count
+
+    def spawn(self, kind, x, y):
+        """Adds one entity of the given kind centered at (x, y)."""
+        self.spawnMany(kind, (x,), (y,))
+
+    def spawnMany(self, kind, xs, ys):
+        """
+        Adds several entities of one kind in a single vectorized write.
+
+        Args:
+            kind (str): The kind name (e.g., 'meteor').
+            xs (sequence): The horizontal centers.
+            ys (sequence): The vertical centers.
+        """
+        amount = len(xs)
+        if not amount:
+            return
+        start = self.count
+        end = start + amount
+        if end > self.capacity:
+            self._allocate(max(end, self.capacity * 2))
+
+        index = self.kindIndex[kind]
+        self.x[start:end] = xs
+        self.y[start:end] = ys
+        self.previousY[start:end] = ys
+        self.speed[start:end] = self.speeds[index]
+        self.kind[start:end] = index
+        self.alive[start:end] = True
+        self.count = end
+
+    def update(self, dt):
+        """
+        Moves every entity down and removes the ones that left the screen.
+
+        Args:
+            dt (float): Delta time, for frame-rate independent movement.
+        """
+        count = self.count
+        if not count:
+            return
+        y = self.y[:count]
+        # Remember the current positions for interpolation, then move everything at once.
+        self.previousY[:count] = y
+        y += self.speed[:count] * dt
+
+        # Off-screen culling: an object is gone once its top edge passes the bottom of the screen.
+        alive = self.alive[:count]
+        alive &= (y - self.halfHeights[self.kind[:count]]) <= gS.screenHeight
+        self.compact()
+
+    def setSpeeds(self, speeds):
+        """
+        Changes the downward speed of each kind, for live entities and future spawns.
+
+        Args:
+            speeds (dict): Maps each kind name to its downward speed in pixels per second.
+        """
+        self.speeds[:] = [speeds[name] for name in self.kindNames]
+        count = self.count
+        self.speed[:count] = self.speeds[self.kind[:count]]
+
+    def compact(self):
+        """Packs the live entities into the front of the arrays, dropping dead ones."""
+        count = self.count
+        alive = self.alive[:count]
+        if alive.all():
+            return
+        keep = np.flatnonzero(alive)
+        live = len(keep)
+        for name in self.fields:
+            array = getattr(self, name)
+            array[:live] = array[keep]
+        self.count = live
+
+    def _topLefts(self, alpha):
+        """Returns the interpolated top-left corners of all live entities."""
+        count = self.count
+        kind = self.kind[:count]
+        previousY = self.previousY[:count]
+        y = previousY + (self.y[:count] - previousY) * alpha
+        return self.x[:count] - self.halfWidths[kind], y - self.halfHeights[kind]
+
+    def draw(self, surface, alpha=1.0, returnRects=False, target=None):
+        """
+        Draws every entity with one batched blits() call.
+
+        Args:
+            surface (pygame.Surface): The surface to draw on.
+            alpha (float): The interpolation factor between simulation steps.
+            returnRects (bool): Whether to return the areas that were drawn.
+            target (RenderTarget): When given, entities are drawn at its render resolution.
+
+        Returns:
+            list | None: The drawn areas, if requested.
+        """
+        if not self.count:
+            return [] if returnRects else None
+        lefts, tops = self._topLefts(alpha)
+        images = self.images
+        if target is not None and target.scaled:
+            # Convert every position at once, and use the render-resolution images.
+            lefts = lefts * target.scaleX
+            tops = tops * target.scaleY
+            images = [target.image(image) for image in images]
+        batch = [
+            (images[kind], (left, top))
+            for kind, left, top in zip(self.kind[:self.count].tolist(), lefts.tolist(), tops.tolist())
+        ]
+        return surface.blits(batch, doreturn=returnRects)
+
+    def _overlapping(self, rect, kindMask=None):
+        """Returns the indices of live entities whose rectangles overlap 'rect'."""
+        count = self.count
+        kind = self.kind[:count]
+        halfWidth = self.halfWidths[kind]
+        halfHeight = self.halfHeights[kind]
+        # Vectorized rectangle prefilter: compare the distance between centers to the half sizes.
+        overlap = (np.abs(self.x[:count] - rect.centerx) < halfWidth + rect.width / 2)
+        overlap &= (np.abs(self.y[:count] - rect.centery) < halfHeight + rect.height / 2)
+        overlap &= self.alive[:count]
+        if kindMask is not None:
+            overlap &= kindMask
+        return np.flatnonzero(overlap)
+
+    def _maskHit(self, sprite, index):
+        """Returns True if a sprite's mask overlaps the mask of the entity at 'index'."""
+        kind = self.kind[index]
+        left = self.x[index] - self.halfWidths[kind]
+        top = self.y[index] - self.halfHeights[kind]
+        offset = (int(left - sprite.rect.left), int(top - sprite.rect.top))
+        return sprite.mask.overlap(self.masks[kind], offset) is not None
+
+    def _hitRecord(self, index):
+        """Builds an EntityHit describing the entity at 'index'."""
+        kind = self.kind[index]
+        width = float(self.halfWidths[kind] * 2)
+        height = float(self.halfHeights[kind] * 2)
+        rect = pygame.FRect(0, 0, width, height)
+        rect.center = (float(self.x[index]), float(self.y[index]))
+        return EntityHit(self.kindNames[kind], rect)
+
+    def collide(self, player, lasers, hits):
+        """
+        Resolves player and laser collisions against the stored entities.
+
+        Hit entities are removed, lasers that hit a meteor are killed, and a
+        record of every hit is appended to 'hits' in the same layout returned
+        by CollisionEngine.detect().
+
+        Args:
+            player (Player): The player's ship, or None to only check the lasers.
+            lasers (pygame.sprite.Group): All active lasers.
+            hits (dict): The collision results to add to.
+        """
+        if not self.count:
+            return
+
+        # 1. Player: meteors damage the ship, pickups are collected.
+        if player is not None:
+            for index in self._overlapping(player.rect):
+                if self._maskHit(player, index):
+                    record = self._hitRecord(index)
+                    kind = record.itemType
+                    hits['player' if kind == 'meteor' else kind].append(record)
+                    self.alive[index] = False
+
+        # 2. Lasers: only meteors can be shot.
+        meteors = self.kind[:self.count] == self.kindIndex['meteor']
+        for laser in lasers.sprites():
+            laserHit = False
+            for index in self._overlapping(laser.rect, meteors):
+                if self._maskHit(laser, index):
+                    hits['laser'].append(self._hitRecord(index))
+                    self.alive[index] = False
+                    laserHit = True
+            if laserHit:
+                laser.kill()
+
+        self.compact()
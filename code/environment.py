@@ -0,0 +1,523 @@
+# =====================================================================
+# METEOR DODGER - ENVIRONMENT API
+# =====================================================================
+# A reset()/step(action) interface over the game core, for automated
+# players, bots and training. It drives the same fixed-step simulation
+# as the game and headless.py, without a window, audio or frame clock.
+#
+#   * MeteorEnv runs one game. An action is one of actionCount discrete
+#     choices (a movement direction, with or without a shot), and each
+#     step simulates envFrameSkip fixed steps with it. step() returns the
+#     observation, the reward, whether the episode is done and an info
+#     dictionary.
+#   * Observations are either 'entities' (a float32 array: the player,
+#     then the nearest falling objects) or 'frame' (a downsampled
+#     grayscale uint8 image of the drawn frame).
+#   * VectorEnv runs N independent, seeded games, one per worker process,
+#     and steps them in lockstep. Actions, observations, rewards and done
+#     flags are exchanged through shared memory; the pipes to the workers
+#     only carry short commands and the info dictionaries, so nothing is
+#     pickled per step but those. Workers don't share any state, so
+#     throughput scales with the number of cores.
+#
+# Usage (from the 'code' directory):
+#     python environment.py --envs 1 2 4 --steps 2000
+#     python environment.py --envs 4 --observation frame
+
+# --- Standard Library Imports ---
+import argparse  # Used to read the benchmark options from the command line.
+import multiprocessing as mp  # Used for the worker processes and their command pipes.
+import os  # Used to select SDL's dummy video and audio drivers.
+import time  # Used to measure the benchmark's throughput.
+from multiprocessing import shared_memory  # Used to share observations with the worker processes.
+
+# SDL reads these when pygame is initialized, so they must be set before the game starts.
+os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+os.environ.setdefault('SDL_AUDIODRIVER', 'dummy')
+# Keeps pygame's import banner out of the output of every worker process.
+os.environ.setdefault('PYGAME_HIDE_SUPPORT_PROMPT', '1')
+
+# --- Third-Party Imports ---
+import pygame  # Used to read the drawn frame.
+
+try:
+    import numpy as np  # Used for the observation arrays.
+except ImportError:  # NumPy is optional; only the environment API needs it.
+    np = None
+
+# --- Local Application Imports ---
+import gameSettings as gS
+import replay as rP
+from main import Shooter
+
+# The held movement keys of each action's direction: none, then clockwise from up.
+directions = (
+    0,
+    rP.keyW,
+    rP.keyW | rP.keyD,
+    rP.keyD,
+    rP.keyS | rP.keyD,
+    rP.keyS,
+    rP.keyS | rP.keyA,
+    rP.keyA,
+    rP.keyW | rP.keyA,
+)
+# Action = direction * 2 + fire, so even actions only move and odd actions also shoot.
+actionCount = len(directions) * 2
+
+# The value in an entity observation's first column for each kind of falling object.
+kindCodes = {'meteor': 1.0, 'ammo': 2.0, 'health': 3.0, 'life': 4.0}
+# The columns of an entity observation.
+entityColumns = 4
+
+# The observation types MeteorEnv supports.
+observationTypes = ('entities', 'frame')
+
+
+def actionInput(action):
+    """
+    Returns the first simulation step's input for a discrete action.
+
+    Args:
+        action (int): The action, from 0 to actionCount - 1.
+
+    Returns:
+        replay.TickInput: The held movement keys and, for odd actions, one shot.
+    """
+    direction, fire = divmod(int(action), 2)
+    return rP.TickInput(keys=directions[direction], fires=fire)
+
+
+class MeteorEnv:
+    """
+    One game, driven one action at a time.
+
+    Only one MeteorEnv can exist per process: pygame has a single display,
+    and frame observations resize it. Use VectorEnv to run several games.
+    """
+
+    def __init__(self, seed=None, observation='entities', frameSize=gS.envFrameSize,
+                 frameSkip=gS.envFrameSkip, maxEntities=gS.envMaxEntities, maxSeconds=gS.envMaxSeconds):
+        """
+        Creates the game, without starting an episode. Call reset() first.
+
+        Args:
+            seed (int): The seed of the first episode. None = a random seed.
+            observation (str): 'entities' for object arrays or 'frame' for a downsampled image.
+            frameSize (tuple): The (width, height) of frame observations.
+            frameSkip (int): The simulation steps run per step(), all with the same action.
+            maxEntities (int): The falling objects in an entity observation (the nearest ones).
+            maxSeconds (float): Episodes end after this many game seconds. None = only when the player dies.
+
+        Raises:
+            ImportError: If NumPy is not installed.
+            ValueError: If 'observation' is not one of observationTypes.
+        """
+        if np is None:
+            raise ImportError("The environment API needs NumPy: pip install numpy")
+        if observation not in observationTypes:
+            raise ValueError(f"Unknown observation {observation!r}, expected one of {observationTypes}")
+        self.observation = observation
+        self.frameSize = tuple(frameSize)
+        self.frameSkip = frameSkip
+        self.maxEntities = maxEntities
+        self.maxSeconds = maxSeconds
+        self.seed = seed
+        self.dt = 1 / gS.simulationRate
+
+        # 1. Frames are drawn directly at the observation size, so reading one doesn't scale anything.
+        if observation == 'frame':
+            gS.renderSize = gS.windowSize = self.frameSize
+
+        # 2. The game, fed by the current action instead of live input.
+        self.game = Shooter(headless=True)
+        self.game.inputSource = self._nextInput
+        self.input = rP.TickInput()
+
+        # 3. The observation's layout.
+        if observation == 'entities':
+            self.observationShape = (1 + maxEntities, entityColumns)
+            self.observationDtype = np.float32
+        else:
+            self.observationShape = (self.frameSize[1], self.frameSize[0])
+            self.observationDtype = np.uint8
+        # Normalizes positions to 0..1 and speeds to screen heights per second.
+        self.scale = np.array([1.0, 1 / gS.screenWidth, 1 / gS.screenHeight, 1 / gS.screenHeight],
+                              dtype=np.float32)
+        # The luma weights of the red, green and blue channels, for grayscale frames.
+        self.luma = np.array([0.299, 0.587, 0.114], dtype=np.float32)
+
+    def _nextInput(self):
+        """The game's input source: the current action, with its shot only on the first step."""
+        tickInput = self.input
+        if tickInput.fires:
+            self.input = rP.TickInput(keys=tickInput.keys)
+        return tickInput
+
+    def reset(self, seed=None, out=None):
+        """
+        Starts a new episode.
+
+        Args:
+            seed (int): The episode's seed. None = the seed given to the constructor
+                (then a random one for every later episode).
+            out (numpy.ndarray): An array to write the observation into (e.g., shared memory).
+
+        Returns:
+            numpy.ndarray: The first observation.
+        """
+        if seed is None:
+            seed, self.seed = self.seed, None
+        self.game.reset(seed)
+        self.input = rP.TickInput()
+        return self.observe(out)
+
+    def step(self, action, out=None):
+        """
+        Applies an action for frameSkip simulation steps.
+
+        The reward is the game time survived during the step (the score is the
+        whole seconds survived) minus a penalty of 1 per 100 health lost.
+
+        Args:
+            action (int | replay.TickInput): A discrete action, or the input to apply directly
+                (a given shot is only fired on the first step).
+            out (numpy.ndarray): An array to write the observation into (e.g., shared memory).
+
+        Returns:
+            tuple: (observation, reward, done, info). 'info' holds the score, health,
+                ammo and game time, and whether the episode was cut off by maxSeconds.
+        """
+        game = self.game
+        self.input = action if isinstance(action, rP.TickInput) else actionInput(action)
+        startTime = game.gameTime
+        startHealth = game.player.health
+
+        # 1. Simulate, stopping early if the player dies.
+        for _ in range(self.frameSkip):
+            game.step(self.dt)
+            if game.gameOver:
+                break
+
+        # 2. Survival time, less the health lost (health picked up doesn't count).
+        healthLost = max(0, startHealth - game.player.health)
+        reward = (game.gameTime - startTime) - healthLost / 100
+        truncated = not game.gameOver and self.maxSeconds is not None and game.gameTime >= self.maxSeconds
+        info = {
+            'score': int(game.gameTime),
+            'health': game.player.health,
+            'ammo': game.ammo,
+            'gameTime': game.gameTime,
+            'truncated': truncated,
+        }
+        return self.observe(out), reward, game.gameOver or truncated, info
+
+    def observe(self, out=None):
+        """
+        Returns the current observation.
+
+        Args:
+            out (numpy.ndarray): An array of observationShape to write into. None = a new array.
+
+        Returns:
+            numpy.ndarray: The observation.
+        """
+        if out is None:
+            out = np.empty(self.observationShape, dtype=self.observationDtype)
+        if self.observation == 'entities':
+            self._observeEntities(out)
+        else:
+            self._observeFrame(out)
+        return out
+
+    def _observeEntities(self, out):
+        """
+        Writes the entity observation into 'out'.
+
+        Row 0 is the player: (0, x, y, health), with health from 0 to 1. The other
+        rows are the nearest falling objects, nearest first: (kind code, x, y, speed).
+        Positions are centers divided by the screen size. Unused rows are zero.
+        """
+        game = self.game
+        player = game.player
+        objects = self._objects()
+
+        # 1. The player.
+        out[0] = (0.0, player.rect.centerx / gS.screenWidth, player.rect.centery / gS.screenHeight,
+                  max(0, player.health) / 100)
+
+        # 2. The nearest objects to the player.
+        rows = out[1:]
+        rows[:] = 0.0
+        if len(objects):
+            dx = objects[:, 1] - player.rect.centerx
+            dy = objects[:, 2] - player.rect.centery
+            distance = dx * dx + dy * dy
+            count = min(len(objects), self.maxEntities)
+            if count < len(objects):
+                nearest = np.argpartition(distance, count - 1)[:count]
+                nearest = nearest[np.argsort(distance[nearest])]
+            else:
+                nearest = np.argsort(distance)
+            rows[:count] = objects[nearest] * self.scale
+
+    def _objects(self):
+        """Returns every falling object as (kind code, x, y, speed) rows, in screen pixels."""
+        game = self.game
+        entities = game.entities
+        if entities is not None:
+            count = entities.count
+            objects = np.empty((count, entityColumns), dtype=np.float32)
+            codes = np.array([kindCodes[name] for name in entities.kindNames], dtype=np.float32)
+            objects[:, 0] = codes[entities.kind[:count]]
+            objects[:, 1] = entities.x[:count]
+            objects[:, 2] = entities.y[:count]
+            objects[:, 3] = entities.speed[:count]
+        else:
+            objects = np.empty((0, entityColumns), dtype=np.float32)
+        # Sprite droppings (the default backend, or pickups alongside the store).
+        extra = [sprite for group in game.droppings.values() for sprite in group]
+        if not extra:
+            return objects
+        sprites = np.array([(kindCodes[sprite.itemType], sprite.rect.centerx, sprite.rect.centery, sprite.speed)
+                            for sprite in extra], dtype=np.float32)
+        return np.concatenate((objects, sprites)) if len(objects) else sprites
+
+    def _observeFrame(self, out):
+        """Draws the current frame and writes it into 'out' as a grayscale image."""
+        game = self.game
+        game.draw()
+        # pixels3d is a view of the display surface in (x, y, channel) order, without a copy.
+        pixels = pygame.surfarray.pixels3d(game.displaySurface)
+        out[:] = (pixels.transpose(1, 0, 2) @ self.luma).astype(np.uint8)
+        del pixels
+
+    def close(self):
+        """Shuts the game down."""
+        pygame.quit()
+
+
+# --- Vectorized environments ---
+
+def _attach(name, shape, dtype):
+    """
+    Opens a shared memory block created by VectorEnv and returns it with an array view of it.
+
+    Workers are started with 'spawn', so they share VectorEnv's resource tracker and
+    the block stays owned (and is unlinked) by the process that created it.
+    """
+    block = shared_memory.SharedMemory(name=name)
+    return block, np.ndarray(shape, dtype=dtype, buffer=block.buf)
+
+
+def _runWorker(index, connection, layout, seed, stride, options):
+    """
+    The body of one worker process: owns one MeteorEnv and runs the commands sent to it.
+
+    Args:
+        index (int): The environment's position in the shared arrays.
+        connection (multiprocessing.connection.Connection): The command pipe.
+        layout (dict): Maps each shared array's name to its (block name, shape, dtype).
+        seed (int): The seed of the environment's first episode.
+        stride (int): Added to the seed for each later episode, so no two environments share one.
+        options (dict): The MeteorEnv keyword arguments.
+    """
+    env = MeteorEnv(**options)
+    blocks = {}
+    arrays = {}
+    for key, (name, shape, dtype) in layout.items():
+        blocks[key], arrays[key] = _attach(name, shape, dtype)
+    observation = arrays['observations'][index]
+    episodeSeed = seed
+
+    try:
+        while True:
+            command, value = connection.recv()
+            if command == 'reset':
+                episodeSeed = seed if value is None else value
+                env.reset(episodeSeed, out=observation)
+                connection.send(None)
+            elif command == 'step':
+                _, reward, done, info = env.step(arrays['actions'][index], out=observation)
+                arrays['rewards'][index] = reward
+                arrays['dones'][index] = done
+                if done:
+                    # Start the next episode at once; its first observation replaces the last one.
+                    info['finalObservation'] = observation.copy()
+                    episodeSeed += stride
+                    env.reset(episodeSeed, out=observation)
+                connection.send(info)
+            else:
+                break
+    except (KeyboardInterrupt, EOFError):
+        pass
+    finally:
+        del observation, arrays
+        for block in blocks.values():
+            block.close()
+        env.close()
+
+
+class VectorEnv:
+    """
+    N independent games stepped in lockstep, each in its own worker process.
+
+    Environment i starts with seed + i, and each of its later episodes adds
+    N to its seed, so every episode of a run has its own seed and the whole
+    run can be reproduced. A finished environment starts its next episode
+    straight away: the observation returned for it is the new episode's first
+    one, and the last one is in its info's 'finalObservation'.
+    """
+
+    def __init__(self, count, seed=0, observation='entities', **options):
+        """
+        Starts the worker processes and waits until their games are ready.
+
+        Args:
+            count (int): The number of environments (and worker processes).
+            seed (int): The seed of environment 0's first episode.
+            observation (str): 'entities' or 'frame' (see MeteorEnv).
+            **options: Other MeteorEnv keyword arguments (frameSize, frameSkip, ...).
+
+        Raises:
+            ImportError: If NumPy is not installed.
+        """
+        if np is None:
+            raise ImportError("The environment API needs NumPy: pip install numpy")
+        self.count = count
+        self.seed = seed
+        options['observation'] = observation
+
+        # 1. The observation layout, without creating a game in this process.
+        if observation == 'entities':
+            observationShape = (1 + options.get('maxEntities', gS.envMaxEntities), entityColumns)
+            observationDtype = np.float32
+        else:
+            width, height = options.get('frameSize', gS.envFrameSize)
+            observationShape = (height, width)
+            observationDtype = np.uint8
+
+        # 2. One shared block per array, each with a row per environment.
+        specs = {
+            'observations': ((count, *observationShape), observationDtype),
+            'actions': ((count,), np.int64),
+            'rewards': ((count,), np.float64),
+            'dones': ((count,), np.bool_),
+        }
+        self.blocks = {}
+        layout = {}
+        for key, (shape, dtype) in specs.items():
+            size = max(1, int(np.prod(shape)) * np.dtype(dtype).itemsize)
+            block = shared_memory.SharedMemory(create=True, size=size)
+            self.blocks[key] = block
+            setattr(self, key, np.ndarray(shape, dtype=dtype, buffer=block.buf))
+            layout[key] = (block.name, shape, dtype)
+
+        # 3. The workers. 'spawn' starts each from a clean interpreter, so no SDL state is inherited.
+        context = mp.get_context('spawn')
+        self.connections = []
+        self.workers = []
+        for index in range(count):
+            connection, workerConnection = context.Pipe()
+            worker = context.Process(
+                target=_runWorker,
+                args=(index, workerConnection, layout, seed + index, count, options),
+                name=f'meteorEnv-{index}',
+                daemon=True,
+            )
+            worker.start()
+            workerConnection.close()
+            self.connections.append(connection)
+            self.workers.append(worker)
+        self.closed = False
+
+    def reset(self, seeds=None):
+        """
+        Starts a new episode in every environment.
+
+        Args:
+            seeds (list): One seed per environment. None = each environment's own starting seed.
+
+        Returns:
+            numpy.ndarray: The observations, one row per environment. This is the shared
+                array itself: it is overwritten by the next reset() or step().
+        """
+        for index, connection in enumerate(self.connections):
+            connection.send(('reset', None if seeds is None else seeds[index]))
+        for connection in self.connections:
+            connection.recv()
+        return self.observations
+
+    def step(self, actions):
+        """
+        Applies one action to each environment, all in parallel.
+
+        Args:
+            actions (sequence): One discrete action per environment.
+
+        Returns:
+            tuple: (observations, rewards, dones, infos). The observations are the shared
+                array (see reset()); rewards and dones are copies; infos is a list of dicts.
+        """
+        self.actions[:] = actions
+        for connection in self.connections:
+            connection.send(('step', None))
+        infos = [connection.recv() for connection in self.connections]
+        return self.observations, self.rewards.copy(), self.dones.copy(), infos
+
+    def close(self):
+        """Stops the workers and frees the shared memory."""
+        if self.closed:
+            return
+        self.closed = True
+        for connection in self.connections:
+            try:
+                connection.send(('close', None))
+            except (BrokenPipeError, OSError):
+                pass
+        for worker in self.workers:
+            worker.join(timeout=5)
+            if worker.is_alive():
+                worker.terminate()
+        # Drop the views before the blocks they point into.
+        for key in self.blocks:
+            setattr(self, key, None)
+        for block in self.blocks.values():
+            block.close()
+            block.unlink()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def main(argv=None):
+    """Command-line entry point: measures stepping throughput for several environment counts."""
+    parser = argparse.ArgumentParser(description="Measure Meteor Dodger environment steps per second.")
+    parser.add_argument('--envs', type=int, nargs='+', default=[1, os.cpu_count() or 1],
+                        help="Environment counts to measure.")
+    parser.add_argument('--steps', type=int, default=1000, help="Vector steps per measurement.")
+    parser.add_argument('--observation', choices=observationTypes, default='entities')
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args(argv)
+
+    for count in args.envs:
+        with VectorEnv(count, seed=args.seed, observation=args.observation) as envs:
+            envs.reset()
+            # Random actions from a seeded generator, so runs are comparable.
+            actions = np.random.default_rng(args.seed).integers(0, actionCount, size=(args.steps, count))
+            episodes = 0
+            start = time.perf_counter()
+            for stepActions in actions:
+                _, _, dones, _ = envs.step(stepActions)
+                episodes += int(dones.sum())
+            wallTime = time.perf_counter() - start
+        envSteps = args.steps * count
+        print(f"envs={count} steps={envSteps} episodes={episodes} wall={wallTime:.2f}s "
+              f"speed={envSteps / wallTime:.0f} steps/s ({envSteps / wallTime / count:.0f} per env)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,150 @@
+# =====================================================================
+# METEOR DODGER - ASSET REGISTRY
+# =====================================================================
+# Loads every image the game uses exactly once at startup and hands out
+# shared pygame.Surface objects by name, so spawning sprites and firing
+# lasers never has to touch the disk during gameplay. Images come from the
+# memory-mapped asset pack when an up-to-date one exists (see assetPack.py),
+# otherwise the PNG files are decoded on a pool of threads.
+
+# --- Standard Library Imports ---
+from concurrent.futures import ThreadPoolExecutor  # Used to decode PNG files in parallel.
+from os import path  # Used for creating operating-system-independent file paths to load assets.
+
+# --- Third-Party Imports ---
+import pygame  # Used to decode images and convert them to the display's pixel format.
+
+# --- Local Application Imports ---
+import gameSettings as gS
+import assetPack as aP
+import collisionEngine as cE
+
+# The project's root directory, resolved from this file so loading does not
+# depend on the current working directory.
+projectRoot = path.dirname(path.dirname(path.abspath(__file__)))
+imagesDir = path.join(projectRoot, 'images')
+
+
+def loadImage(fileName, root=imagesDir):
+    """
+    Loads a single image from the 'images' directory.
+
+    Args:
+        fileName (str): The image path relative to the images directory (e.g., 'player.png'
+            or 'explosion/0.png').
+        root (str): The directory to resolve the file name against.
+
+    Returns:
+        pygame.Surface: The loaded and optimized image surface.
+    """
+    # 1. Construct the full file path to the image.
+    imagePath = path.join(root, *fileName.split('/'))
+
+    # 2. Load the image and optimize it for the game.
+    # .convert_alpha() creates a copy of the Surface with a pixel format
+    # that's optimized for fast drawing (blitting) and preserves transparency.
+    return pygame.image.load(imagePath).convert_alpha()
+
+
+class AssetRegistry:
+    """
+    A central store of every image the game uses.
+
+    All images under the 'images' directory are decoded once by preload().
+    After that, get() simply returns the shared Surface for a name, so the
+    same Surface object is reused by every sprite that displays it. Lookups
+    are counted as hits (already loaded) or misses (had to be read from disk)
+    so it is easy to confirm nothing is loaded during gameplay.
+    """
+
+    def __init__(self, root=imagesDir, packPath=aP.defaultPackPath):
+        """
+        Initializes an empty registry.
+
+        Args:
+            root (str): The directory that holds the game's images.
+            packPath (str): The asset pack to load from when it is up to date. None = always decode.
+        """
+        self.root = root
+        self.packPath = packPath
+        # Where preload() got the images from: 'pack' or 'png'.
+        self.source = None
+        # Maps an image name (e.g., 'meteor.png') to its loaded Surface.
+        self.surfaces = {}
+        # Lookup counters used to verify that gameplay never loads from disk.
+        self.hits = 0
+        self.misses = 0
+
+    def preload(self):
+        """
+        Walks the images directory and loads every image it contains.
+
+        Names are the file paths relative to the images directory, using '/'
+        as the separator (e.g., 'explosion/0.png'). A display mode must have
+        been set before calling this, because images are converted to the
+        display's pixel format.
+
+        Returns:
+            AssetRegistry: The registry itself, to allow chaining.
+        """
+        sources = {name: filePath for name, filePath in aP.findImages(self.root).items()
+                   if name not in self.surfaces}
+
+        # 1. Fast path: build every surface and mask straight from the mapped asset pack.
+        pack = aP.AssetPack.open(self.packPath)
+        if pack is not None:
+            if pack.isCurrent(sources):
+                for name in sources:
+                    surface = pack.surface(name)
+                    self.surfaces[name] = surface
+                    cE.masks.put(surface, pack.mask(name))
+                pack.close()
+                self.source = 'pack'
+                return self
+            pack.close()
+            print("Warning: The asset pack is out of date; run 'python assetPack.py' to rebuild it.")
+
+        # 2. Fallback: decode the PNG files on a pool of threads. Converting to the
+        # display's pixel format touches the display, so it stays on this thread.
+        with ThreadPoolExecutor(max_workers=gS.assetLoaderThreads) as pool:
+            decoded = pool.map(pygame.image.load, sources.values())
+            for name, image in zip(sources, decoded):
+                self.surfaces[name] = image.convert_alpha()
+        self.source = 'png'
+        return self
+
+    def get(self, name):
+        """
+        Returns the shared Surface for an image name.
+
+        If the image was not preloaded, it is loaded from disk once and cached,
+        and the lookup is counted as a miss.
+
+        Args:
+            name (str): The image name, relative to the images directory.
+
+        Returns:
+            pygame.Surface: The shared, display-optimized image surface.
+        """
+        surface = self.surfaces.get(name)
+        if surface is not None:
+            self.hits += 1
+            return surface
+
+        # Fallback path: load the image now and keep it for future lookups.
+        self.misses += 1
+        surface = loadImage(name, self.root)
+        self.surfaces[name] = surface
+        return surface
+
+    def __contains__(self, name):
+        return name in self.surfaces
+
+    def stats(self):
+        """Returns a dictionary with the number of loaded images and lookup counters."""
+        return {
+            'images': len(self.surfaces),
+            'source': self.source,
+            'hits': self.hits,
+            'misses': self.misses,
+        }
@@ -0,0 +1,448 @@
+# =====================================================================
+# METEOR DODGER - GAME CONFIGURATION
+# =====================================================================
+# Loads tuning values from a TOML or JSON settings file over the defaults
+# in gameSettings.py, so the game can be balanced without editing code.
+# The file uses the same names as gameSettings.py and may hold named
+# profiles, applied on top of its other values:
+#
+#     profile = "hard"            # optional: the profile to apply
+#     meteorSpeed = 550
+#
+#     [profiles.hard]
+#     meteorSpawnRate = 0.3
+#     difficultyIncrement = 15
+#
+# Every value is checked against the type of its default (and against a
+# range or a set of choices where one applies) before anything is changed,
+# and unknown names are rejected, so a typo can't silently do nothing.
+# Settings computed from others (e.g., screenSize from screenWidth and
+# screenHeight) are recomputed after every load.
+#
+# While the game runs the file is polled for changes. A changed, valid
+# file is applied to gameSettings at once and the game is told which
+# settings changed (see Shooter.applySettings in main.py); an invalid one
+# is reported and ignored. Settings only read at startup (the window
+# size, pools, ...) are left alone by a reload and apply on the next start.
+
+# --- Standard Library Imports ---
+import json  # Used to read JSON settings files.
+import os  # Used to check the settings file's modification time.
+import tomllib  # Used to read TOML settings files.
+from os import path  # Used for creating operating-system-independent file paths.
+from time import perf_counter  # Used to space out the file checks.
+
+# --- Local Application Imports ---
+import gameSettings as gS
+
+# The project's root directory; the settings file is looked up relative to it.
+projectRoot = path.dirname(path.dirname(path.abspath(__file__)))
+
+# The reserved top-level names of a settings file.
+profileKey = 'profile'
+profilesKey = 'profiles'
+
+# Settings that can't be set from a settings file.
+fileExcluded = frozenset({'configFile'})
+
+# Settings whose default is None, with the type of value they hold when set.
+optionalTypes = {
+    'renderSize': tuple,
+    'windowSize': tuple,
+    'dataDir': str,
+    'replayPath': str,
+    'profilerCsvPath': str,
+    'envMaxSeconds': float,
+    'captureDir': str,
+    'quickSavePath': str,
+}
+
+# Numeric settings that must be whole numbers.
+integerSettings = frozenset({
+    'screenWidth', 'screenHeight', 'fps', 'unfocusedFps', 'simulationRate', 'textCacheSize',
+    'assetLoaderThreads', 'numberOfStars', 'randomSeed', 'starsPerParallaxLayer', 'ammo',
+    'explosionFrameRate', 'playerFrameRate', 'meteorPoolSize', 'laserPoolSize', 'pickupPoolSize',
+    'explosionPoolSize', 'entityCapacity', 'stormMeteorCount', 'soundChannels', 'leaderboardSize',
+    'leaderboardShown', 'profilerFrames', 'captureSlots', 'envFrameSkip', 'envMaxEntities',
+    'netplayPort', 'netplayInputDelay', 'netplayMaxRollback', 'latencySamples',
+})
+
+# The allowed (lowest, highest) values of numeric settings. None = unbounded.
+limits = {
+    'screenWidth': (320, None),
+    'screenHeight': (240, None),
+    'fps': (1, None),
+    'unfocusedFps': (1, None),
+    'simulationRate': (1, None),
+    'maxFrameTime': (0.001, None),
+    'textCacheSize': (1, None),
+    'assetLoaderThreads': (1, None),
+    'numberOfStars': (0, None),
+    'starsPerParallaxLayer': (0, None),
+    'playerSpeed': (0, None),
+    'healthLossByCollision': (0, None),
+    'ammo': (0, None),
+    'laserSpeed': (0, None),
+    'meteorSpeed': (0, None),
+    'meteorSpawnRate': (0.001, None),
+    'ammoSpeed': (0, None),
+    'ammoSpawnRate': (0.001, None),
+    'ammoIncrement': (0, None),
+    'healthSpeed': (0, None),
+    'healthSpawnRate': (0.001, None),
+    'healthIncrement': (0, None),
+    'lifeSpeed': (0, None),
+    'lifeSpawnRate': (0.001, None),
+    'explosionFrameRate': (1, None),
+    'playerFrameRate': (1, None),
+    'randomProbability': (0, 100),
+    'difficultyIncrement': (0, 99),
+    'difficultyTime': (0.001, None),
+    'meteorPoolSize': (0, None),
+    'laserPoolSize': (0, None),
+    'pickupPoolSize': (0, None),
+    'explosionPoolSize': (0, None),
+    'entityCapacity': (1, None),
+    'stormMeteorCount': (0, None),
+    'musicVolume': (0, 1),
+    'soundChannels': (1, None),
+    'leaderboardSize': (1, None),
+    'leaderboardShown': (0, None),
+    'profilerFrames': (1, None),
+    'netplayPort': (1, 65535),
+    'netplayInputDelay': (0, None),
+    'netplayMaxRollback': (1, None),
+    'netplayTimeout': (0.1, None),
+    'coopSpacing': (0, None),
+    'latencySamples': (1, None),
+    'rewindSeconds': (0, None),
+    'captureFps': (0.001, None),
+    'captureSlots': (1, None),
+    'instantReplaySeconds': (0, None),
+    'envFrameSkip': (1, None),
+    'envMaxEntities': (0, None),
+    'envMaxSeconds': (0.001, None),
+    'configPollInterval': (0, None),
+}
+
+# Settings that only accept one of a few values.
+choices = {
+    'entityBackend': ('sprites', 'numpy'),
+    'renderFilter': ('smooth', 'nearest'),
+    'captureFormat': ('png', 'raw'),
+    'framePacing': ('sleep', 'busy', 'uncapped'),
+}
+
+# Settings that are a (width, height) size in pixels. Both must be whole numbers of at least 1.
+sizeSettings = frozenset({'renderSize', 'windowSize', 'explosionSize', 'envFrameSize', 'profilerOverlaySize'})
+# The fields of an entry in 'soundEffects', with the type each holds. Only 'file' is required.
+soundEffectFields = {'file': str, 'volume': float, 'priority': int, 'cooldown': float}
+
+
+def deriveSettings(values):
+    """
+    Computes the settings that follow from other settings.
+
+    Args:
+        values (dict): Every setting, by name.
+
+    Returns:
+        dict: The derived settings, by name.
+    """
+    width, height = values['screenWidth'], values['screenHeight']
+    return {
+        'screenSize': (width, height),
+        'screenCenter': (width / 2, height / 2),
+        'playSpace': (350, width - 350),
+        'difficultyMultiplier': (100 - values['difficultyIncrement']) / 100,
+    }
+
+
+# The default of every setting, as written in gameSettings.py. Each load starts from
+# these, so removing a value from the settings file restores its default.
+defaults = {
+    name: value for name, value in vars(gS).items()
+    if not name.startswith('_') and not callable(value) and not isinstance(value, type(os))
+}
+
+# The settings that are computed, so they can't be set from a file.
+derivedSettings = frozenset(deriveSettings(defaults))
+
+# Settings that are only read while the game starts (window, assets, pools, sound,
+# storage). A reload while the game runs leaves them unchanged until the next start.
+restartSettings = frozenset({
+    'screenWidth', 'screenHeight', 'simulationRate', 'renderSize', 'windowSize', 'renderFilter',
+    'textCacheSize', 'assetPackFile', 'assetLoaderThreads', 'explosionSize', 'playerFrames',
+    'meteorPoolSize', 'laserPoolSize', 'pickupPoolSize', 'explosionPoolSize', 'entityBackend',
+    'entityCapacity', 'soundChannels', 'soundEffects', 'musicFile', 'musicVolume', 'leaderboardSize',
+    'dataDir', 'replayPath', 'profilerFrames', 'profilerOverlaySize', 'numberOfStars', 'randomSeed',
+    'capture', 'captureFps', 'captureFormat', 'captureSlots', 'instantReplaySeconds', 'captureDir',
+    'rewindSeconds', 'latencySamples',
+})
+
+
+class ConfigError(ValueError):
+    """A settings file that can't be used. The message lists every problem found."""
+
+
+def readFile(filePath):
+    """
+    Reads a TOML (.toml) or JSON (any other extension) settings file.
+
+    Raises:
+        ConfigError: If the file can't be parsed.
+        OSError: If the file can't be read.
+    """
+    with open(filePath, 'rb') as f:
+        data = f.read()
+    try:
+        if filePath.lower().endswith('.toml'):
+            return tomllib.loads(data.decode('utf-8'))
+        return json.loads(data)
+    except (tomllib.TOMLDecodeError, json.JSONDecodeError, UnicodeDecodeError) as error:
+        raise ConfigError(f"{filePath}: {error}") from None
+
+
+def checkValue(name, value, problems):
+    """
+    Checks one value against its setting's default type, limits and choices.
+
+    Args:
+        name (str): The setting's name.
+        value: The value from the file.
+        problems (list): Descriptions of invalid values are appended here.
+
+    Returns:
+        The value converted to the setting's type (e.g., a list to a tuple).
+    """
+    default = defaults[name]
+    if value is None and (default is None or name in optionalTypes):
+        return None
+    expected = optionalTypes.get(name, type(default))
+
+    # 1. The type. Numbers may be given as int or float unless they must be whole.
+    if expected is bool:
+        valid = isinstance(value, bool)
+    elif expected in (int, float):
+        valid = isinstance(value, (int, float)) and not isinstance(value, bool)
+        if valid and name in integerSettings:
+            valid = float(value).is_integer()
+            value = int(value) if valid else value
+    elif expected is tuple:
+        valid = isinstance(value, (list, tuple))
+        value = tuple(value) if valid else value
+    else:
+        valid = isinstance(value, expected)
+    if not valid:
+        if expected in (int, float):
+            typeName = 'a whole number' if name in integerSettings else 'a number'
+        else:
+            typeName = expected.__name__
+        problems.append(f"{name}: expected {typeName}, got {value!r}")
+        return value
+
+    # 2. The contents of lists and tables.
+    if isinstance(value, (tuple, dict)):
+        value = checkContents(name, value, problems)
+
+    # 3. The allowed range or choices.
+    low, high = limits.get(name, (None, None))
+    if (low is not None and value < low) or (high is not None and value > high):
+        problems.append(f"{name}: {value!r} is outside {low} .. {'any' if high is None else high}")
+    if name in choices and value not in choices[name]:
+        problems.append(f"{name}: {value!r} is not one of {choices[name]}")
+    return value
+
+
+def isNumber(value, whole=False):
+    """Returns whether a value from a file is a number (a whole one, if 'whole' is set)."""
+    if isinstance(value, bool) or not isinstance(value, (int, float)):
+        return False
+    return not whole or float(value).is_integer()
+
+
+def checkContents(name, value, problems):
+    """
+    Checks the contents of a setting that holds a list or a table, after its own type was checked.
+
+    Args:
+        name (str): The setting's name.
+        value (tuple | dict): The value from the file.
+        problems (list): Descriptions of invalid contents are appended here.
+
+    Returns:
+        The value with its contents converted (e.g., lists of numbers to tuples of integers).
+    """
+    # 1. Sizes: exactly two whole numbers of at least 1.
+    if name in sizeSettings:
+        if len(value) != 2 or not all(isNumber(item, whole=True) and item >= 1 for item in value):
+            problems.append(f"{name}: expected [width, height], two whole numbers of at least 1, "
+                            f"got {value!r}")
+            return value
+        return tuple(int(item) for item in value)
+
+    # 2. Lists of plain values.
+    if name == 'parallaxSpeeds' and not all(isNumber(item) for item in value):
+        problems.append(f"{name}: expected a list of numbers, got {value!r}")
+    elif name == 'playerFrames' and not all(isinstance(item, str) for item in value):
+        problems.append(f"{name}: expected a list of image names, got {value!r}")
+
+    # 3. Colors: one or more [red, green, blue] lists of whole numbers from 0 to 255.
+    elif name == 'coopTints':
+        valid = len(value) > 0 and all(
+            isinstance(color, (list, tuple)) and len(color) == 3
+            and all(isNumber(part, whole=True) and 0 <= part <= 255 for part in color)
+            for color in value
+        )
+        if not valid:
+            problems.append(f"{name}: expected a list of [red, green, blue] colors (0 .. 255), got {value!r}")
+            return value
+        return tuple(tuple(int(part) for part in color) for color in value)
+
+    # 4. Sound effects: a table of effects, each with a file and optional volume, priority and cooldown.
+    elif name == 'soundEffects':
+        for effect, spec in value.items():
+            if not isinstance(spec, dict) or not isinstance(spec.get('file'), str):
+                problems.append(f"{name}.{effect}: expected a table with a 'file', got {spec!r}")
+                continue
+            for field, fieldValue in spec.items():
+                expected = soundEffectFields.get(field)
+                if expected is None:
+                    problems.append(f"{name}.{effect}.{field}: unknown field")
+                elif expected is not str and not isNumber(fieldValue, whole=expected is int):
+                    typeName = 'a whole number' if expected is int else 'a number'
+                    problems.append(f"{name}.{effect}.{field}: expected {typeName}, got {fieldValue!r}")
+            volume = spec.get('volume', 1.0)
+            if isNumber(volume) and not 0 <= volume <= 1:
+                problems.append(f"{name}.{effect}.volume: {volume!r} is outside 0 .. 1")
+            cooldown = spec.get('cooldown', 0.0)
+            if isNumber(cooldown) and cooldown < 0:
+                problems.append(f"{name}.{effect}.cooldown: {cooldown!r} is outside 0 .. any")
+    return value
+
+
+def resolve(data, profile=None):
+    """
+    Validates the contents of a settings file and selects its profile.
+
+    Args:
+        data (dict): The parsed file.
+        profile (str): The profile to apply. None = the file's own 'profile' value, if any.
+
+    Returns:
+        dict: The validated overrides, by setting name.
+
+    Raises:
+        ConfigError: If anything in the file is invalid.
+    """
+    if not isinstance(data, dict):
+        raise ConfigError("The settings file must hold a table of settings")
+    problems = []
+    profiles = data.get(profilesKey, {})
+    if profile is None:
+        profile = data.get(profileKey)
+
+    # 1. The file's own values, then the selected profile's on top.
+    layers = [('', {name: value for name, value in data.items() if name not in (profileKey, profilesKey)})]
+    if profile is not None:
+        if not isinstance(profiles, dict) or not isinstance(profiles.get(profile), dict):
+            raise ConfigError(f"Unknown profile {profile!r}")
+        layers.append((f"profiles.{profile}.", profiles[profile]))
+
+    # 2. Every value must name a real setting that can be set and hold a valid value.
+    overrides = {}
+    for prefix, values in layers:
+        for name, value in values.items():
+            if name in derivedSettings:
+                problems.append(f"{prefix}{name}: is computed from other settings and can't be set")
+            elif name in fileExcluded or name not in defaults:
+                problems.append(f"{prefix}{name}: unknown setting")
+            else:
+                overrides[name] = checkValue(name, value, problems)
+    if problems:
+        raise ConfigError("Invalid settings:\n  " + "\n  ".join(problems))
+    return overrides
+
+
+class GameConfig:
+    """A settings file applied over gameSettings.py, and reloaded when it changes."""
+
+    def __init__(self, filePath, profile=None):
+        """
+        Initializes the configuration. Nothing is read until load() is called.
+
+        Args:
+            filePath (str): The TOML or JSON settings file. It doesn't have to exist.
+            profile (str): The profile to apply. None = the file's own 'profile' value.
+        """
+        self.filePath = filePath
+        self.profile = profile
+        # The modification time of the file when it was last read (None = missing).
+        self.stamp = None
+        # The perf_counter() time of the next check for changes.
+        self.nextCheck = 0.0
+
+    def _stamp(self):
+        """Returns the file's modification time, or None if there is no file."""
+        try:
+            return os.stat(self.filePath).st_mtime_ns
+        except OSError:
+            return None
+
+    def load(self, keep=frozenset()):
+        """
+        Reads and validates the file, then applies it to gameSettings.
+
+        A missing file applies the defaults.
+
+        Args:
+            keep (set): Settings to leave at their current values (with everything derived from them).
+
+        Returns:
+            set: The names of the settings whose values changed.
+
+        Raises:
+            ConfigError: If the file is invalid. Nothing is changed in that case.
+        """
+        self.stamp = self._stamp()
+        overrides = {} if self.stamp is None else resolve(readFile(self.filePath), self.profile)
+
+        # Start from the defaults, so values removed from the file are restored.
+        values = dict(defaults)
+        values.update(overrides)
+        kept = sorted(name for name in keep if values[name] != getattr(gS, name))
+        for name in keep:
+            values[name] = getattr(gS, name)
+        values.update(deriveSettings(values))
+        if kept:
+            print(f"Warning: Changes to {', '.join(kept)} take effect after a restart.")
+
+        changed = set()
+        for name, value in values.items():
+            if getattr(gS, name) != value:
+                setattr(gS, name, value)
+                changed.add(name)
+        return changed
+
+    def poll(self):
+        """
+        Reloads the file if it changed since it was last read. Cheap to call every frame.
+
+        Returns:
+            set: The names of the settings that changed (empty if nothing did).
+        """
+        now = perf_counter()
+        if not gS.configReload or now < self.nextCheck:
+            return set()
+        self.nextCheck = now + gS.configPollInterval
+        if self._stamp() == self.stamp:
+            return set()
+
+        try:
+            changed = self.load(keep=restartSettings)
+        except (ConfigError, OSError) as error:
+            # Keep playing with the current settings until the file is fixed.
+            print(f"Warning: Settings were not reloaded ({error}).")
+            return set()
+        print(f"Reloaded {path.basename(self.filePath)}: {', '.join(sorted(changed)) or 'no changes'}.")
+        return changed
@@ -3,6 +3,8 @@
 # =====================================================================
 # This file contains all the core constants and configuration
 # variables for the game. Tweak these values to balance the gameplay.
+# Values in the settings file named by 'configFile' (see gameConfig.py)
+# override the ones here, and can be changed while the game runs.
 
 # --- Environment & Display Settings ---
 screenWidth = 1920
@@ -10,7 +12,33 @@ screenHeight = 1080
 screenSize = (screenWidth, screenHeight)
 screenCenter = (screenWidth / 2, screenHeight / 2)
 fps = 120  # Target frames per second for the game loop.
+# Simulation steps per second. The game always advances in fixed steps of 1 / simulationRate
+# seconds, independently of fps, so gameplay is the same on fast and slow machines.
+simulationRate = 120
+# The most real time (in seconds) simulated for a single frame, to avoid a spiral of
+# catch-up steps after a long stall.
+maxFrameTime = 0.25
 screenColor = 'darkslategray'  # Background color of the game window.
+# Rendering mode. False = redraw and flip the whole screen every frame,
+# True = only redraw and update the areas that changed (dirty rectangles).
+dirtyRects = False
+textCacheSize = 128  # The number of rendered text surfaces kept for reuse.
+# The resolution frames are drawn at, and the size of the window they are shown in. The
+# game logic always uses screenSize coordinates, so these never change gameplay or hitboxes.
+# None = screenSize. Example for slow machines: renderSize = (960, 540)
+renderSize = None
+windowSize = None
+renderFilter = 'smooth'  # How images and frames are scaled: 'smooth' or 'nearest'.
+# What happens when the game window loses focus. True = pause the game, False = keep
+# playing at a reduced frame rate of unfocusedFps. A minimized window always pauses.
+pauseOnFocusLoss = True
+unfocusedFps = 15
+
+# --- Asset Loading Settings ---
+# The packed image archive, relative to the project folder, built with 'python assetPack.py'.
+# When it is missing or out of date, the PNG files are decoded instead. None = never use it.
+assetPackFile = 'assets.pack'
+assetLoaderThreads = 4  # The number of threads decoding PNG files when no archive is used.
 
 # --- Gameplay Area Settings ---
 # Defines the horizontal area where gameplay occurs, accounting for sidebars.
@@ -21,6 +49,10 @@ droppingSpawnPosition = -50
 # --- Background Starfield Settings ---
 numberOfStars = 50  # The total number of stars to draw in the background.
 randomSeed = 654523  # A fixed seed to make the star pattern consistent every game.
+# Scroll speeds in pixels per second of optional parallax star layers, deepest first.
+# When empty, the static starfield above is used instead. Example: (20, 45, 90)
+parallaxSpeeds = ()
+starsPerParallaxLayer = 25  # The number of stars drawn on each parallax layer.
 
 # --- Player Settings ---
 playerSpeed = 600  # The movement speed of the player's ship in pixels per second.
@@ -48,14 +80,140 @@ healthIncrement = 10  # The amount of health restored by one pack.
 lifeSpeed = 300  # The downward speed of life packs.
 lifeSpawnRate = 20  # The base time in seconds between life pack spawns.
 
+# --- Animation Settings ---
+explosionSize = (100, 100)  # The size in pixels explosion frames are scaled to.
+explosionFrameRate = 40  # Explosion frames per second.
+# Optional engine animation for the player's ship: image names played in a loop at
+# playerFrameRate, scaled to the size of player.png. Empty = the static player.png.
+playerFrames = ()
+playerFrameRate = 12
+
 # --- Gameplay Mechanic Settings ---
 # The percentage of random variance to apply to spawn rates (e.g., 20 means +/- 20%).
 randomProbability = 20
 # The percentage by which to increase difficulty each time the threshold is met.
 difficultyIncrement = 10
+# The factor every spawn interval is multiplied by at each difficulty increase.
+# Derived from difficultyIncrement; gameConfig.py recomputes it when settings change.
+difficultyMultiplier = (100 - difficultyIncrement) / 100
 # The initial time in seconds before the first difficulty increase.
 difficultyTime = 10
 
+# --- Object Pool Settings ---
+# The number of objects of each type created up front and reused while playing.
+meteorPoolSize = 64
+laserPoolSize = 32
+pickupPoolSize = 8  # Used for each of the ammo, health and life packs.
+explosionPoolSize = 16
+
+# --- Entity Backend Settings ---
+# How falling objects are stored. 'sprites' = one pygame Sprite per object,
+# 'numpy' = NumPy arrays updated and drawn in batches (requires numpy).
+entityBackend = 'sprites'
+entityCapacity = 8192  # The number of objects the NumPy arrays hold before growing.
+# Storm mode keeps about stormMeteorCount meteors on screen at once ('numpy' backend only).
+stormMode = False
+stormMeteorCount = 5000
+
+# --- Sound Settings ---
+# The background music file in the 'audio' folder. It is streamed from disk while playing.
+musicFile = 'gameMusic.wav'
+musicVolume = 0.1
+soundChannels = 8  # The most sound effects that can play at the same time.
+# Every sound effect: its file in the 'audio' folder, volume (0.0 - 1.0), priority (a sound
+# may take over a channel from a sound of lower or equal priority when all are busy) and
+# cooldown (the shortest time in seconds between two plays of the same effect).
+soundEffects = {
+    'ammo': {'file': 'ammo.wav', 'volume': 1.0, 'priority': 2, 'cooldown': 0.0},
+    'damage': {'file': 'damage.wav', 'volume': 1.0, 'priority': 3, 'cooldown': 0.1},
+    'explosion': {'file': 'explosion.wav', 'volume': 0.35, 'priority': 1, 'cooldown': 0.05},
+    'life': {'file': 'fullHealth.wav', 'volume': 1.0, 'priority': 3, 'cooldown': 0.0},
+    'health': {'file': 'healthPack.wav', 'volume': 1.0, 'priority': 2, 'cooldown': 0.0},
+    'laser': {'file': 'laser.wav', 'volume': 1.0, 'priority': 0, 'cooldown': 0.06},
+}
+
 # --- Controls ---
 # Determines the player's control scheme. False = Keyboard (WASD), True = Mouse.
-mouse = False
\ No newline at end of file
+mouse = False
+
+# --- Input Latency Settings ---
+# Low-latency mode. True = the ship is drawn where the mouse pointer is right before each frame
+# is drawn (mouse controls), or at its newest simulated position (keyboard), instead of between
+# the last two simulation steps. Only the picture changes: hits still use the simulated position.
+lowLatency = False
+# How the game waits for the next frame: 'sleep' (least CPU), 'busy' (spins for the last part of
+# the wait: steadier frames, but keeps one CPU core busy) or 'uncapped' (doesn't wait: as many
+# frames as possible, the least input delay). An unfocused window always sleeps.
+framePacing = 'sleep'
+# When True, the time from reading each click, key press and mouse movement to presenting the
+# frame that shows it is recorded (see latency.py), and its percentiles are printed when the
+# game exits. The F3 overlay shows them too (showing it also starts recording).
+latencyStats = False
+latencySamples = 1000  # The number of most recent latencies kept for each kind of input.
+
+# --- Netplay Settings ---
+# Two-player co-op over UDP with input delay and rollback (see netplay.py).
+netplayPort = 7777  # The UDP port the host listens on.
+# Simulation steps between reading a player's input and applying it. Hides this much of the
+# network delay; the rest is predicted and corrected by rolling back (3 steps = 25 ms at 120).
+netplayInputDelay = 3
+netplayMaxRollback = 20  # The most steps re-simulated after a misprediction; beyond this, the game waits.
+netplayTimeout = 5.0  # Seconds without hearing from the other player before the session ends.
+coopSpacing = 300  # The horizontal distance between the co-op ships' start positions.
+coopTints = ((120, 200, 255), (255, 170, 120), (170, 255, 150))  # The colors of the extra ships.
+
+# --- Leaderboard Settings ---
+leaderboardSize = 10  # The number of best runs kept.
+leaderboardShown = 5  # The number of best runs listed on the game over screen.
+# The folder for per-user data such as the leaderboard. None = the operating system's usual
+# place (e.g., %APPDATA%/MeteorDodger on Windows, ~/.local/share/MeteorDodger on Linux).
+dataDir = None
+
+# --- Replay Settings ---
+# When set to a file path (e.g., 'replays/last.mdr'), every session's input is recorded
+# there so it can be re-simulated with 'python headless.py --replay <file>'. None = off.
+replayPath = None
+
+# --- Rewind & Quick Save Settings ---
+# Holding Backspace rewinds the game by up to this many seconds (see worldState.py). 0 = off.
+rewindSeconds = 5.0
+# F5 saves the game to this file and F8 loads it. None = 'quicksave.mds' in the data folder.
+quickSavePath = None
+
+# --- Capture Settings ---
+# When True, gameplay can be captured: F10 starts or stops recording and F9 saves the last
+# instantReplaySeconds as a PNG sequence (see capture.py). Costs one frame copy per capture.
+capture = False
+captureFps = 30  # The most frames captured per second.
+captureFormat = 'png'  # How recordings are written: 'png' (a PNG sequence) or 'raw' (raw video).
+captureSlots = 8  # The captured frames that can wait for the encoder before new ones are dropped.
+instantReplaySeconds = 30  # The length of the always-on instant-replay buffer. 0 = no buffer.
+# The folder captures are written to. None = 'captures' in the data folder (see dataDir).
+captureDir = None
+
+# --- Environment API Settings ---
+# Defaults for the reset()/step() environment used by bots and training (see environment.py).
+envFrameSkip = 4  # The simulation steps each action is repeated for.
+envFrameSize = (96, 54)  # The (width, height) of downsampled frame observations.
+envMaxEntities = 32  # The nearest falling objects included in an entity observation.
+envMaxSeconds = 300.0  # Episodes are cut off after this many game seconds. None = never.
+
+# --- Profiler Settings ---
+# When True, per-phase frame timings are recorded from the start. Press F3 in game to
+# show or hide the timing overlay (showing it also starts recording).
+profiler = False
+profilerFrames = 600  # The number of most recent frames kept for the overlay and CSV export.
+profilerOverlaySize = (320, 350)  # The width and height of the overlay panel in pixels.
+# When set to a file path (e.g., 'profiles/frames.csv'), the recorded frames are written
+# there when the game exits. None = no export.
+profilerCsvPath = None
+
+# --- Configuration File Settings ---
+# A TOML or JSON file in the project folder whose values override the ones in this file,
+# optionally with named profiles (see gameConfig.py). A missing file is simply skipped.
+# None = only use this file.
+configFile = 'settings.toml'
+configReload = True  # Whether changes to the settings file are applied while the game runs.
+# How often in seconds the settings file is checked for changes. 0 = every frame, so a saved
+# change applies by the next frame (a check is one os.stat() call).
+configPollInterval = 0.0
@@ -0,0 +1,163 @@
+# =====================================================================
+# METEOR DODGER - HEADLESS SIMULATION
+# =====================================================================
+# Runs seeded game sessions without a window, without audio and without
+# waiting for the frame clock, so balance-tuning runs can be batched on a
+# machine with no display. Every session advances the game in fixed steps
+# of 1 / simulationRate seconds, as fast as the CPU allows, and reports how many
+# simulated seconds were run per wall-clock second.
+#
+# Usage (from the 'code' directory):
+#     python headless.py --seed 42 --duration 120
+#     python headless.py --seed 1 --duration 60 --sessions 1000
+#     python headless.py --replay replays/last.mdr
+
+# --- Standard Library Imports ---
+import argparse  # Used to read the seed, duration and session count from the command line.
+import os  # Used to select SDL's dummy video and audio drivers.
+import time  # Used to measure wall-clock time.
+
+# SDL reads these when pygame is initialized, so they must be set before the game starts.
+os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+os.environ.setdefault('SDL_AUDIODRIVER', 'dummy')
+# Keeps pygame's import banner out of batch logs.
+os.environ.setdefault('PYGAME_HIDE_SUPPORT_PROMPT', '1')
+
+# --- Third-Party Imports ---
+import pygame  # Used for the display and event systems the game relies on.
+
+# --- Local Application Imports ---
+import gameSettings as gS
+import replay as rP
+from main import Shooter
+
+
+def runSession(game, seed, duration, dt=None):
+    """
+    Simulates one seeded session until the player dies or the duration runs out.
+
+    Args:
+        game (Shooter): A headless game instance. It is reset before the session starts.
+        seed (int): The seed for the game's random numbers.
+        duration (float): The longest session to simulate, in game seconds.
+        dt (float): The simulated time per step. Defaults to 1 / gS.simulationRate.
+
+    Returns:
+        dict: The session's results and speed.
+    """
+    if dt is None:
+        dt = 1 / gS.simulationRate
+
+    # 1. Start from a clean game with seeded random number streams.
+    game.reset(seed)
+
+    # 2. Simulate as fast as possible: no drawing and no clock.tick() sleeping.
+    steps = 0
+    start = time.perf_counter()
+    while game.gameTime < duration and not game.gameOver:
+        game.step(dt)
+        steps += 1
+    wallTime = time.perf_counter() - start
+
+    return {
+        'seed': seed,
+        'simulatedSeconds': game.gameTime,
+        'wallSeconds': wallTime,
+        'speed': game.gameTime / wallTime if wallTime else float('inf'),
+        'steps': steps,
+        'died': game.gameOver,
+        'score': int(game.gameTime),
+        'health': game.player.health,
+        'ammo': game.ammo,
+        'meteorSpawnRate': game.meteorSpawnRate,
+    }
+
+
+def playReplay(game, recording):
+    """
+    Re-simulates a recorded session step by step, as fast as possible.
+
+    Args:
+        game (Shooter): A headless game instance.
+        recording (replay.Replay): The loaded replay.
+
+    Returns:
+        dict: The replayed session's results and speed.
+    """
+    # 1. Match the recorded session's settings and seed.
+    gS.simulationRate = recording.simulationRate
+    gS.mouse = recording.mouse
+    game.reset(recording.seed)
+    dt = 1 / recording.simulationRate
+
+    # 2. Feed the recorded input to the game instead of reading live input.
+    inputs = recording.inputs()
+    nextInput = None
+
+    def replayInput():
+        return nextInput
+
+    game.inputSource = replayInput
+
+    steps = 0
+    start = time.perf_counter()
+    for nextInput in inputs:
+        game.step(dt)
+        steps += 1
+        if game.gameOver:
+            break
+    wallTime = time.perf_counter() - start
+    game.inputSource = game.readInput
+
+    return {
+        'seed': recording.seed,
+        'simulatedSeconds': game.gameTime,
+        'wallSeconds': wallTime,
+        'speed': game.gameTime / wallTime if wallTime else float('inf'),
+        'steps': steps,
+        'died': game.gameOver,
+        'score': int(game.gameTime),
+        'health': game.player.health,
+        'ammo': game.ammo,
+    }
+
+
+def main(argv=None):
+    """Command-line entry point: runs the requested sessions and prints their results."""
+    parser = argparse.ArgumentParser(description="Run seeded Meteor Dodger sessions without a display.")
+    parser.add_argument('--seed', type=int, default=0, help="Seed of the first session.")
+    parser.add_argument('--duration', type=float, default=60.0, help="Longest session length in game seconds.")
+    parser.add_argument('--sessions', type=int, default=1,
+                        help="Number of sessions to run, with consecutive seeds.")
+    parser.add_argument('--replay', metavar='FILE',
+                        help="Re-simulate a recorded replay instead of running seeded sessions.")
+    args = parser.parse_args(argv)
+
+    game = Shooter(headless=True)
+
+    if args.replay:
+        result = playReplay(game, rP.Replay.load(args.replay))
+        print(f"replay seed={result['seed']} steps={result['steps']} score={result['score']} "
+              f"died={result['died']} health={result['health']} ammo={result['ammo']} "
+              f"speed={result['speed']:.1f}x")
+        pygame.quit()
+        return
+
+    totalSimulated = 0.0
+    totalWall = 0.0
+    for index in range(args.sessions):
+        result = runSession(game, args.seed + index, args.duration)
+        totalSimulated += result['simulatedSeconds']
+        totalWall += result['wallSeconds']
+        print(f"seed={result['seed']} score={result['score']} died={result['died']} "
+              f"simulated={result['simulatedSeconds']:.1f}s speed={result['speed']:.1f}x")
+
+    # Report the overall simulated-seconds-per-wall-second rate.
+    speed = totalSimulated / totalWall if totalWall else float('inf')
+    print(f"sessions={args.sessions} simulated={totalSimulated:.1f}s wall={totalWall:.2f}s speed={speed:.1f}x")
+
+    pygame.quit()
+
+
+if __name__ == "__main__":
+    main()
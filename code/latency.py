@@ -0,0 +1,198 @@
+# =====================================================================
+# METEOR DODGER - INPUT LATENCY
+# =====================================================================
+# Measures how long it takes for the player's input to reach the screen:
+# the time from when the game reads an input (a click, a movement key
+# being pressed, or the mouse pointer having moved) to when the first
+# frame that shows it has been presented. The percentiles are shown in
+# the F3 overlay and printed when the game exits.
+#
+# pygame events carry no timestamp, so an input is stamped when the event
+# queue is read. It may have waited in the queue since the previous read,
+# so the gap between reads (the "queue gap" line) is how much longer the real
+# latency can be. In netplay, the input delay comes on top.
+#
+# Also picks how the frame loop waits for the next frame ('framePacing'
+# in gameSettings.py). When the monitor is disabled every call returns
+# after a single attribute check.
+
+# --- Standard Library Imports ---
+from array import array  # Used for the compact, preallocated ring buffer columns.
+from time import perf_counter  # Used for high-resolution timestamps.
+
+# --- Local Application Imports ---
+import gameSettings as gS
+from profiler import percentile  # Used for the nearest-rank percentiles.
+
+# The kinds of input that are timed, and the gap between reads of the event queue.
+kinds = ('click', 'key', 'pointer')
+columnNames = kinds + ('queue',)
+# The percentiles reported for each kind.
+fractions = (('p50', 0.50), ('p95', 0.95), ('p99', 0.99))
+
+
+def waitForFrame(clock, fps, pacing=None):
+    """
+    Waits until the next frame is due and returns the time since the previous one.
+
+    Args:
+        clock (pygame.time.Clock): The game clock.
+        fps (int): The target frame rate.
+        pacing (str): 'sleep' sleeps until the frame is due (least CPU), 'busy' spins
+            for the last part of the wait (steadier frame times, one busy CPU core) and
+            'uncapped' doesn't wait at all (the most frames, the least input delay).
+            Defaults to the 'framePacing' setting.
+
+    Returns:
+        int: The milliseconds since the previous call, as pygame.time.Clock.tick() returns.
+    """
+    pacing = gS.framePacing if pacing is None else pacing
+    if pacing == 'busy':
+        return clock.tick_busy_loop(fps)
+    if pacing == 'uncapped':
+        return clock.tick()
+    return clock.tick(fps)
+
+
+class LatencyMonitor:
+    """
+    Records input-to-present latencies in a ring buffer, one column per kind of input.
+
+    The game calls polled() whenever it reads the event queue, seen(kind) for each
+    input event it finds, pointer(position) for each mouse position it uses and
+    presented() right after a frame reached the screen. Every input seen since the
+    last presented frame is shown by the next one, so that is when its latency is
+    known. Only the newest pointer position is drawn, so only that one is timed.
+    """
+
+    def __init__(self, capacity=gS.latencySamples, enabled=False):
+        """
+        Initializes the monitor.
+
+        Args:
+            capacity (int): The number of latencies kept for each kind of input.
+            enabled (bool): Whether latencies are recorded from the start.
+        """
+        self.capacity = capacity
+        self.enabled = enabled
+
+        # 1. The ring buffer: one preallocated column of milliseconds per kind.
+        self.columns = {name: array('d', bytes(8 * capacity)) for name in columnNames}
+        self.next = dict.fromkeys(columnNames, 0)    # The slot each column writes next.
+        self.count = dict.fromkeys(columnNames, 0)   # The number of valid slots of each column.
+
+        # 2. Inputs waiting for the frame that shows them.
+        self.pending = []             # (kind, time) of each input event seen.
+        self.pointerTime = None       # When the newest moved pointer position was read.
+        self.lastPointer = None       # The last pointer position read.
+        self.pollTime = None          # When the event queue was last read.
+
+    def setEnabled(self, enabled):
+        """Turns recording on or off. Turning it off forgets the inputs waiting for a frame."""
+        self.enabled = enabled
+        if not enabled:
+            self.discard()
+
+    def discard(self):
+        """
+        Forgets the inputs waiting for a frame, e.g. when the game leaves the play scene
+        before showing them. Otherwise the time spent on another screen would be counted.
+        """
+        self.pending.clear()
+        self.pointerTime = None
+        self.pollTime = None
+
+    def _store(self, name, milliseconds):
+        """Writes one latency into its column."""
+        slot = self.next[name]
+        self.columns[name][slot] = milliseconds
+        self.next[name] = (slot + 1) % self.capacity
+        self.count[name] = min(self.count[name] + 1, self.capacity)
+
+    def polled(self):
+        """Notes that the event queue is being read. Call it before seen()."""
+        if not self.enabled:
+            return
+        now = perf_counter()
+        if self.pollTime is not None:
+            self._store('queue', (now - self.pollTime) * 1000)
+        self.pollTime = now
+
+    def seen(self, kind):
+        """
+        Notes an input event found in the event queue.
+
+        Args:
+            kind (str): 'click' or 'key'.
+        """
+        if not self.enabled:
+            return
+        self.pending.append((kind, perf_counter() if self.pollTime is None else self.pollTime))
+
+    def pointer(self, position):
+        """
+        Notes a mouse position read for the game. It is only timed if the pointer moved.
+
+        Args:
+            position (tuple): The pointer position.
+        """
+        if not self.enabled:
+            return
+        if position != self.lastPointer:
+            self.lastPointer = position
+            self.pointerTime = perf_counter()
+
+    def presented(self, pointerAge=0.0):
+        """
+        Notes that a frame reached the screen: everything seen since the last one is in it.
+
+        Args:
+            pointerAge (float): How much older than its newest reading (in seconds) the
+                pointer is shown, e.g. 0.25 steps when the ship is drawn at alpha 0.75.
+        """
+        if not self.enabled:
+            return
+        now = perf_counter()
+        for kind, time in self.pending:
+            self._store(kind, (now - time) * 1000)
+        self.pending.clear()
+        if self.pointerTime is not None:
+            self._store('pointer', (now - self.pointerTime + pointerAge) * 1000)
+            self.pointerTime = None
+
+    def history(self, name):
+        """Returns the recorded latencies of one column, oldest first."""
+        column = self.columns[name]
+        if self.count[name] < self.capacity:
+            return column[:self.count[name]].tolist()
+        slot = self.next[name]
+        return column[slot:].tolist() + column[:slot].tolist()
+
+    def stats(self):
+        """
+        Returns the latency percentiles of each kind of input and of the queue gap.
+
+        Returns:
+            dict: For each name in 'columnNames', its p50, p95, p99 and max in milliseconds
+                and the number of samples ('count').
+        """
+        result = {}
+        for name in columnNames:
+            values = self.history(name)
+            result[name] = {label: percentile(values, fraction) for label, fraction in fractions}
+            result[name]['max'] = max(values, default=0.0)
+            result[name]['count'] = len(values)
+        return result
+
+    def report(self):
+        """Returns the statistics as lines of text, for the overlay and the exit summary."""
+        stats = self.stats()
+        lines = ["to flip ms   p50    p95    p99    max"]
+        for name in columnNames:
+            values = stats[name]
+            if not values['count']:
+                continue
+            label = 'queue gap' if name == 'queue' else name
+            columns = ''.join(f"{values[key]:7.2f}" for key in ('p50', 'p95', 'p99', 'max'))
+            lines.append(f"{label:<10}{columns}")
+        return lines
@@ -0,0 +1,212 @@
+# =====================================================================
+# METEOR DODGER - LEADERBOARD
+# =====================================================================
+# Keeps the best runs (score plus the seed, duration and difficulty level
+# they reached) in a small SQLite database in the player's data folder.
+# SQLite commits are atomic, so a crash or power cut mid-write can never
+# leave a half-written file behind.
+#
+# All database work happens on a background thread. The game only puts
+# new runs on a queue and reads an in-memory copy of the top runs, so the
+# game over screen never waits for the disk.
+
+# --- Standard Library Imports ---
+import os  # Used to find and create the per-user data folder.
+import queue  # Used to hand work to the background thread.
+import sqlite3  # Used for the crash-safe leaderboard database.
+import sys  # Used to pick the data folder convention of the operating system.
+import threading  # Used for the background thread and to guard the cached top runs.
+import time  # Used to timestamp runs.
+from os import path  # Used for creating operating-system-independent file paths.
+
+# --- Local Application Imports ---
+import gameSettings as gS
+
+# The name of the game's folder inside the per-user data directory.
+appName = 'MeteorDodger'
+
+# The project's root folder (the one above 'code'), where the old high score file was kept.
+projectRoot = path.dirname(path.dirname(path.abspath(__file__)))
+legacyPath = path.join(projectRoot, 'highscore.txt')
+
+# The columns of a stored run, in table order.
+columns = ('score', 'duration', 'seed', 'difficulty', 'playedAt')
+
+
+def userDataDir():
+    """
+    Returns the folder the game keeps per-user data in, following each operating system's convention.
+
+    The 'dataDir' setting overrides it.
+    """
+    if gS.dataDir:
+        return gS.dataDir
+    if sys.platform == 'win32':
+        base = os.environ.get('APPDATA') or path.expanduser('~')
+    elif sys.platform == 'darwin':
+        base = path.expanduser('~/Library/Application Support')
+    else:
+        base = os.environ.get('XDG_DATA_HOME') or path.expanduser('~/.local/share')
+    return path.join(base, appName)
+
+
+class Leaderboard:
+    """
+    The top runs, stored in SQLite by a background thread.
+
+    submit() and top() never touch the disk: submit() queues a run for the
+    background thread, and top() returns the copy of the best runs that the
+    thread refreshes after every change.
+    """
+
+    def __init__(self, filePath=None, size=gS.leaderboardSize, legacyFile=legacyPath, onChange=None):
+        """
+        Opens (or creates) the leaderboard and starts its background thread.
+
+        Args:
+            filePath (str): The database file. Defaults to 'leaderboard.db' in the user data folder.
+            size (int): The number of runs kept.
+            legacyFile (str): An old single-number high score file to import into an empty leaderboard.
+                Defaults to 'highscore.txt' in the project folder, wherever the game is started from.
+            onChange (callable): Called with no arguments, on the background thread, whenever
+                the stored runs have changed. It must be safe to call from another thread.
+        """
+        self.filePath = filePath or path.join(userDataDir(), 'leaderboard.db')
+        self.size = size
+        self.legacyFile = legacyFile
+        self.onChange = onChange
+
+        # The best runs as dictionaries, best first, and the lock that guards them.
+        self.lock = threading.Lock()
+        self.runs = []
+        # Set once the stored runs have been loaded.
+        self.ready = threading.Event()
+
+        # Work for the background thread. None tells it to stop.
+        self.jobs = queue.Queue()
+        self.worker = threading.Thread(target=self._work, name='leaderboard', daemon=True)
+        self.worker.start()
+
+    # --- Game-thread API ---
+
+    def submit(self, score, duration=0.0, seed=None, difficulty=0):
+        """
+        Queues a finished run to be stored. Returns immediately.
+
+        Args:
+            score (int): The run's score.
+            duration (float): The run's length in game seconds.
+            seed (int): The run's random seed, so it can be replayed.
+            difficulty (int): The number of difficulty increases the run reached.
+        """
+        self.jobs.put({
+            'score': int(score),
+            'duration': float(duration),
+            'seed': seed,
+            'difficulty': int(difficulty),
+            'playedAt': time.strftime('%Y-%m-%d %H:%M:%S'),
+        })
+
+    def top(self):
+        """Returns a copy of the best runs, best first."""
+        with self.lock:
+            return list(self.runs)
+
+    @property
+    def highScore(self):
+        """The best stored score, or 0 if there is none yet."""
+        with self.lock:
+            return self.runs[0]['score'] if self.runs else 0
+
+    def close(self, timeout=2.0):
+        """
+        Finishes the queued writes and stops the background thread.
+
+        Args:
+            timeout (float): The longest time in seconds to wait for pending writes.
+        """
+        if self.worker.is_alive():
+            self.jobs.put(None)
+            self.worker.join(timeout)
+
+    # --- Background thread ---
+
+    def _work(self):
+        """The background thread: owns the database connection and applies queued runs."""
+        try:
+            connection = self._connect()
+        except (OSError, sqlite3.Error) as error:
+            print(f"Warning: The leaderboard is unavailable ({error}).")
+            self.ready.set()
+            # Keep draining the queue so submit() never blocks or grows without bound.
+            while self.jobs.get() is not None:
+                pass
+            return
+
+        self._refresh(connection)
+        self.ready.set()
+        while True:
+            run = self.jobs.get()
+            if run is None:
+                break
+            try:
+                self._store(connection, run)
+                self._refresh(connection)
+            except sqlite3.Error as error:
+                print(f"Warning: A run could not be saved to the leaderboard ({error}).")
+                continue
+            if self.onChange is not None:
+                self.onChange()
+        connection.close()
+
+    def _connect(self):
+        """Opens the database, creating the folder, the table and importing the legacy file if needed."""
+        folder = path.dirname(self.filePath)
+        if folder:
+            os.makedirs(folder, exist_ok=True)
+        connection = sqlite3.connect(self.filePath)
+        # Write-ahead logging keeps each commit atomic and cheap.
+        connection.execute('PRAGMA journal_mode=WAL')
+        connection.execute('PRAGMA synchronous=NORMAL')
+        with connection:
+            connection.execute(
+                'CREATE TABLE IF NOT EXISTS runs ('
+                'id INTEGER PRIMARY KEY, score INTEGER NOT NULL, duration REAL, '
+                'seed INTEGER, difficulty INTEGER, playedAt TEXT)'
+            )
+        self._importLegacy(connection)
+        return connection
+
+    def _importLegacy(self, connection):
+        """Brings an old highscore.txt score into an empty leaderboard, once."""
+        if not self.legacyFile or connection.execute('SELECT COUNT(*) FROM runs').fetchone()[0]:
+            return
+        try:
+            with open(self.legacyFile) as f:
+                score = int(f.read())
+        except (OSError, ValueError):
+            return
+        self._store(connection, {'score': score, 'duration': float(score), 'seed': None,
+                                 'difficulty': 0, 'playedAt': None})
+
+    def _store(self, connection, run):
+        """Inserts a run and drops everything below the top 'size' runs, in one transaction."""
+        with connection:
+            connection.execute(
+                f'INSERT INTO runs ({", ".join(columns)}) VALUES ({", ".join("?" * len(columns))})',
+                [run[name] for name in columns],
+            )
+            connection.execute(
+                'DELETE FROM runs WHERE id NOT IN '
+                '(SELECT id FROM runs ORDER BY score DESC, id ASC LIMIT ?)',
+                (self.size,),
+            )
+
+    def _refresh(self, connection):
+        """Reloads the cached copy of the top runs from the database."""
+        rows = connection.execute(
+            f'SELECT {", ".join(columns)} FROM runs ORDER BY score DESC, id ASC LIMIT ?', (self.size,)
+        ).fetchall()
+        runs = [dict(zip(columns, row)) for row in rows]
+        with self.lock:
+            self.runs = runs
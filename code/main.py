@@ -1,5 +1,7 @@
 # --- Standard Library Imports ---
 import random  # Used for generating random numbers for things like spawn positions.
+from functools import partial  # Used to bind spawn types to their spawn callbacks.
+from itertools import chain  # Used to update live and pooled sprites together.
 from os import path  # Used for creating operating-system-independent file paths to load assets.
 
 # --- Third-Party Imports ---
@@ -8,79 +10,113 @@ import pygame  # The core library used to create the game window, handle graphic
 # --- Local Application Imports ---
 # Imports all game-wide constants and settings from the local gameSettings.py file.
 import gameSettings as gS
+# Imports the settings file loader that validates, applies and hot-reloads settings.
+import gameConfig as gC
+# Imports the asset registry that preloads and shares every image.
+import gameAssets as gA
+# Imports the packed image archive, to locate it from the current settings.
+import assetPack as aP
+# Imports the broadphase collision engine and its shared mask cache.
+import collisionEngine as cE
+# Imports the object pools that recycle meteors, lasers and pickups.
+import objectPool as oP
+# Imports the full-screen and dirty-rectangle renderers.
+import renderer as rdr
+# Imports the compositor that caches the starfield, fill color and sidebars.
+import background as bg
+# Imports the text render cache and the HUD text widget.
+import textCache as tC
+# Imports the NumPy struct-of-arrays backend for falling objects.
+import entityStore as eS
+# Imports the priority-queue scheduler that decides when objects spawn.
+import spawnScheduler as sS
+# Imports per-step input records and the binary replay recorder.
+import replay as rP
+# Imports the per-phase frame profiler and its overlay.
+import profiler as pf
+# Imports the input-to-screen latency monitor and the frame pacing strategies.
+import latency as lt
+# Imports the sound manager with streamed music and a pooled set of effect channels.
+import soundEngine as sE
+# Imports shared animation frame strips and the pooled explosion sprite.
+import animation as an
+# Imports the SQLite leaderboard that is written on a background thread.
+import leaderboard as lB
+# Imports the scene manager and the play, pause and game over scenes.
+import scenes as sc
+# Imports the window and the internal render resolution it shows.
+import renderTarget as rT
+# Imports the gameplay capture ring and its background encoder.
+import capture as cp
+# Imports world state snapshots, the rewind history and quick save files.
+import worldState as wS
 
-def loadingAssets(fileName):
-    """
-    A helper function to load an image from the 'images' directory.
-
-    This centralizes the asset loading process and ensures file paths
-    are constructed in an operating-system-independent way.
-
-    Args:
-        fileName (str): The name of the image file to load (e.g., 'player.png').
-
-    Returns:
-        pygame.Surface: The loaded and optimized image surface.
-    """
-    # 1. Construct the full file path to the image.
-    # This creates a path like '../images/your_image.png' relative to 'main.py'.
-    imagePath = path.join(path.dirname('main.py'), '..', 'images', fileName)
-
-    # 2. Load the image and optimize it for the game.
-    # .convert_alpha() creates a copy of the Surface with a pixel format
-    # that's optimized for fast drawing (biting) and preserves transparency.
-    return pygame.image.load(imagePath).convert_alpha()
-
-
-def randGenForProb(n):
-    """
-    Takes a number 'n' and returns a new, slightly randomized version of it.
-
-    This function applies a random variance to the input number based on
-    the 'randomProbability' value from the game settings. For example, it
-    can turn a fixed spawn time into a slightly unpredictable one.
-
-    Args:
-        n (float): The base number to randomize (e.g., a spawn rate).
-
-    Returns:
-        float: The new, randomized number.
-    """
-    # 1. Scale the number up to work with integers for more precise calculations.
-    n *= 1000
-
-    # 2. Calculate the lower and upper bounds for the random range.
-    # This creates a range around 'n' based on the percentage from game settings.
-    randSmall = n - gS.randomProbability / 100 * n
-    randLarge = n + gS.randomProbability / 100 * n
-
-    # 3. Pick a random integer within the calculated bounds.
-    randomValue = random.randint(int(randSmall), int(randLarge))
+class Shooter:
+    def __init__(self, headless=False, players=1):
+        """
+        Sets up the game window, assets, sprites and game state.
 
-    # 4. Scale the result back down to its original magnitude and return it.
-    return randomValue / 1000
+        Args:
+            headless (bool): When True, the game is only simulated (see headless.py):
+                audio is disabled and nothing is expected to be drawn.
+            players (int): The number of ships. More than one is co-op (see netplay.py).
+        """
+        # 0. Settings
+        # Apply the settings file (and its profile) over gameSettings.py before anything reads
+        # them. Headless runs (simulations, benchmarks) keep the defaults so they stay reproducible.
+        self.config = None
+        if not headless and gS.configFile:
+            self.config = gC.GameConfig(path.join(gC.projectRoot, gS.configFile))
+            try:
+                self.config.load()
+            except (gC.ConfigError, OSError) as error:
+                # Nothing was applied, so the game starts with the defaults. Fixing the file
+                # applies it while the game runs.
+                print(f"Warning: The settings file was not applied, using the defaults ({error}).")
 
-class Shooter:
-    def __init__(self):
         # 1. Core Engine Setup
         # Initializes Pygame's modules and sets up the main game clock and loop control.
         pygame.init()
         self.running = True
+        self.headless = headless
         self.clock = pygame.time.Clock()
 
         # 2. Display Setup
-        # Creates the main game window where everything will be drawn.
+        # Creates the main game window and the surface everything is drawn on, at the
+        # internal render resolution. Game logic stays in screenSize coordinates.
         self.screenColor = gS.screenColor
-        self.displaySurface = pygame.display.set_mode(gS.screenSize)
-
-        # 3. Game Object Instantiation
-        # Loads assets and creates instances of the main game objects.
-        self.stars = Stars(loadingAssets('star.png'))
-        self.player = Player(loadingAssets('player.png'))
-        self.ui = UI(loadingAssets('sideBars.png'))
-        self.sfx = Sound()
-
-        # 4. Sprite Group Setup
+        self.target = rT.RenderTarget(gS.renderSize, gS.windowSize, gS.renderFilter)
+        self.displaySurface = self.target.surface
+
+        # 3. Asset Loading
+        # Decodes every image once, up front, so nothing is read from disk during play.
+        self.assets = gA.AssetRegistry(packPath=aP.packPath(gS.assetPackFile)).preload()
+
+        # 4. Game Object Instantiation
+        # Creates instances of the main game objects from the shared assets.
+        self.stars = Stars(self.assets.get('star.png'))
+        self.player = Player(self.assets.get('player.png'))
+        if gS.playerFrames:
+            self.player.animate(an.loadStrip(self.assets, tuple(gS.playerFrames), self.player.image.get_size(),
+                                             withMasks=True))
+        # Every ship, in player order. The first is self.player; co-op ships are tinted.
+        self.players = [self.player]
+        for index in range(1, players):
+            self.players.append(self.player.tinted(gS.coopTints[(index - 1) % len(gS.coopTints)]))
+        # The ship whose health the HUD shows (the local one in netplay).
+        self.localPlayer = self.player
+        self.ui = UI(self.assets.get('sideBars.png'), self.target)
+        self.sfx = sE.Sound(enabled=not headless)
+        # The best runs, stored on a background thread. Headless runs don't keep scores.
+        self.leaderboard = None if headless else lB.Leaderboard(size=gS.leaderboardSize,
+                                                                  onChange=self.leaderboardChanged)
+
+        # The pre-rendered background layer (fill color, starfield and sidebars).
+        self.background = bg.BackgroundCompositor(self.stars, self.ui.image, self.target)
+        # The renderer draws each frame and pushes it to the display (full flip or dirty rects).
+        self.renderer = rdr.createRenderer(self)
+
+        # 5. Sprite Group Setup
         # Creates containers to hold and manage different types of game objects (sprites).
         self.allSprites = pygame.sprite.Group()  # Master group for drawing and updating all sprites.
         self.lasers = pygame.sprite.Group()      # For the player's lasers.
@@ -88,22 +124,57 @@ class Shooter:
         self.ammoG = pygame.sprite.Group()       # For ammo power-ups.
         self.healthG = pygame.sprite.Group()     # For health power-ups.
         self.lifeG = pygame.sprite.Group()       # For life power-ups.
+        self.explosions = pygame.sprite.Group()  # For explosion animations.
+        self.noLasers = pygame.sprite.Group()    # Always empty; for ship-only collision checks.
+
+        # The collision engine answers every player and laser query in one pass per frame.
+        self.collisions = cE.CollisionEngine()
+        # Maps each kind of falling object to the group that holds it.
+        self.droppings = {
+            'meteor': self.meteors,
+            'ammo': self.ammoG,
+            'health': self.healthG,
+            'life': self.lifeG,
+        }
 
         # Add initial, non-moving objects to the master sprite group
         self.allSprites.add(self.stars)
-        self.allSprites.add(self.player)
+        self.allSprites.add(*self.players)
+
+        # The explosion frames, decoded and scaled once and shared by every explosion.
+        self.explosionStrip = an.loadStrip(self.assets, 'explosion', gS.explosionSize)
+
+        # Free lists of reusable sprites, so spawning doesn't construct new objects.
+        self.pools = {
+            'meteor': oP.ObjectPool(lambda: Meteor(self.assets.get('meteor.png'), 0, 0), gS.meteorPoolSize),
+            'laser': oP.ObjectPool(lambda: Laser(self.assets.get('laser.png'), 0, 0), gS.laserPoolSize),
+            'ammo': oP.ObjectPool(lambda: Ammo(self.assets.get('ammo.png'), 0, 0), gS.pickupPoolSize),
+            'health': oP.ObjectPool(lambda: Health(self.assets.get('health.png'), 0, 0), gS.pickupPoolSize),
+            'life': oP.ObjectPool(lambda: Life(self.assets.get('life.png'), 0, 0), gS.pickupPoolSize),
+            'explosion': oP.ObjectPool(
+                lambda: an.Explosion(self.explosionStrip, gS.explosionFrameRate), gS.explosionPoolSize),
+        }
 
-        # 5. Game State & Timers
+        # The NumPy entity store replaces the dropping sprites when the 'numpy' backend is selected.
+        self.entities = None
+        if gS.entityBackend == 'numpy':
+            self.entities = eS.DroppingStore(
+                images={kind: self.assets.get(f'{kind}.png') for kind in ('meteor', 'ammo', 'health', 'life')},
+                speeds=self.dropSpeeds(),
+                capacity=gS.entityCapacity,
+            )
+        # Fractional meteors owed by storm mode, carried over between steps.
+        self.stormCarry = 0.0
+
+        # 6. Game State & Timers
         # Variables that track the player's status and control game events over time.
+        self.gameOver = False
         self.gameTime = 0
         self.ammo = gS.ammo
-        self.meteorTimer = 0
-        self.ammoTimer = 0
-        self.healthTimer = 0
-        self.lifeTimer = 0
         self.difficultyTime = gS.difficultyTime
+        self.difficultyLevel = 0  # The number of difficulty increases so far.
 
-        # 6. Gameplay & Difficulty Parameters
+        # 7. Gameplay & Difficulty Parameters
         #  Configure the spawn rates of various objects, which can be modified during play.
         self.meteorSpawnRate = gS.meteorSpawnRate
         self.ammoSpawnRate = gS.ammoSpawnRate
@@ -111,144 +182,176 @@ class Shooter:
         self.healthSpawnRate = gS.healthSpawnRate
         self.lifeSpawnRate = gS.lifeSpawnRate
 
+        # 8. Random Number Streams
+        # All gameplay randomness comes from these private, seeded generators (spawn
+        # positions and spawn timing), so a session can be replayed from its seed.
+        self.seed = None
+        # They only copy their state for a snapshot after being drawn from (see worldState.py).
+        self.rng = wS.RandomStream()
+        self.spawner = sS.SpawnScheduler(wS.RandomStream())
+        self.seedStreams(random.randrange(2 ** 32))
+
+        # 9. Input & Replays
+        # Where each step's input comes from (live input, or a replay being played back),
+        # and the recorder that logs it when replay recording is enabled.
+        self.inputSource = self.readInput
+        self.recorder = None
+        # Window state read from events: a pause request (Esc, P or losing focus) and focus.
+        self.pauseRequested = False
+        self.focused = True
+        # The rollback session that runs the steps in a netplay game (see netplay.py).
+        self.netplay = None
+
+        # 10. Profiling
+        # Times each input from being read to being on screen; its percentiles go in the overlay.
+        self.latency = lt.LatencyMonitor(capacity=gS.latencySamples, enabled=gS.latencyStats)
+        # Times each phase of a frame; near free while disabled. F3 toggles its overlay.
+        self.profiler = pf.FrameProfiler(self.entityCounts, capacity=gS.profilerFrames,
+                                         enabled=gS.profiler or bool(gS.profilerCsvPath),
+                                         details=self.overlayDetails)
+        # Where low-latency mode draws the local ship this frame, as (ship, top-left position).
+        # (None, None) = draw it between its last two steps like every other sprite.
+        self.latched = (None, None)
+
+        # 11. Spawn Scheduling
+        # Each spawn type's rate curve reads the current (difficulty-adjusted) spawn rate.
+        self.spawner.register('meteor', lambda time: self.meteorSpawnRate, partial(self.spawnObjects, 'meteor'))
+        self.spawner.register('ammo', lambda time: self.ammoSpawnRate, partial(self.spawnObjects, 'ammo'))
+        self.spawner.register('health', lambda time: self.healthSpawnRate, partial(self.spawnObjects, 'health'))
+        self.spawner.register('life', lambda time: self.lifeSpawnRate, partial(self.spawnObjects, 'life'))
+
+        # 12. Scenes
+        # Playing, paused and game over. Only playing runs a frame loop; the others wait for input.
+        self.scenes = sc.SceneManager({
+            'play': sc.PlayScene(self),
+            'pause': sc.PauseScene(self),
+            'gameOver': sc.GameOverScene(self),
+        })
+
+        # 13. Capture
+        # Copies captured frames to an encoder process that records them (F10) and keeps the
+        # last few seconds for an instant replay (F9). Headless runs have nothing to capture.
+        self.capture = None
+        if gS.capture and not headless:
+            try:
+                self.capture = cp.FrameCapture(self.displaySurface, fps=gS.captureFps, slots=gS.captureSlots,
+                                               replaySeconds=gS.instantReplaySeconds,
+                                               fileFormat=gS.captureFormat)
+            except (ValueError, OSError) as error:
+                print(f"Warning: Capture is disabled ({error}).")
+
+        # 14. Rewind & Quick Save
+        # The last rewindSeconds of states, one per step: holding Backspace plays them back in
+        # reverse. F5 and F8 quick save and quick load. Requests are handled between steps.
+        self.history = None
+        if gS.rewindSeconds and not headless:
+            self.history = wS.History(gS.rewindSeconds, gS.simulationRate)
+            self.history.record(self)
+        self.saveRequested = False
+        self.loadRequested = False
+
     # Add these two methods inside your Shooter class
 
-    def reset(self):
+    def entityCounts(self):
+        """Returns the number of live meteors, lasers and pickups, for the profiler."""
+        meteors = len(self.meteors)
+        pickups = len(self.ammoG) + len(self.healthG) + len(self.lifeG)
+        if self.entities is not None:
+            meteors += self.entities.countOf('meteor')
+            pickups += len(self.entities) - self.entities.countOf('meteor')
+        return meteors, len(self.lasers), pickups
+
+    def overlayDetails(self):
+        """Returns the lines shown under the profiler's numbers: text rendering and input latency."""
+        ui = self.ui
+        reuses = sum(widget.reuses for widget in (ui.scoreText, ui.healthText, ui.ammoText))
+        return ui.textCache.report() + [f"hud text   {reuses} draws reused"] + self.latency.report()
+
+    def leaderboardChanged(self):
+        """Wakes the game over screen when a run was stored. Runs on the leaderboard's thread."""
+        pygame.event.post(pygame.event.Event(sc.leaderboardChanged))
+
+    def seedStreams(self, seed):
+        """
+        Reseeds the game's random number streams.
+
+        Args:
+            seed (int): The session seed. The spawn-position and spawn-timing streams
+                are each derived from it.
+        """
+        self.seed = seed
+        self.rng.seed(seed)
+        self.spawner.rng.seed(seed * 2 + 1)
+
+    def reset(self, seed=None):
         """
         Resets the entire game state to its initial values for a new session.
         This includes player stats, score, difficulty, and all on-screen objects.
+
+        Args:
+            seed (int): The seed for the new session. A random one is chosen if omitted.
         """
+        # 0. Seed the new session's random number streams.
+        self.seedStreams(random.randrange(2 ** 32) if seed is None else seed)
+
         # 1. Reset Game State & Timers
+        self.gameOver = False
         self.gameTime = 0
-        self.meteorTimer = 0
-        self.ammoTimer = 0
-        self.healthTimer = 0
-        self.lifeTimer = 0
 
         # 2. Reset Player Attributes
-        self.player.health = 100
-        self.player.rect.center = (gS.screenWidth / 2, gS.screenHeight - 200)
+        # Co-op ships start side by side, centered on the single-player start.
+        for index, player in enumerate(self.players):
+            player.health = 100
+            player.rect.center = (gS.screenWidth / 2 + (index - (len(self.players) - 1) / 2) * gS.coopSpacing,
+                                  gS.screenHeight - 200)
+            player.previous = player.rect.topleft
+            if player.animator is not None:
+                player.animator.restart()
+                player.image, player.mask = player.animator.image, player.animator.mask
         self.ammo = gS.ammo
 
         # 3. Reset Gameplay & Difficulty Parameters to their defaults
         self.difficultyTime = gS.difficultyTime
+        self.difficultyLevel = 0
         self.meteorSpawnRate = gS.meteorSpawnRate
         self.ammoSpawnRate = gS.ammoSpawnRate
         self.healthSpawnRate = gS.healthSpawnRate
         self.lifeSpawnRate = gS.lifeSpawnRate
         self.ammoIncrement = gS.ammoIncrement
+        # Schedule the first spawn of every type from the new starting rates.
+        self.spawner.reset(self.gameTime)
+
+        # Start a fresh replay recording for the new session, if recording is enabled.
+        if gS.replayPath and not self.headless:
+            self.startRecording()
 
         # 4. Clear all dynamic sprites from the previous game session
-        self.meteors.empty()
-        self.lasers.empty()
-        self.ammoG.empty()
-        self.healthG.empty()
-        self.lifeG.empty()
+        # Killing them (instead of emptying the groups) returns them to their pools.
+        for group in (self.meteors, self.lasers, self.ammoG, self.healthG, self.lifeG, self.explosions):
+            for sprite in group.sprites():
+                sprite.kill()
+
+        if self.entities is not None:
+            self.entities.clear()
+        self.stormCarry = 0.0
 
         # Reset the main sprite group to only contain the essential sprites
         self.allSprites.empty()
-        self.allSprites.add(self.player, self.stars)
-
-    def _load_highscore(self):
-        """
-        Loads the high score from 'highscore.txt'.
-        If the file doesn't exist or is invalid, it returns 0.
-        """
-        try:
-            with open("highscore.txt", "r") as f:
-                score = int(f.read())
-                return score
-        except (FileNotFoundError, ValueError):
-            # File doesn't exist or is empty/corrupt
-            return 0
-
-    def _save_highscore(self, score):
-        """
-        Saves a new high score to 'highscore.txt'.
-        """
-        with open("highscore.txt", "w") as f:
-            f.write(str(int(score)))
-
-    # Add this method inside your Shooter class
-    def gameOverScreen(self):
-        """
-        Displays the game over screen with scores and a retry button.
-        This function runs a separate loop to wait for player input.
-        """
-        # --- High Score Logic ---
-        # 1. Capture the final score before it gets reset.
-        finalScore = int(self.gameTime)
-
-        # 2. Load the existing high score from the file.
-        highScore = self._load_highscore()
-
-        # 3. Check if the current score is a new high score.
-        newHighscore = finalScore > highScore
-        if newHighscore:
-            # If it is, save the new high score and update the display variable.
-            self._save_highscore(finalScore)
-            highScore = finalScore
-
-        # --- Screen & Button Setup ---
-        textColor = (255, 255, 255)
-        buttonColor = (0, 100, 0)
-        buttonHoverColor = (0, 150, 0)
-        newHighscoreColor = (255, 215, 0)  # Gold color
-
-        buttonWidth = 200
-        buttonHeight = 50
-        buttonX = (gS.screenWidth / 2) - (buttonWidth / 2)
-        buttonY = gS.screenHeight / 2 + 100
-        retryButton = pygame.Rect(buttonX, buttonY, buttonWidth, buttonHeight)
-
-        # --- Main Loop for this Screen ---
-        waiting = True
-        while waiting:
-            # Event Handling
-            for event in pygame.event.get():
-                if event.type == pygame.QUIT:
-                    return 'QUIT'  # Signal to quit the game
-                if event.type == pygame.MOUSEBUTTONDOWN:
-                    if event.button == 1 and retryButton.collidepoint(event.pos):
-                        self.reset()
-                        return 'RETRY'  # Signal to retry
-
-            # Drawing
-            self.displaySurface.fill(self.screenColor)
-
-            # Display "Game Over" text
-            self.ui.drawText(self.displaySurface, "Game Over", (gS.screenWidth / 2, gS.screenHeight / 4),
-                             color=textColor)
-
-            # Display the player's final score
-            finalScoreText = f"Your Score: {finalScore}"
-            self.ui.drawText(self.displaySurface, finalScoreText, (gS.screenWidth / 2, gS.screenHeight / 3),
-                             color=textColor)
-
-            # Display the High Score
-            highScoreText = f"High Score: {highScore}"
-            self.ui.drawText(self.displaySurface, highScoreText, (gS.screenWidth / 2, gS.screenHeight / 3 + 50),
-                             color=textColor)
-
-            # If a new high score was achieved, display a special message.
-            if newHighscore:
-                self.ui.drawText(self.displaySurface, "New High Score!",
-                                 (gS.screenWidth / 2, gS.screenHeight / 3 + 100), color=newHighscoreColor)
-
-            # Draw Retry Button with hover effect
-            mousePos = pygame.mouse.get_pos()
-            if retryButton.collidepoint(mousePos):
-                pygame.draw.rect(self.displaySurface, buttonHoverColor, retryButton)
-            else:
-                pygame.draw.rect(self.displaySurface, buttonColor, retryButton)
+        self.allSprites.add(*self.players, self.stars)
 
-            self.ui.drawText(self.displaySurface, "Retry", retryButton.center, color=textColor)
-
-            # Update the display
-            pygame.display.flip()
-            self.clock.tick(gS.fps)
+        # A new session can't be rewound into the last one.
+        if self.history is not None:
+            self.history.clear()
+            self.history.record(self)
 
+    def startRecording(self):
+        """Starts recording every simulation step's input for the current session."""
+        self.recorder = rP.ReplayRecorder(self.seed, gS.simulationRate, mouse=gS.mouse)
 
+    def saveRecording(self):
+        """Writes the current replay recording to gS.replayPath, if one is running."""
+        if self.recorder is not None:
+            self.recorder.save(gS.replayPath)
 
     def difficulty(self):
         """
@@ -257,9 +360,10 @@ class Shooter:
         """
         # 1. Update the timer for the next difficulty increase
         self.difficultyTime += gS.difficultyTime
+        self.difficultyLevel += 1
 
-        # 2. Calculate the difficulty multiplier (e.g., 0.9)
-        difficulty = (100 - gS.difficultyIncrement) / 100
+        # 2. The difficulty multiplier (e.g., 0.9), derived from difficultyIncrement
+        difficulty = gS.difficultyMultiplier
 
         # 3. Apply the multiplier to all spawn rates
         # This shortens the time interval for everything equally.
@@ -271,84 +375,328 @@ class Shooter:
         # 4. Slightly increase the amount of ammo received per pack
         self.ammoIncrement += self.ammoIncrement * gS.difficultyIncrement / 100
 
+    def dropSpeeds(self):
+        """Returns the downward speed of each kind of falling object, from the current settings."""
+        return {'meteor': gS.meteorSpeed, 'ammo': gS.ammoSpeed, 'health': gS.healthSpeed, 'life': gS.lifeSpeed}
+
+    def applySettings(self, changed):
+        """
+        Brings the running game in line with settings that were just reloaded.
+
+        Settings read every frame (e.g., laserSpeed) apply on their own; this
+        updates the values the game keeps its own copies of.
+
+        Args:
+            changed (set): The names of the settings whose values changed.
+        """
+        # 1. Spawn rates and ammo per pack, as if the run had used the new values from the start.
+        level = self.difficultyLevel
+        difficulty = gS.difficultyMultiplier ** level
+        self.meteorSpawnRate = gS.meteorSpawnRate * difficulty
+        self.ammoSpawnRate = gS.ammoSpawnRate * difficulty
+        self.healthSpawnRate = gS.healthSpawnRate * difficulty
+        self.lifeSpawnRate = gS.lifeSpawnRate * difficulty
+        self.ammoIncrement = gS.ammoIncrement * (1 + gS.difficultyIncrement / 100) ** level
+        # Spawns already scheduled at the old rates are rescheduled at the new ones.
+        spawnSettings = {'meteorSpawnRate', 'ammoSpawnRate', 'healthSpawnRate', 'lifeSpawnRate',
+                         'difficultyIncrement', 'randomProbability'}
+        if not changed.isdisjoint(spawnSettings):
+            self.spawner.reschedule(self.gameTime)
+
+        # 2. Speeds of the ship and of every falling object, including the pooled ones.
+        for player in self.players:
+            player.speed = gS.playerSpeed
+        speeds = self.dropSpeeds()
+        for kind, group in self.droppings.items():
+            for sprite in chain(group.sprites(), self.pools[kind].free):
+                sprite.speed = speeds[kind]
+        if self.entities is not None:
+            self.entities.setSpeeds(speeds)
+
+        # 3. Input latency recording, which the F3 overlay also keeps on while it is shown.
+        if 'latencyStats' in changed:
+            self.latency.setEnabled(gS.latencyStats or self.profiler.overlay)
+
     def run(self):
         # This is the main game loop that keeps the game running.
-        self.sfx.play('bgm')
+        self.sfx.playMusic()
+
+        # Record this session's input so it can be replayed later, if enabled.
+        if gS.replayPath:
+            self.startRecording()
+
+        try:
+            self.scenes.run('play')
+        finally:
+            # Save the replay even if the game crashed, so the crash can be reproduced.
+            self.saveRecording()
+            # Write out the recorded frame timings, if an export was requested.
+            if gS.profilerCsvPath:
+                self.profiler.exportCsv(gS.profilerCsvPath)
+            # Print the input latency percentiles, if they were recorded.
+            if gS.latencyStats:
+                print('\n'.join(self.latency.report()))
+            # Let the leaderboard finish writing the last run.
+            if self.leaderboard is not None:
+                self.leaderboard.close()
+            # Finish the frames still being encoded and close any recording.
+            if self.capture is not None:
+                self.capture.close()
+
+    def playFrames(self):
+        """
+        Runs frames of the game until it has to leave the play scene.
+
+        Returns:
+            str: 'gameOver' when the player died, 'pause' when a pause was requested
+                (Esc, P, or the window losing focus), or 'quit'.
+        """
+        # The simulation advances in fixed steps, independent of the display frame rate.
+        stepTime = 1 / gS.simulationRate
+        accumulator = 0.0
+        profiler = self.profiler
+        # Input read before the game left the play scene was never shown, so it isn't timed.
+        self.latency.discard()
 
         while self.running:
-            # 1. Timing and Difficulty
-            # Calculate delta time for frame-rate independent physics.
-            dt = self.clock.tick(gS.fps) / 1000
-            self.gameTime += dt
-
-            # Check if it's time to increase the game difficulty.
-            if self.gameTime >= self.difficultyTime:
-                self.difficulty()
-
-            # 2. Object Spawning
-            # Use timers to control when new objects are created.
-
-            # Meteor spawning
-            self.meteorTimer += dt
-            if self.meteorTimer >= randGenForProb(self.meteorSpawnRate):
-                self.spawnObjects('meteor')
-                self.meteorTimer = 0
-
-            # Ammo spawning
-            self.ammoTimer += dt
-            if self.ammoTimer >= randGenForProb(self.ammoSpawnRate):
-                self.spawnObjects('ammo')
-                self.ammoTimer = 0
-
-            # Health spawning
-            self.healthTimer += dt
-            if self.healthTimer >= randGenForProb(self.healthSpawnRate):
-                self.spawnObjects('health')
-                self.healthTimer = 0
-
-            # Life spawning
-            self.lifeTimer += dt
-            if self.lifeTimer >= randGenForProb(self.lifeSpawnRate):
-                self.spawnObjects('life')
-                self.lifeTimer = 0
-
-            # 3. Event Handling and Updates
-            # Process user input and update the state of all game objects.
-            self.handleEvents(dt)
-            self.allSprites.update(dt)
-
-            # 4. Collision Detection
-            # Check for collisions between different groups of sprites.
-            playerCollision = pygame.sprite.spritecollide(self.player, self.meteors, True, pygame.sprite.collide_mask)
-            laserCollision = pygame.sprite.groupcollide(self.lasers, self.meteors, True, True,
-                                                        pygame.sprite.collide_mask)
-            ammoCollision = pygame.sprite.spritecollide(self.player, self.ammoG, True, pygame.sprite.collide_mask)
-            healthCollision = pygame.sprite.spritecollide(self.player, self.healthG, True, pygame.sprite.collide_mask)
-            lifeCollision = pygame.sprite.spritecollide(self.player, self.lifeG, True, pygame.sprite.collide_mask)
-
-            # 5. Collision Handling
-            #  Responds to any collisions that were detected.
-            if playerCollision:
-                self.collision('player')
-            if laserCollision:
-                self.collision('laser')
-            if ammoCollision:
-                self.collision('ammo')
-            if healthCollision and self.player.health != 100:
-                self.collision('health')
-            if lifeCollision and self.player.health != 100:
-                self.collision('life')
-
-            # 6. Rendering
-            #  Draws all game elements to the screen and updates the display.
-            self.draw()
-            self.boundary()
-            pygame.display.flip()
+            # 1. Timing
+            # Measure how much real time passed, capped so a long stall (e.g., dragging the
+            # window) doesn't force hundreds of catch-up steps. An unfocused window that keeps
+            # playing runs at a lower frame rate, and always sleeps between frames.
+            fps, pacing = self.frameRate()
+            frameTime = min(lt.waitForFrame(self.clock, fps, pacing) / 1000, gS.maxFrameTime)
+            accumulator += frameTime
+            # The time spent waiting in clock.tick() is not part of the profiled frame.
+            profiler.beginFrame()
+
+            # Apply changes to the settings file before this frame's steps.
+            if self.config is not None:
+                changed = self.config.poll()
+                if changed:
+                    self.applySettings(changed)
+
+            # 2. Simulation
+            # Run as many fixed steps as fit into the time that has built up. In netplay the
+            # session runs them, rolling back and re-simulating when a remote input arrives.
+            # While Backspace is held, each step goes one step back in the history instead.
+            rewinding = self.rewindHeld()
+            while accumulator >= stepTime and self.running and not self.gameOver:
+                if self.netplay is not None:
+                    self.netplay.advance(stepTime)
+                elif rewinding:
+                    self.history.rewind(self)
+                else:
+                    self.step(stepTime)
+                    if self.history is not None:
+                        self.history.record(self)
+                accumulator -= stepTime
+                if self.saveRequested or self.loadRequested:
+                    self.quickSaveOrLoad()
+            if self.netplay is not None:
+                self.netplay.settle()
+
+            # If the player died this frame, hand over to the game over screen. In netplay, only
+            # once the other player's inputs up to that step have arrived (it may be undone).
+            if self.gameOver and (self.netplay is None or self.netplay.settled):
+                if self.netplay is not None:
+                    self.netplay.finish()
+                return 'gameOver'
+
+            # 3. Rendering
+            # Draw sprites between their previous and current positions, using how far
+            # the leftover time has progressed into the next step. Low-latency mode reads the
+            # pointer once more first, and draws the local ship right where it is.
+            alpha = accumulator / stepTime
+            self.latched = self.latchPlayer(rewinding)
+            self.renderer.draw(alpha)
+            profiler.lap('draw')
+            # Hand the finished frame to the capture encoder, if capture is on.
+            if self.capture is not None:
+                self.capture.grab(self.displaySurface)
+            profiler.lap('capture')
+            self.renderer.present()
+            # An interpolated ship shows the pointer as it was (1 - alpha) steps before its last reading.
+            self.latency.presented(0.0 if self.latched[0] is not None else (1 - alpha) * stepTime)
+            profiler.lap('present')
+            profiler.endFrame()
+
+            # Leave for the pause screen once the paused frame is on screen. A netplay game
+            # can't be paused, since the other player's game keeps running.
+            if self.pauseRequested and self.netplay is not None:
+                self.pauseRequested = False
+            if self.pauseRequested:
+                self.pauseRequested = False
+                return 'pause'
+
+        return 'quit'
+
+    def frameRate(self):
+        """
+        Returns the frame rate to run at and how to wait for each frame.
+
+        Returns:
+            tuple: The frames per second and the frame pacing (see latency.waitForFrame()).
+        """
+        if self.focused:
+            return gS.fps, gS.framePacing
+        return gS.unfocusedFps, 'sleep'
+
+    def rewindHeld(self):
+        """Returns whether Backspace is held to rewind. Netplay games can't be rewound."""
+        if self.history is None or self.netplay is not None:
+            return False
+        # No step (and so no input reading) runs while rewinding, so keep the key state current.
+        pygame.event.pump()
+        return pygame.key.get_pressed()[pygame.K_BACKSPACE]
+
+    def latchPlayer(self, rewinding=False):
+        """
+        Works out where low-latency mode draws the local ship this frame.
+
+        With live mouse controls, the pointer is read right before drawing, so the
+        ship is shown where the pointer is now instead of where it was at the last
+        step (and partway back to the step before). Only the picture changes: the
+        next step reads the pointer for the simulation as usual.
+
+        Args:
+            rewinding (bool): Whether the game is being rewound (the ship follows the history).
+
+        Returns:
+            tuple: (ship, top-left position), or (None, None) to interpolate it as usual.
+        """
+        player = self.localPlayer
+        if not gS.lowLatency or not player.alive():
+            return None, None
+        # Replays, bots, netplay's delayed input and the rewind history decide where the ship
+        # is themselves; it is drawn at its newest simulated position instead.
+        if not gS.mouse or rewinding or self.inputSource != self.readInput:
+            return player, player.rect.topleft
+
+        # Let SDL take in the latest mouse motion; the events stay queued for the next step.
+        pygame.event.pump()
+        position = self.target.toLogical(pygame.mouse.get_pos())
+        self.latency.pointer(position)
+        # The same limits boundary() keeps the ship within.
+        rect = player.rect.copy()
+        rect.center = position
+        rect.clamp_ip((gS.playSpace[0], 0, gS.playSpace[1] - gS.playSpace[0], gS.screenHeight))
+        return player, rect.topleft
+
+    def quickSaveOrLoad(self):
+        """Saves the game to, or loads it from, the quick save file (F5 and F8)."""
+        filePath = gS.quickSavePath or path.join(lB.userDataDir(), 'quicksave.mds')
+        save, load = self.saveRequested, self.loadRequested
+        self.saveRequested = self.loadRequested = False
+        # Netplay games can't be saved or loaded: the other player's game would go out of step.
+        if self.netplay is not None:
+            return
+        try:
+            if save:
+                wS.save(self, filePath)
+            if load:
+                wS.load(self, filePath)
+        except (OSError, ValueError) as error:
+            print(f"Warning: Quick {'load' if load else 'save'} failed ({error}).")
+            return
+        if load:
+            # The history before the loaded state belongs to another timeline.
+            if self.history is not None:
+                self.history.clear()
+                self.history.record(self)
+            self.renderer.invalidate()
+
+    def step(self, dt):
+        """
+        Advances the game simulation by one fixed step, without drawing anything.
+
+        This covers difficulty, spawning, input, movement and collisions. It is
+        shared by the interactive loop in run() and by the headless runner.
+
+        Args:
+            dt (float): The time in seconds to simulate (normally 1 / gS.simulationRate).
+        """
+        profiler = self.profiler
+
+        # 1. Timing and Difficulty
+        self.gameTime += dt
+        # Remember where the players were, so rendering can interpolate their movement.
+        for player in self.players:
+            player.previous = player.rect.topleft
+
+        # Check if it's time to increase the game difficulty.
+        if self.gameTime >= self.difficultyTime:
+            self.difficulty()
+
+        # 2. Object Spawning
+        # Run every spawn whose scheduled time has been reached.
+        self.spawner.advance(self.gameTime)
+
+        # Storm mode: keep the screen filled with meteors.
+        if gS.stormMode and self.entities is not None:
+            self.spawnStorm(dt)
+        profiler.lap('spawn')
+
+        # 3. Event Handling and Updates
+        # Process user input and update the state of all game objects.
+        self.handleEvents(dt)
+        profiler.lap('events')
+        self.allSprites.update(dt)
+        if self.entities is not None:
+            self.entities.update(dt)
+        profiler.lap('update')
+
+        # 4. Collision Detection
+        # Check every player and laser collision in a single broadphase pass. A first ship
+        # that is out of play (co-op) is left out, so only the lasers are checked.
+        player = self.player if self.player.alive() else None
+        hits = self.collisions.detect(player, self.lasers, self.droppings)
+        if self.entities is not None:
+            self.entities.collide(player, self.lasers, hits)
+
+        # 5. Collision Handling
+        #  Responds to any collisions that were detected.
+        if player is not None:
+            self.respond(hits, player)
+        if hits['laser']:
+            self.collision('laser')
+            # Every meteor that was shot explodes where it was hit.
+            for meteor in hits['laser']:
+                self.spawnExplosion(meteor.rect.center)
+
+        # Co-op ships that are still flying, in player order, against what is left.
+        for player in self.players[1:]:
+            if not player.alive():
+                continue
+            playerHits = self.collisions.detectPlayer(player, self.droppings)
+            if self.entities is not None:
+                self.entities.collide(player, self.noLasers, playerHits)
+            self.respond(playerHits, player)
+
+        # 6. Keep the players inside the play area.
+        self.boundary()
+        profiler.lap('collision')
+
+    def respond(self, hits, player):
+        """
+        Applies one ship's meteor and pickup hits.
+
+        Args:
+            hits (dict): The ship's collision results (see CollisionEngine.detect()).
+            player (Player): The ship that was hit.
+        """
+        if hits['player']:
+            self.collision('player', player)
+        if hits['ammo']:
+            self.collision('ammo', player)
+        if hits['health'] and player.health != 100:
+            self.collision('health', player)
+        if hits['life'] and player.health != 100:
+            self.collision('life', player)
 
     def spawnObjects(self, spawn):
         # 1. Determine the spawn position
         # Generate a random horizontal position within the playable area.
-        x = random.randint(gS.playSpace[0], gS.playSpace[1])
+        x = self.rng.randint(gS.playSpace[0], gS.playSpace[1])
         # Use a fixed vertical position just above the screen.
         y = gS.droppingSpawnPosition
 
@@ -369,122 +717,272 @@ class Shooter:
 
     def spawnMeteor(self, x, y):
         """Creates a new meteor and adds it to the game."""
-        newMeteor = Meteor(loadingAssets('meteor.png'), x, y)
+        if self.entities is not None:
+            self.entities.spawn('meteor', x, y)
+            return
+        newMeteor = self.pools['meteor'].acquire(self.assets.get('meteor.png'), x, y)
         self.meteors.add(newMeteor)
         self.allSprites.add(newMeteor)
 
     def spawnAmmo(self, x, y):
         """Creates a new ammo pack and adds it to the game."""
-        newAmmo = Ammo(loadingAssets('ammo.png'), x, y)
+        if self.entities is not None:
+            self.entities.spawn('ammo', x, y)
+            return
+        newAmmo = self.pools['ammo'].acquire(self.assets.get('ammo.png'), x, y)
         self.ammoG.add(newAmmo)
         self.allSprites.add(newAmmo)
 
     def spawnHealth(self, x, y):
         """Creates a new health pack and adds it to the game."""
-        newHealth = Health(loadingAssets('health.png'), x, y)
+        if self.entities is not None:
+            self.entities.spawn('health', x, y)
+            return
+        newHealth = self.pools['health'].acquire(self.assets.get('health.png'), x, y)
         self.healthG.add(newHealth)
         self.allSprites.add(newHealth)
 
     def spawnLife(self, x, y):
         """Creates a new life pack and adds it to the game."""
-        newLife = Health(loadingAssets('life.png'), x, y)
+        if self.entities is not None:
+            self.entities.spawn('life', x, y)
+            return
+        newLife = self.pools['life'].acquire(self.assets.get('life.png'), x, y)
         self.lifeG.add(newLife)
         self.allSprites.add(newLife)
 
-    def draw(self):
+    def spawnExplosion(self, center):
+        """Starts an explosion animation centered on the given position."""
+        explosion = self.pools['explosion'].acquire(center)
+        self.explosions.add(explosion)
+        self.allSprites.add(explosion)
+
+    def spawnStorm(self, dt):
+        """
+        Spawns enough meteors to keep about gS.stormMeteorCount of them on screen.
+
+        Args:
+            dt (float): The time in seconds simulated by this step.
+        """
+        # How long a meteor takes to fall from its spawn point past the bottom of the screen.
+        lifetime = (gS.screenHeight - gS.droppingSpawnPosition + 100) / gS.meteorSpeed
+        self.stormCarry += gS.stormMeteorCount * dt / lifetime
+        amount = int(self.stormCarry)
+        self.stormCarry -= amount
+
+        randint = self.rng.randint
+        xs = [randint(gS.playSpace[0], gS.playSpace[1]) for _ in range(amount)]
+        self.entities.spawnMany('meteor', xs, [gS.droppingSpawnPosition] * amount)
+
+    def draw(self, alpha=1.0):
         """
         Handles all drawing operations for the game.
         This method is called once per frame to render the game state.
         The order of operations is important for correct visual layering.
-        """
-        # 1. Clear the Screen
-        # Fill the display with a solid color to erase everything from the last frame.
-        self.displaySurface.fill(self.screenColor)
-        # self.displaySurface.blit(loadingAssets('background.png'), self.displaySurface.get_rect())
 
-        # 2. Draw the Background Elements
-        # The starfield is drawn first so all other objects appear on top of it.
-        self.stars.draw(self.displaySurface)
-
-        # 3. Draw All Game Sprites
-        # Loop through the master sprite group to draw each object.
+        Args:
+            alpha (float): How far rendering is between the previous simulation step
+                (0.0) and the current one (1.0). Sprites are drawn in between.
+        """
+        # 1. Draw the Background
+        # One blit of the cached fill color, starfield and sidebars erases the last frame.
+        # It is rebuilt first if any of the settings it was rendered from have changed.
+        self.background.refresh()
+        self.background.draw(self.displaySurface, self.gameTime)
+
+        # With the NumPy backend, every falling object is drawn in one batched call.
+        target = self.target
+        if self.entities is not None:
+            self.entities.draw(self.displaySurface, alpha, target=target)
+        latchedSprite, latched = self.latched
+
+        # 2. Draw All Game Sprites
+        # Loop through the master sprite group to draw each object. Positions and images
+        # are converted from logical to render resolution by the render target.
         for sprite in self.allSprites:
+            # The starfield is already part of the background.
+            if sprite is self.stars:
+                continue
+            position = target.point(latched if sprite is latchedSprite else rdr.interpolate(sprite, alpha))
             # This checks if a sprite has a special drawing method (e.g., the player's health bar).
             if hasattr(sprite, 'draw'):
                 # If it does, use its custom draw method.
-                sprite.draw(self.displaySurface)
+                sprite.draw(self.displaySurface, position, target)
             else:
                 # Otherwise, use the standard method to draw the sprite's image.
-                self.displaySurface.blit(sprite.image, sprite.rect)
+                self.displaySurface.blit(target.image(sprite.image), position)
 
-        # 4. Draw the User Interface (UI)
-        # Draw the static sidebar background image.
-        self.displaySurface.blit(self.ui.image, (0, 0))
+        # 3. Draw the User Interface (UI)
+        # Put the sidebars back on top of any sprites that overlap them.
+        self.background.drawOverlay(self.displaySurface)
 
         # Call the UI's own draw method to render dynamic text (score, health, etc.)
         # over the sidebars.
         self.ui.draw(
             self.displaySurface,
             self.gameTime,
-            self.player.health,
+            self.localPlayer.health,
             self.ammo
         )
 
     def handleEvents(self, dt):
         """
-        Handles all user input, including window events, mouse clicks,
-        and continuous keyboard or mouse movement.
+        Handles all user input for one simulation step, including window events,
+        mouse clicks, and continuous keyboard or mouse movement.
+
+        The input comes from self.inputSource (live input, or a replay being played
+        back) and is logged by the replay recorder when recording is enabled. In
+        co-op, the source returns one input per ship, in player order.
+        """
+        tickInput = self.inputSource()
+        if isinstance(tickInput, rP.TickInput):
+            if self.recorder is not None:
+                self.recorder.record(tickInput)
+            self.applyInput(tickInput, dt)
+            return
+        for player, playerInput in zip(self.players, tickInput):
+            if player.alive():
+                self.applyInput(playerInput, dt, player)
+
+    def readInput(self):
         """
+        Reads the live input for one simulation step.
+
+        Returns:
+            replay.TickInput: The shots fired, held movement keys and mouse position.
+        """
+        fires = 0
+        latency = self.latency
+
         # 1. Process Event Queue
         # This loop handles discrete, one-time events like clicks or quitting.
+        latency.polled()
         for event in pygame.event.get():
             # Check if the user clicked the 'X' to close the window.
             if event.type == pygame.QUIT:
                 self.running = False
 
-            # Check for a mouse button press (for shooting).
-            if event.type == pygame.MOUSEBUTTONDOWN:
-                # If the left mouse button (button 1) is pressed and the player has ammo.
-                if event.button == 1 and self.ammo > 0:
-                    self.sfx.play('laser')
-                    self.ammo -= 1
-
-                    # Create a new laser instance at the player's position.
-                    laser = Laser(
-                        loadingAssets('laser.png'),
-                        self.player.rect.centerx,
-                        self.player.rect.top
-                    )
-
-                    # Add the new laser to its group and the main sprite group.
-                    self.lasers.add(laser)
-                    self.allSprites.add(laser)
-
-        # 2. Process Continuous Input
-        # This block handles actions that happen every frame a key is held
-        # down or the mouse is moved.
-
+            # Check for a left mouse button press (for shooting).
+            if event.type == pygame.MOUSEBUTTONDOWN and event.button == 1:
+                fires += 1
+                latency.seen('click')
+
+            # Movement key presses are timed until the frame that shows them.
+            if event.type == pygame.KEYDOWN and event.key in (pygame.K_w, pygame.K_a, pygame.K_s, pygame.K_d):
+                latency.seen('key')
+
+            # F3 shows or hides the profiler overlay. It doesn't affect gameplay.
+            if event.type == pygame.KEYDOWN and event.key == pygame.K_F3:
+                self.profiler.toggleOverlay()
+                latency.setEnabled(gS.latencyStats or self.profiler.overlay)
+                self.renderer.invalidate()
+
+            # F10 starts or stops recording gameplay, and F9 saves the instant replay.
+            if event.type == pygame.KEYDOWN and self.capture is not None:
+                if event.key == pygame.K_F10:
+                    self.capture.toggleRecording()
+                elif event.key == pygame.K_F9:
+                    self.capture.saveReplay()
+
+            # F5 quick saves and F8 quick loads, once the current step is done.
+            if event.type == pygame.KEYDOWN and event.key == pygame.K_F5:
+                self.saveRequested = True
+            if event.type == pygame.KEYDOWN and event.key == pygame.K_F8:
+                self.loadRequested = True
+
+            # Esc or P pauses the game.
+            if event.type == pygame.KEYDOWN and event.key in (pygame.K_ESCAPE, pygame.K_p):
+                self.pauseRequested = True
+
+            # Losing focus pauses (or throttles) the game, and minimizing always pauses it.
+            if event.type == pygame.WINDOWFOCUSLOST:
+                self.focused = False
+                if gS.pauseOnFocusLoss:
+                    self.pauseRequested = True
+            if event.type == pygame.WINDOWFOCUSGAINED:
+                self.focused = True
+            if event.type == pygame.WINDOWMINIMIZED:
+                self.pauseRequested = True
+
+        # 2. Read Continuous Input
         # Check which control scheme is active (mouse or keyboard).
         if gS.mouse:
+            # Rounded to whole logical pixels here, so live play, replays and rewinding all apply
+            # the same position (a scaled render size gives fractions that a replay can't store).
+            x, y = self.target.toLogical(pygame.mouse.get_pos())
+            position = (round(x), round(y))
+            latency.pointer(position)
+            return rP.TickInput(mouse=position, fires=fires)
+
+        # Check for currently held-down keyboard keys for player movement.
+        keys = pygame.key.get_pressed()
+        held = 0
+        if keys[pygame.K_w]:
+            held |= rP.keyW
+        if keys[pygame.K_a]:
+            held |= rP.keyA
+        if keys[pygame.K_s]:
+            held |= rP.keyS
+        if keys[pygame.K_d]:
+            held |= rP.keyD
+        return rP.TickInput(keys=held, fires=fires)
+
+    def applyInput(self, tickInput, dt, player=None):
+        """
+        Applies one simulation step's input to the game.
+
+        Args:
+            tickInput (replay.TickInput): The input to apply.
+            dt (float): The time in seconds simulated by this step.
+            player (Player): The ship it controls. Defaults to self.player.
+        """
+        if player is None:
+            player = self.player
+
+        # 1. Shooting
+        for _ in range(tickInput.fires):
+            # Only fire if the player has ammo.
+            if self.ammo > 0:
+                self.sfx.play('laser')
+                self.ammo -= 1
+
+                # Take a laser from the pool and place it at the player's position.
+                laser = self.pools['laser'].acquire(
+                    self.assets.get('laser.png'),
+                    player.rect.centerx,
+                    player.rect.top
+                )
+
+                # Add the new laser to its group and the main sprite group.
+                self.lasers.add(laser)
+                self.allSprites.add(laser)
+
+        # 2. Movement
+        if tickInput.mouse is not None:
             # Player's position is directly set to the mouse cursor's position.
-            self.player.rect.center = pygame.mouse.get_pos()
+            player.rect.center = tickInput.mouse
         else:
-            # Check for currently held-down keyboard keys for player movement.
-            keys = pygame.key.get_pressed()
-            if keys[pygame.K_w]:
-                self.player.move('w', dt)
-            if keys[pygame.K_s]:
-                self.player.move('s', dt)
-            if keys[pygame.K_a]:
-                self.player.move('a', dt)
-            if keys[pygame.K_d]:
-                self.player.move('d', dt)
-
-    def collision(self, collisionType):
+            keys = tickInput.keys
+            if keys & rP.keyW:
+                player.move('w', dt)
+            if keys & rP.keyS:
+                player.move('s', dt)
+            if keys & rP.keyA:
+                player.move('a', dt)
+            if keys & rP.keyD:
+                player.move('d', dt)
+
+    def collision(self, collisionType, player=None):
         """
         Handles the game logic for different types of collision events.
         This method is called when a collision is detected in the main game loop.
+
+        Args:
+            collisionType (str): 'player' (hit by a meteor), 'laser', 'ammo', 'health' or 'life'.
+            player (Player): The ship involved. Defaults to self.player.
         """
+        if player is None:
+            player = self.player
         match collisionType:
             # Case for when the player collects an ammo pack.
             case 'ammo':
@@ -498,24 +996,28 @@ class Shooter:
             # Case for when the player collides with a meteor.
             case 'player':
                 self.sfx.play('damage')
-                self.player.health -= gS.healthLossByCollision
-                # If the player's health drops to zero or below, end the game.
-                if self.player.health <= 0:
-                    self.gameOverScreen()
+                player.health -= gS.healthLossByCollision
+                # If the player's health drops to zero or below, end the game. In co-op the
+                # ship leaves play instead, and the game ends with the last one.
+                if player.health <= 0:
+                    if all(other.health <= 0 for other in self.players):
+                        self.gameOver = True
+                    elif len(self.players) > 1:
+                        player.kill()
 
             # Case for when the player collects a health pack.
             case 'health':
                 self.sfx.play('health')
-                self.player.health += gS.healthIncrement
+                player.health += gS.healthIncrement
                 # Cap the player's health at 100 to prevent it from going over the maximum.
-                if self.player.health > 100:
-                    self.player.health = 100
+                if player.health > 100:
+                    player.health = 100
 
             # Case for when the player collects a life pack.
             case 'life':
                 self.sfx.play('life')
                 # Instantly restore the player to full health.
-                self.player.health = 100
+                player.health = 100
 
             # Default case to catch any unexpected collision types for debugging.
             case _:
@@ -523,28 +1025,29 @@ class Shooter:
 
     def boundary(self):
         """
-        Ensures the player sprite stays within the designated screen and play space boundaries.
-        This method is called every frame to clamp the player's position.
+        Ensures the player sprites stay within the designated screen and play space boundaries.
+        This method is called every frame to clamp the players' positions.
         """
-        # --- Vertical Boundary Checks ---
+        for player in self.players:
+            # --- Vertical Boundary Checks ---
 
-        # Prevent the player from moving above the top edge of the screen.
-        if self.player.rect.top < 0:
-            self.player.rect.top = 0
+            # Prevent the player from moving above the top edge of the screen.
+            if player.rect.top < 0:
+                player.rect.top = 0
 
-        # Prevent the player from moving below the bottom edge of the screen.
-        if self.player.rect.bottom > gS.screenHeight:
-            self.player.rect.bottom = gS.screenHeight
+            # Prevent the player from moving below the bottom edge of the screen.
+            if player.rect.bottom > gS.screenHeight:
+                player.rect.bottom = gS.screenHeight
 
-        # --- Horizontal Boundary Checks ---
+            # --- Horizontal Boundary Checks ---
 
-        # Prevent the player from moving past the left boundary of the play space.
-        if self.player.rect.left < gS.playSpace[0]:
-            self.player.rect.left = gS.playSpace[0]
+            # Prevent the player from moving past the left boundary of the play space.
+            if player.rect.left < gS.playSpace[0]:
+                player.rect.left = gS.playSpace[0]
 
-        # Prevent the player from moving past the right boundary of the play space.
-        if self.player.rect.right > gS.playSpace[1]:
-            self.player.rect.right = gS.playSpace[1]
+            # Prevent the player from moving past the right boundary of the play space.
+            if player.rect.right > gS.playSpace[1]:
+                player.rect.right = gS.playSpace[1]
 
 
 class Stars(pygame.sprite.Sprite):
@@ -568,14 +1071,15 @@ class Stars(pygame.sprite.Sprite):
 
     def starPose(self):
         """Generates and stores a list of random star positions."""
-        # Use a fixed seed to ensure the star pattern is identical every time.
-        random.seed(gS.randomSeed)
+        # Use a private generator with a fixed seed, so the star pattern is identical
+        # every time without reseeding the game's global random numbers.
+        rng = random.Random(gS.randomSeed)
 
         # Loop to create the specified number of stars.
         for i in range(gS.numberOfStars):
             # Generate random coordinates within the playable game area.
-            x = random.randint(340, gS.screenWidth - 355)
-            y = random.randint(0, gS.screenHeight)
+            x = rng.randint(340, gS.screenWidth - 355)
+            y = rng.randint(0, gS.screenHeight)
             # Add the new star's position tuple to the list.
             self.randStarPose.append((x, y))
 
@@ -606,12 +1110,61 @@ class Player(pygame.sprite.Sprite):
         self.image = image
         # A float-based rectangle for precise positioning, starting near the bottom-center.
         self.rect = self.image.get_frect(center=(gS.screenWidth / 2, gS.screenHeight - 200))
+        # The top-left position at the start of the current simulation step, for interpolation.
+        self.previous = self.rect.topleft
         # The player's movement speed, loaded from game settings.
         self.speed = gS.playerSpeed
         # The player's health, starting at a default of 100.
         self.health = 100
-        # A pixel-perfect mask generated from the image for accurate collision detection.
-        self.mask = pygame.mask.from_surface(self.image)
+        # A pixel-perfect mask for accurate collision detection, shared through the mask cache.
+        self.mask = cE.masks.get(self.image)
+        # The engine animation, if the ship has one (see animate()).
+        self.animator = None
+
+    def animate(self, strip):
+        """
+        Gives the ship a looping engine animation.
+
+        Args:
+            strip (animation.FrameStrip): The frames, the same size as the ship, with masks.
+        """
+        self.animator = an.Animator(strip, gS.playerFrameRate)
+        self.image = self.animator.image
+        self.mask = self.animator.mask
+
+    def tinted(self, color):
+        """
+        Returns a new ship like this one, in another color (e.g., a co-op partner).
+
+        Args:
+            color (tuple): The (r, g, b) the ship's colors are multiplied by.
+
+        Returns:
+            Player: The new ship. It shares this ship's collision masks.
+        """
+        def tint(image):
+            image = image.copy()
+            image.fill(color, special_flags=pygame.BLEND_RGB_MULT)
+            return image
+
+        other = Player(tint(self.image))
+        other.mask = self.mask
+        if self.animator is not None:
+            strip = self.animator.strip
+            other.animate(an.FrameStrip([tint(frame) for frame in strip.frames], strip.masks))
+        return other
+
+    def update(self, dt):
+        """
+        Advances the engine animation, if the ship has one.
+
+        Args:
+            dt (float): Delta time, for frame-rate independent playback.
+        """
+        if self.animator is not None and self.animator.advance(dt):
+            # Each frame has its own mask, so collisions follow the visible frame.
+            self.image = self.animator.image
+            self.mask = self.animator.mask
 
     def move(self, keyPressed, dt):
         """
@@ -628,29 +1181,44 @@ class Player(pygame.sprite.Sprite):
         elif keyPressed == 'd':
             self.rect.right += self.speed * dt
 
-    def draw(self, displaySurface):
+    def draw(self, displaySurface, position=None, target=None):
         """
         Draws the player's ship and a health bar directly below it.
+
+        Args:
+            displaySurface (pygame.Surface): The surface to draw on.
+            position (tuple): The top-left position to draw at. Defaults to the current
+                position; the renderer passes an interpolated one.
+            target (RenderTarget): When given, 'position' is in render coordinates and
+                the ship and its health bar are drawn at the render resolution.
         """
+        image = self.image if target is None else target.image(self.image)
+        scaleY = 1 if target is None else target.scaleY
+        rect = image.get_frect(topleft=self.rect.topleft if position is None else position)
+
         # --- 1. Draw the Player Ship ---
-        displaySurface.blit(self.image, self.rect)
+        displaySurface.blit(image, rect)
 
         # --- 2. Draw the Health Bar ---
         # Define the health bar's height and position relative to the player.
-        healthBarHeight = 5
-        healthBarY = self.rect.bottom + 5
+        healthBarHeight = max(1, round(5 * scaleY))
+        # The gap between the ship and the bar is as tall as the bar.
+        healthBarY = rect.bottom + healthBarHeight
 
         # Draw the red background bar, representing the total possible health.
-        pygame.draw.rect(displaySurface, (255, 0, 0), [self.rect.x, healthBarY, self.rect.width, healthBarHeight])
+        pygame.draw.rect(displaySurface, (255, 0, 0), [rect.x, healthBarY, rect.width, healthBarHeight])
 
         # Calculate the width of the green bar based on the current health percentage.
-        healthWidth = int(self.rect.width * (self.health / 100))
+        healthWidth = int(rect.width * (self.health / 100))
 
         # Draw the green foreground bar, representing the player's current health.
-        pygame.draw.rect(displaySurface, (0, 255, 0), [self.rect.x, healthBarY, healthWidth, healthBarHeight])
+        pygame.draw.rect(displaySurface, (0, 255, 0), [rect.x, healthBarY, healthWidth, healthBarHeight])
 
+        # Return the area covered by the ship and its health bar.
+        return rect.union((rect.x, healthBarY, rect.width, healthBarHeight))
 
-class Laser(pygame.sprite.Sprite):
+
+class Laser(oP.Pooled, pygame.sprite.Sprite):
     """
     Represents a laser projectile fired by the player.
 
@@ -668,13 +1236,31 @@ class Laser(pygame.sprite.Sprite):
             y (int): The initial vertical bottom for the laser.
         """
         super().__init__()
+        # A float-based rectangle for precise positioning.
+        self.rect = image.get_frect()
+        self.reset(image, x, y)
+
+    def reset(self, image, x, y):
+        """
+        Re-initializes the laser for a new shot. Called by the laser pool on reuse.
+
+        Args:
+            image: The pygame.Surface to use for the laser's image.
+            x (int): The horizontal center for the laser.
+            y (int): The vertical bottom for the laser.
+        """
         # The visual representation of the laser bolt.
         self.image = image
-        # A float-based rectangle for precise positioning.
-        self.rect = self.image.get_frect()
+        # FRect's position setters move the rect from where it was, so start from the origin:
+        # a reused laser then lands exactly where a new one would (netplay relies on this).
+        self.rect.update((0, 0), image.get_size())
         # Set the starting position to where the player fired it from.
         self.rect.centerx = x
         self.rect.bottom = y
+        # A new shot has no earlier position to interpolate from.
+        self.previous = self.rect.topleft
+        # The shared pixel-perfect mask used to test hits against meteors.
+        self.mask = cE.masks.get(image)
 
     def update(self, dt):
         """
@@ -683,7 +1269,9 @@ class Laser(pygame.sprite.Sprite):
         Args:
             dt (float): Delta time, used for frame-rate independent movement.
         """
-        # Move the laser vertically upwards at a constant speed.
+        # Remember the current position for interpolation, then move the laser
+        # vertically upwards at a constant speed.
+        self.previous = self.rect.topleft
         self.rect.bottom -= gS.laserSpeed * dt
 
         # Check if the laser has moved completely off the top of the screen.
@@ -692,7 +1280,7 @@ class Laser(pygame.sprite.Sprite):
             self.kill()
 
 
-class Droppings(pygame.sprite.Sprite):
+class Droppings(oP.Pooled, pygame.sprite.Sprite):
     """
     A base class for all objects that fall from the top of the screen.
 
@@ -715,14 +1303,31 @@ class Droppings(pygame.sprite.Sprite):
         super().__init__()
         # A string to identify the type of dropping (used for collision logic).
         self.itemType = itemType
-        # The visual representation of the object.
-        self.image = image
-        # A float-based rectangle for precise positioning.
-        self.rect = self.image.get_frect(center=(x, y))
         # The constant downward speed of the object.
         self.speed = speed
-        # A pixel-perfect mask for accurate collision detection.
-        self.mask = pygame.mask.from_surface(self.image)
+        # A float-based rectangle for precise positioning.
+        self.rect = image.get_frect()
+        self.reset(image, x, y)
+
+    def reset(self, image, x, y):
+        """
+        Re-initializes the object for a new spawn. Called by its pool on reuse.
+
+        Args:
+            image (pygame.Surface): The image for the sprite.
+            x (int): The horizontal center position.
+            y (int): The vertical center position.
+        """
+        # The visual representation of the object.
+        self.image = image
+        # Start from the origin, so a reused object lands exactly where a new one would.
+        self.rect.update((0, 0), image.get_size())
+        self.rect.center = (x, y)
+        # A new object has no earlier position to interpolate from.
+        self.previous = self.rect.topleft
+        # A pixel-perfect mask for accurate collision detection, shared by every object
+        # that uses the same image.
+        self.mask = cE.masks.get(image)
 
     def update(self, dt):
         """
@@ -731,7 +1336,9 @@ class Droppings(pygame.sprite.Sprite):
         Args:
             dt (float): Delta time, for frame-rate independent movement.
         """
-        # Move the object vertically downwards.
+        # Remember the current position for interpolation, then move the object
+        # vertically downwards.
+        self.previous = self.rect.topleft
         self.rect.bottom += self.speed * dt
 
         # If the object has moved completely past the bottom edge of the screen...
@@ -771,104 +1378,78 @@ class Life(Droppings):
 
     def __init__(self, image, x, y):
         # Sets the properties for a life pack, including its unique speed.
-        super().__init__('life', image, x, y, gS.healthSpeed)
+        super().__init__('life', image, x, y, gS.lifeSpeed)
 
 
-class Sound:
+class UI(pygame.sprite.Sprite):
     """
-    A sound manager class for preloading and playing all game audio.
+    Manages the game's User Interface (UI).
 
-    This class handles initializing the sound system, loading all sound
-    effects and music into memory, and providing a simple method to
-    play them by name.
+    This holds the sidebar background image (drawn as part of the cached
+    background) and renders dynamic text elements like score, health, and
+    ammo count.
     """
 
-    def __init__(self):
-        """Initializes the sound system and loads all audio files."""
-        # Initialize Pygame's mixer module.
-        pygame.mixer.init()
-
-        # Determine the project's root directory to build reliable file paths.
-        projectRoot = path.dirname(path.dirname(path.abspath(__file__)))
-
-        # Preload all sound files into a dictionary for quick and efficient access.
-        # The key is a short name, and the value is the loaded Sound object.
-        self.sounds = {
-            'ammo': pygame.mixer.Sound(path.join(projectRoot, 'audio', 'ammo.wav')),
-            'damage': pygame.mixer.Sound(path.join(projectRoot, 'audio', 'damage.wav')),
-            'explosion': pygame.mixer.Sound(path.join(projectRoot, 'audio', 'explosion.wav')),
-            'life': pygame.mixer.Sound(path.join(projectRoot, 'audio', 'fullHealth.wav')),
-            'bgm': pygame.mixer.Sound(path.join(projectRoot, 'audio', 'gameMusic.wav')),
-            'health': pygame.mixer.Sound(path.join(projectRoot, 'audio', 'healthPack.wav')),
-            'laser': pygame.mixer.Sound(path.join(projectRoot, 'audio', 'laser.wav')),
-        }
-
-        # Adjust the volume for specific sounds to balance the overall audio mix.
-        self.sounds['bgm'].set_volume(0.1)
-        self.sounds['explosion'].set_volume(0.35)
-
-    def play(self, soundName, loops=0):
+    def __init__(self, image, target):
         """
-        Plays a preloaded sound by its name.
+        Initializes the UI object.
 
         Args:
-            soundName (str): The key for the sound in the self.sounds dictionary.
-            loops (int): The number of times to repeat the sound. -1 means loop forever.
+            image (pygame.Surface): The full-screen sidebar image.
+            target (RenderTarget): The render target, used to place and size text at
+                the render resolution.
         """
-        # Check if the requested sound name exists in the dictionary to prevent errors.
-        if soundName in self.sounds:
-            # If it exists, play the sound with the specified number of loops.
-            self.sounds[soundName].play(loops)
-        else:
-            # If not, print a warning to the console for debugging.
-            print(f"Warning: Sound '{soundName}' not found.")
-
-
-class UI(pygame.sprite.Sprite):
-    """
-    Manages the game's User Interface (UI).
-
-    This includes drawing the static sidebar background and rendering
-    dynamic text elements like score, health, and ammo count.
-    """
-
-    def __init__(self, image):
-        """Initializes the UI object."""
         super().__init__()
         # The background image for the UI, likely containing the sidebars.
         self.image = image
         # The rectangle for the UI background image.
         self.rect = self.image.get_rect()
-        # Load the custom font that will be used for displaying all text.
-        self.font = pygame.font.SysFont(path.join(path.dirname(__file__), '..', 'fonts', 'Arbedo-E4g3z.ttf'), 30)
+        self.target = target
+        # Load the custom font that will be used for displaying all text. It is sized for
+        # the render resolution, so text stays sharp instead of being scaled.
+        fontSize = max(1, round(30 * target.scaleY))
+        self.font = pygame.font.SysFont(path.join(path.dirname(__file__), '..', 'fonts', 'Arbedo-E4g3z.ttf'), fontSize)
+        # A bounded cache of rendered text, so unchanged text is never rendered twice.
+        self.textCache = tC.TextCache(gS.textCacheSize)
+
+        # HUD widgets that only re-render when the value they show changes.
+        self.scoreText = tC.HudText(self.textCache, self.font, "Score: {}", target.point((150, 100)))
+        self.healthText = tC.HudText(self.textCache, self.font, "Health: {}", target.point((150, 150)),
+                                     color=(0, 255, 0))
+        self.ammoText = tC.HudText(self.textCache, self.font, "Ammo: {}", target.point((150, 200)),
+                                   color=(255, 200, 0))
 
     def drawText(self, surface, text, pos, color=(255, 255, 255)):
-        """A reusable helper method to draw a single line of centered text."""
-        # Step 1: Render the font into a new Surface with anti-aliasing.
-        text_surface = self.font.render(text, True, color)
+        """A reusable helper method to draw a single line of centered text at a logical position."""
+        # Step 1: Get the rendered text from the cache (rendered with anti-aliasing on a miss).
+        text_surface = self.textCache.render(self.font, text, color)
         # Step 2: Get the rectangle of the new text Surface and set its center position.
-        text_rect = text_surface.get_rect(center=pos)
+        text_rect = text_surface.get_rect(center=self.target.point(pos))
         # Step 3: Draw the text Surface onto the main display surface.
         surface.blit(text_surface, text_rect)
+        # Step 4: Return the area the text covers, for renderers that track changed areas.
+        return text_rect
 
     def draw(self, surface, score, health, ammo):
-        """Draws all UI elements, including the background and all text stats."""
-        # 1. Draw the static UI background first to ensure it's behind the text.
-        surface.blit(self.image, (0, 0))
+        """
+        Draws the score, health and ammo text.
 
-        # 2. Draw all dynamic text elements using the helper method.
+        The sidebar image itself is part of the cached background, so only the
+        dynamic text is drawn here.
 
+        Returns:
+            list: The rectangles covered by the three lines of text.
+        """
         # Display the current score, formatted as an integer.
-        score_text = f"Score: {int(score)}"
-        self.drawText(surface, score_text, (150, 100))
+        scoreRect = self.scoreText.draw(surface, int(score))
 
         # Display the player's current health with a green color.
-        health_text = f"Health: {int(health)}"
-        self.drawText(surface, health_text, (150, 150), color=(0, 255, 0))
+        healthRect = self.healthText.draw(surface, int(health))
 
         # Display the player's current ammo count with a yellow/orange color.
-        ammo_text = f"Ammo: {ammo}"
-        self.drawText(surface, ammo_text, (150, 200), color=(255, 200, 0))
+        ammoRect = self.ammoText.draw(surface, ammo)
+
+        return [scoreRect, healthRect, ammoRect]
 
 
 if __name__ == "__main__":
@@ -883,10 +1464,3 @@ if __name__ == "__main__":
 
     # Start the game loop.
     game.run()
-
-
-
-
-
-
-
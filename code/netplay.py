@@ -0,0 +1,775 @@
+# =====================================================================
+# METEOR DODGER - NETPLAY
+# =====================================================================
+# Two-player co-op over UDP. Both players run the same deterministic
+# simulation from a seed the host picks, and only exchange their inputs:
+# six bytes per player per simulation step.
+#
+#   * Input delay: a player's input is applied netplayInputDelay steps
+#     after it was read, which hides that much of the network delay.
+#   * Rollback: when the other player's input for a step hasn't arrived
+#     yet, it is predicted (the last input received, without shots). The
+#     game state is saved before every step (see worldState.py); when an
+#     input arrives that differs from its prediction, the game goes back
+#     to the saved state of that step and re-simulates up to the present,
+#     silently, within the same frame.
+#   * Every packet carries all of the sender's inputs the other player
+#     hasn't acknowledged yet, so a lost packet costs nothing as long as
+#     a later one arrives.
+#   * Time sync: a player running ahead of the other (by the measured
+#     round trip time) skips a step now and then until they are level, so
+#     neither has to roll back much further than the other.
+#   * A checksum of the confirmed game state is exchanged every second;
+#     a mismatch (a desync) is reported.
+#
+# Both players need the same settings. Injected latency, jitter and packet
+# loss (applied to outgoing packets) make it possible to try bad networks
+# with two processes on one machine.
+#
+# Usage (from the 'code' directory):
+#     python netplay.py host --port 7777
+#     python netplay.py join 192.168.1.20:7777
+#     python netplay.py test --latency 50 --loss 0.05 --ticks 2400
+#
+# 'test' starts a headless host and a headless client on localhost, both
+# played by bots in real time, and checks that they end in the same state.
+
+# --- Standard Library Imports ---
+import argparse  # Used to read the role, address and network conditions from the command line.
+import heapq  # Used to hold back outgoing packets until their injected delay has passed.
+import json  # Used to report a headless session's results to 'test'.
+import os  # Used to select SDL's dummy drivers for headless sessions.
+import random  # Used for injected packet loss, the bots and the host's seed.
+import socket  # Used for the UDP connection.
+import struct  # Used to pack and unpack packets.
+import subprocess  # Used by 'test' to run both players as separate processes.
+import sys  # Used by 'test' to start Python.
+import time  # Used for timeouts, round trip times and pacing headless sessions.
+
+# --- Third-Party Imports ---
+import pygame  # Used to keep the window responsive while waiting for the other player.
+
+# --- Local Application Imports ---
+import gameSettings as gS
+import replay as rP
+import worldState as wS
+from main import Shooter
+
+# The first bytes of every packet.
+magic = b'MD'
+# Packet types.
+packetHello = 1   # Client to host: ready to start the match in the header.
+packetStart = 2   # Host to client: the match starts, with this seed.
+packetInputs = 3  # Inputs, acknowledgements, timing and checksums.
+packetQuit = 4    # The sender left.
+
+# Header: magic, type, match, ack (the last step the sender has every input of the receiver
+# up to), the sender's current step, its clock (ms), the last clock it received and how long
+# ago it received it (ms), for the round trip time.
+headerFormat = struct.Struct('<2sBBiiHHH')
+# Before the inputs: the step of the first one and how many follow.
+runFormat = struct.Struct('<iB')
+# One input: held keys, shots fired and the mouse position (noMouse when playing with keys).
+inputFormat = struct.Struct('<BBhh')
+noMouse = -32768
+# After the inputs: a confirmed step and the checksum of the state before it (step -1 = none).
+checksumFormat = struct.Struct('<iI')
+seedFormat = struct.Struct('<I')
+
+# Inputs per packet at most; older unacknowledged ones follow in later packets.
+maxRun = 255
+# Confirmed states are checksummed every this many steps.
+checksumInterval = 120
+# Seconds between resent handshake packets.
+handshakeInterval = 0.1
+
+
+def encodeInput(tickInput):
+    """Packs one input into six bytes."""
+    mouse = tickInput.mouse
+    mouseX, mouseY = (noMouse, noMouse) if mouse is None else (round(mouse[0]), round(mouse[1]))
+    return inputFormat.pack(tickInput.keys, min(tickInput.fires, 255), mouseX, mouseY)
+
+
+def decodeInput(data, offset=0):
+    """Unpacks one input packed by encodeInput()."""
+    keys, fires, mouseX, mouseY = inputFormat.unpack_from(data, offset)
+    return rP.TickInput(keys=keys, mouse=None if mouseX == noMouse else (mouseX, mouseY), fires=fires)
+
+
+class Link:
+    """
+    A UDP socket talking to one peer, with optional injected latency, jitter
+    and packet loss on the packets it sends.
+    """
+
+    def __init__(self, port=0, peer=None, latency=0.0, jitter=0.0, loss=0.0):
+        """
+        Opens the socket.
+
+        Args:
+            port (int): The local port. 0 picks a free one.
+            peer (tuple): The (host, port) to send to. A host learns it from the first packet.
+            latency (float): Seconds every sent packet is held back.
+            jitter (float): Up to this many extra seconds, at random (packets may arrive out of order).
+            loss (float): The fraction of sent packets that are dropped.
+        """
+        self.socket = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+        self.socket.bind(('', port))
+        self.socket.setblocking(False)
+        self.peer = peer
+        self.latency = latency
+        self.jitter = jitter
+        self.loss = loss
+        # Its own random numbers, so network conditions never touch the game's streams.
+        self.random = random.Random()
+        # Held back packets: (send time, order, data).
+        self.delayed = []
+        self.order = 0
+        self.sent = 0
+        self.received = 0
+        self.dropped = 0
+
+    def send(self, data):
+        """Sends a packet to the peer, after the injected delay (or not at all, if it is lost)."""
+        self.sent += 1
+        if self.loss and self.random.random() < self.loss:
+            self.dropped += 1
+            return
+        delay = self.latency + self.jitter * self.random.random()
+        if delay <= 0:
+            self._sendNow(data)
+            return
+        self.order += 1
+        heapq.heappush(self.delayed, (time.perf_counter() + delay, self.order, data))
+
+    def _sendNow(self, data):
+        try:
+            self.socket.sendto(data, self.peer)
+        except OSError:
+            # Nobody listening (yet), or the network is down: the packet is lost like any other.
+            pass
+
+    def flush(self):
+        """Sends the held back packets whose delay has passed."""
+        now = time.perf_counter()
+        while self.delayed and self.delayed[0][0] <= now:
+            self._sendNow(heapq.heappop(self.delayed)[2])
+
+    def receive(self):
+        """Returns the packets that arrived, as a list of (data, address)."""
+        self.flush()
+        packets = []
+        while True:
+            try:
+                packets.append(self.socket.recvfrom(2048))
+            except BlockingIOError:
+                break
+            except OSError:
+                # An earlier packet was refused (the peer isn't listening); keep reading.
+                continue
+        self.received += len(packets)
+        return packets
+
+    def close(self):
+        """Sends what is still held back, then closes the socket."""
+        while self.delayed:
+            time.sleep(max(0.0, self.delayed[0][0] - time.perf_counter()))
+            self.flush()
+        self.socket.close()
+
+
+class Bot:
+    """Seeded random input, for testing without players."""
+
+    def __init__(self, seed):
+        self.random = random.Random(seed)
+        self.keys = 0
+
+    def __call__(self):
+        rng = self.random
+        # Change direction now and then, and shoot now and then.
+        if rng.random() < 0.03:
+            self.keys = rng.randrange(16)
+        return rP.TickInput(keys=self.keys, fires=int(rng.random() < 0.02))
+
+
+class RollbackSession:
+    """
+    Runs a co-op game's simulation steps for one of its two players, in step
+    with the other player's game.
+
+    The game calls advance() for every simulation step and settle() once per
+    frame (see Shooter.playFrames()).
+    """
+
+    def __init__(self, game, link, playerIndex, seed, inputDelay=None, maxRollback=None, readInput=None):
+        """
+        Initializes the session and starts the first match.
+
+        Args:
+            game (Shooter): A game with two players.
+            link (Link): The connection to the other player, after the handshake (see connect()).
+            playerIndex (int): 0 for the host, 1 for the client.
+            seed (int): The seed both players agreed on.
+            inputDelay (int): Steps between reading an input and applying it. Defaults to the setting.
+            maxRollback (int): The most steps to predict. Defaults to the setting.
+            readInput (callable): Returns the local player's replay.TickInput. Defaults to game.readInput.
+        """
+        self.game = game
+        self.link = link
+        self.playerIndex = playerIndex
+        self.seed = seed
+        self.inputDelay = gS.netplayInputDelay if inputDelay is None else inputDelay
+        self.maxRollback = gS.netplayMaxRollback if maxRollback is None else maxRollback
+        self.timeout = gS.netplayTimeout
+        self.readLocal = game.readInput if readInput is None else readInput
+        self.stepTime = 1 / gS.simulationRate
+        self.match = 0
+        self.peerQuit = False
+        # The clock packets are timestamped with, and the smoothed round trip time.
+        self.epoch = time.perf_counter()
+        self.rtt = 0.0
+        self.stats = {'rollbacks': 0, 'resimulated': 0, 'deepest': 0, 'waits': 0, 'syncStalls': 0,
+                      'desyncs': 0, 'checksums': 0}
+
+        game.netplay = self
+        game.localPlayer = game.players[playerIndex]
+        game.inputSource = self.tickInputs
+        self.begin()
+
+    def matchSeed(self):
+        """Returns the seed of the current match; rematches derive theirs from the first."""
+        return (self.seed + self.match * 0x9E3779B1) & 0xFFFFFFFF
+
+    def begin(self):
+        """Resets the game and every step counter for a new match."""
+        self.game.reset(self.matchSeed())
+        delay = self.inputDelay
+        # The next step to simulate, and the step being simulated.
+        self.tick = 0
+        self.simTick = 0
+        # Inputs by step. The first 'delay' steps have no input on either side.
+        self.localInputs = {tick: rP.TickInput() for tick in range(delay)}
+        self.remoteInputs = {tick: rP.TickInput() for tick in range(delay)}
+        self.latestLocal = delay - 1
+        self.oldestLocal = 0
+        self.oldestRemote = 0
+        # Every remote input up to remoteConfirmed has arrived, and the peer has every local
+        # input up to peerAck.
+        self.remoteConfirmed = delay - 1
+        self.peerAck = delay - 1
+        # The remote inputs that were guessed, by step, to compare when the real ones arrive.
+        self.predicted = {}
+        # The state before each step that may still be rolled back to.
+        self.states = {}
+        self.oldestState = 0
+        # The other player's step when its last packet was sent, and when that packet arrived.
+        self.remoteTick = 0
+        self.remoteTickAt = time.perf_counter()
+        # The last clock received from the peer, for it to measure the round trip time.
+        self.echo = None
+        self.echoAt = 0.0
+        self.lastHeard = time.perf_counter()
+        self.lastSend = 0.0
+        # Checksums of confirmed states, by step: ours, and the latest one from the peer.
+        self.checksums = {}
+        self.localChecksum = (-1, 0)
+        self.peerChecksums = {}
+
+    @property
+    def settled(self):
+        """True when every step simulated so far used real inputs, and the peer has all of ours."""
+        last = self.tick - 1
+        return self.peerQuit or (self.remoteConfirmed >= last and self.peerAck >= last)
+
+    def tickInputs(self):
+        """
+        The game's input source: both players' inputs for the step being simulated.
+
+        Returns:
+            tuple: One replay.TickInput per player, in player order.
+        """
+        tick = self.simTick
+        local = self.localInputs[tick]
+        remote = self.remoteInputs.get(tick)
+        if remote is None:
+            # Predict that the other player keeps doing what they did last, without shooting.
+            last = self.remoteInputs.get(self.remoteConfirmed)
+            remote = rP.TickInput() if last is None else rP.TickInput(keys=last.keys, mouse=last.mouse)
+            self.predicted[tick] = remote
+        return (local, remote) if self.playerIndex == 0 else (remote, local)
+
+    def advance(self, dt):
+        """
+        Runs one simulation step, unless this player is too far ahead of the other.
+
+        Args:
+            dt (float): The time in seconds simulated by the step.
+        """
+        self.stepTime = dt
+        self.update()
+        if self.game.gameOver or not self.game.running:
+            return
+
+        # 1. Wait while the other player's inputs are too far behind to predict.
+        if self.tick - self.remoteConfirmed > self.maxRollback:
+            self.stats['waits'] += 1
+            self.send()
+            return
+        # 2. Skip a step while running ahead of the other player, to even out the rollbacks.
+        if self.advantage() >= 2:
+            self.stats['syncStalls'] += 1
+            self.send()
+            return
+
+        # 3. Read the local input for the step inputDelay steps from now, and send it.
+        # It goes through the packet format, so both games apply exactly the same input.
+        self.latestLocal = self.tick + self.inputDelay
+        self.localInputs[self.latestLocal] = decodeInput(encodeInput(self.readLocal()))
+        self.send()
+
+        # 4. Save the state and simulate.
+        self.simulate()
+
+    def settle(self):
+        """Takes in the packets that arrived and corrects mispredictions, without advancing."""
+        self.update()
+        if time.perf_counter() - self.lastSend >= self.stepTime:
+            self.send()
+
+    def finish(self):
+        """
+        Sends the last acknowledgements a few times before the game leaves the play scene,
+        since nothing is sent while the game over screen is shown.
+        """
+        for _ in range(3):
+            self.send()
+        self.link.flush()
+
+    def advantage(self):
+        """Returns how many steps this player is ahead of the other one (negative when behind)."""
+        elapsed = time.perf_counter() - self.remoteTickAt + self.rtt / 2
+        return self.tick - (self.remoteTick + elapsed / self.stepTime)
+
+    def simulate(self):
+        """Saves the state before the next step, then runs the step."""
+        self.states[self.tick] = wS.capture(self.game)
+        self.simTick = self.tick
+        self.game.step(self.stepTime)
+        self.tick += 1
+
+    def update(self):
+        """Receives packets, rolls back to the first mispredicted step and forgets confirmed history."""
+        rollbackTick = self.receive()
+        if rollbackTick is not None:
+            self.rollback(rollbackTick)
+        self.forget()
+        if time.perf_counter() - self.lastHeard > self.timeout and not self.peerQuit:
+            print(f"Warning: Nothing heard from the other player for {self.timeout:g} seconds; leaving.")
+            self.peerQuit = True
+            self.game.running = False
+
+    def rollback(self, tick):
+        """
+        Puts the game back to the state before a mispredicted step and re-simulates up to the present.
+
+        Args:
+            tick (int): The first step that used a wrong prediction.
+        """
+        game = self.game
+        end = self.tick
+        wS.restore(game, self.states[tick])
+        for predicted in range(tick, end):
+            self.predicted.pop(predicted, None)
+
+        # The steps were heard the first time; re-simulating them is silent.
+        self.tick = tick
+        game.sfx.muted = True
+        try:
+            while self.tick < end and not game.gameOver:
+                self.simulate()
+        finally:
+            game.sfx.muted = False
+        # A game that now ends earlier drops the states after its end.
+        for stale in range(self.tick, end):
+            self.states.pop(stale, None)
+
+        stats = self.stats
+        stats['rollbacks'] += 1
+        stats['resimulated'] += end - tick
+        stats['deepest'] = max(stats['deepest'], end - tick)
+
+    def forget(self):
+        """Drops the states and inputs that can no longer be rolled back to, checksumming some states."""
+        # States before the first step that may still be mispredicted are final.
+        final = min(self.remoteConfirmed + 1, self.tick)
+        while self.oldestState < final:
+            state = self.states.pop(self.oldestState, None)
+            if state is not None and self.oldestState % checksumInterval == 0:
+                self.check(self.oldestState, wS.checksum(state))
+            self.oldestState += 1
+        while self.oldestLocal < min(self.peerAck + 1, final):
+            self.localInputs.pop(self.oldestLocal, None)
+            self.oldestLocal += 1
+        # The last confirmed remote input is kept for predictions.
+        while self.oldestRemote < min(self.remoteConfirmed, final):
+            self.remoteInputs.pop(self.oldestRemote, None)
+            self.oldestRemote += 1
+
+    def check(self, tick, localChecksum):
+        """Records a confirmed state's checksum and compares it with the peer's, once both are known."""
+        self.localChecksum = (tick, localChecksum)
+        peerChecksum = self.peerChecksums.pop(tick, None)
+        if peerChecksum is None:
+            self.checksums[tick] = localChecksum
+        else:
+            self.compare(tick, localChecksum, peerChecksum)
+
+    def compare(self, tick, localChecksum, peerChecksum):
+        """Reports a desync if both games' checksums of the same confirmed state differ."""
+        self.stats['checksums'] += 1
+        if localChecksum != peerChecksum:
+            self.stats['desyncs'] += 1
+            print(f"Warning: The games went out of sync at step {tick} "
+                  f"({localChecksum:08x} here, {peerChecksum:08x} there).")
+
+    def clock(self, now):
+        """Returns a packet timestamp: milliseconds since the session started, wrapped to 16 bits."""
+        return int((now - self.epoch) * 1000) & 0xFFFF
+
+    def packet(self, kind, now):
+        """Returns a packet header of the given type."""
+        echo, hold = 0xFFFF, 0
+        if self.echo is not None:
+            echo, hold = self.echo, min(int((now - self.echoAt) * 1000), 0xFFFF)
+        return headerFormat.pack(magic, kind, self.match, self.remoteConfirmed, self.tick,
+                                 self.clock(now), echo, hold)
+
+    def send(self):
+        """Sends every local input the peer hasn't acknowledged, and the latest checksum."""
+        now = time.perf_counter()
+        self.lastSend = now
+        first = self.peerAck + 1
+        count = min(self.latestLocal - first + 1, maxRun)
+        localInputs = self.localInputs
+        data = [self.packet(packetInputs, now), runFormat.pack(first, max(count, 0))]
+        data.extend(encodeInput(localInputs[tick]) for tick in range(first, first + count))
+        data.append(checksumFormat.pack(*self.localChecksum))
+        self.link.send(b''.join(data))
+
+    def receive(self):
+        """
+        Takes in the packets that arrived.
+
+        Returns:
+            int | None: The first step simulated with a wrong prediction, if any.
+        """
+        rollbackTick = None
+        now = time.perf_counter()
+        for data, address in self.link.receive():
+            if address != self.link.peer or len(data) < headerFormat.size:
+                continue
+            packetMagic, kind, match, ack, tick, sent, echo, hold = headerFormat.unpack_from(data)
+            if packetMagic != magic:
+                continue
+            self.lastHeard = now
+            if kind == packetQuit:
+                self.peerQuit = True
+                continue
+            # A client that missed the start of the match asks again.
+            if kind == packetHello and match == self.match and self.playerIndex == 0:
+                self.link.send(self.startPacket(now))
+                continue
+            if kind != packetInputs or match != self.match:
+                continue
+
+            # 1. Timing: the peer's step, and the round trip time from our echoed clock.
+            if tick >= self.remoteTick:
+                self.remoteTick, self.remoteTickAt = tick, now
+            self.peerAck = max(self.peerAck, ack)
+            if echo != 0xFFFF:
+                sample = ((self.clock(now) - echo) & 0xFFFF) - hold
+                if 0 <= sample < 10000:
+                    self.rtt = sample / 1000 if not self.rtt else self.rtt * 0.9 + sample / 10000
+            self.echo, self.echoAt = sent, now
+
+            # 2. Inputs, compared with what was predicted for steps already simulated.
+            try:
+                first, count = runFormat.unpack_from(data, headerFormat.size)
+                offset = headerFormat.size + runFormat.size
+                for tick in range(first, first + count):
+                    if tick > self.remoteConfirmed and tick not in self.remoteInputs:
+                        remote = decodeInput(data, offset)
+                        self.remoteInputs[tick] = remote
+                        guess = self.predicted.pop(tick, None)
+                        if guess is not None and guess != remote:
+                            rollbackTick = tick if rollbackTick is None else min(rollbackTick, tick)
+                    offset += inputFormat.size
+                checkTick, peerChecksum = checksumFormat.unpack_from(data, offset)
+            except struct.error:
+                continue
+
+            # 3. The peer's latest checksum.
+            if checkTick >= 0:
+                localChecksum = self.checksums.pop(checkTick, None)
+                if localChecksum is not None:
+                    self.compare(checkTick, localChecksum, peerChecksum)
+                elif checkTick >= self.oldestState:
+                    self.peerChecksums[checkTick] = peerChecksum
+
+        while self.remoteConfirmed + 1 in self.remoteInputs:
+            self.remoteConfirmed += 1
+        return rollbackTick
+
+    def startPacket(self, now):
+        """Returns the host's packet that starts the current match."""
+        return self.packet(packetStart, now) + seedFormat.pack(self.seed)
+
+    def rematch(self):
+        """
+        Starts the next match once both players are ready. Blocks until then.
+
+        Returns:
+            bool: True when the match started, False if either player left.
+        """
+        self.match = (self.match + 1) & 0xFF
+        if handshake(self.link, self.playerIndex == 0, self.match, self.seed) is None:
+            return False
+        self.peerQuit = False
+        self.begin()
+        return True
+
+    def close(self):
+        """Tells the other player this one left, and closes the connection."""
+        now = time.perf_counter()
+        for _ in range(3):
+            self.link.send(self.packet(packetQuit, now))
+        self.link.close()
+
+    def summary(self):
+        """Returns the session's counters, the round trip time and the link's packet counts."""
+        link = self.link
+        return dict(self.stats, tick=self.tick, rttMs=round(self.rtt * 1000, 1), sent=link.sent,
+                    received=link.received, dropped=link.dropped)
+
+
+def handshake(link, isHost, match, seed=None):
+    """
+    Waits until both players are ready to start a match.
+
+    The client sends 'hello' until the host answers with 'start' (or its first inputs
+    of the match arrive); the host waits for a 'hello' and answers it.
+
+    Args:
+        link (Link): The connection. A host without a peer yet takes the first client that says hello.
+        isHost (bool): Whether this is the host.
+        match (int): The match number (0 for the first).
+        seed (int): The host's seed.
+
+    Returns:
+        int | None: The seed of the first match (as sent by the host), or None if the wait was
+            abandoned (the window was closed, or the other player left).
+    """
+    nextHello = 0.0
+    while True:
+        if pygame.get_init() and pygame.event.get(pygame.QUIT):
+            return None
+        now = time.perf_counter()
+        if not isHost and now >= nextHello:
+            link.send(headerFormat.pack(magic, packetHello, match, -1, 0, 0, 0xFFFF, 0))
+            nextHello = now + handshakeInterval
+
+        for data, address in link.receive():
+            if len(data) < headerFormat.size:
+                continue
+            packetMagic, kind, packetMatch, *_ = headerFormat.unpack_from(data)
+            if packetMagic != magic or (link.peer is not None and address != link.peer):
+                continue
+            if kind == packetQuit:
+                return None
+            if packetMatch != match:
+                continue
+            if isHost and kind == packetHello:
+                link.peer = address
+                link.send(headerFormat.pack(magic, packetStart, match, -1, 0, 0, 0xFFFF, 0)
+                          + seedFormat.pack(seed))
+                return seed
+            if not isHost and kind == packetStart:
+                return seedFormat.unpack_from(data, headerFormat.size)[0]
+            # In a rematch the seed is known, so the host's first inputs also mean it started.
+            if not isHost and kind == packetInputs and seed is not None:
+                return seed
+        time.sleep(0.002)
+
+
+def runHeadless(session, ticks, linger=1.0):
+    """
+    Plays a session without a window, in real time, for a number of steps or until the game ends.
+
+    Args:
+        session (RollbackSession): The session.
+        ticks (int): The number of steps to simulate.
+        linger (float): Seconds to keep answering the peer afterwards, so it can finish too.
+
+    Returns:
+        dict: The session's counters, the frame costs (ms) and, if it finished, the final state's checksum.
+    """
+    game = session.game
+    stepTime = session.stepTime
+    frameTime = 1 / gS.fps
+    accumulator = 0.0
+    costs = []
+    last = time.perf_counter()
+    nextFrame = last
+    settledAt = None
+    result = None
+    while game.running:
+        # 1. Wait for the next frame, like the game's clock would.
+        nextFrame += frameTime
+        time.sleep(max(0.0, nextFrame - time.perf_counter()))
+        now = time.perf_counter()
+        accumulator += min(now - last, gS.maxFrameTime)
+        last = now
+
+        # 2. The frame's steps.
+        while accumulator >= stepTime and session.tick < ticks and not game.gameOver and game.running:
+            session.advance(stepTime)
+            accumulator -= stepTime
+        session.settle()
+        costs.append((time.perf_counter() - now) * 1000)
+
+        # 3. Done once every step is final, after giving the peer time to finish too.
+        finished = session.tick >= ticks or game.gameOver
+        if finished and session.settled:
+            if settledAt is None:
+                settledAt = now
+                result = session.summary()
+                result['checksum'] = wS.checksum(wS.capture(game))
+                result['gameTime'] = game.gameTime
+            if session.peerQuit or now - settledAt >= linger:
+                break
+        elif settledAt is not None:
+            settledAt = None
+
+    if result is None:
+        result = session.summary()
+    costs.sort()
+    result['frameMs'] = {'p50': round(costs[len(costs) // 2], 3), 'p99': round(costs[len(costs) * 99 // 100], 3),
+                         'max': round(costs[-1], 3)}
+    return result
+
+
+def connect(game, args):
+    """
+    Opens the connection described by the command line and waits for the other player.
+
+    Returns:
+        RollbackSession | None: The session, or None if the wait was abandoned.
+    """
+    latency, jitter = args.latency / 1000, args.jitter / 1000
+    if args.role == 'host':
+        link = Link(args.port, latency=latency, jitter=jitter, loss=args.loss)
+        print(f"Waiting for the other player on port {args.port}...")
+        seed = args.seed if args.seed is not None else random.randrange(2 ** 32)
+        playerIndex = 0
+    else:
+        host, _, port = args.address.rpartition(':')
+        if not host:
+            host, port = port, gS.netplayPort
+        link = Link(peer=(socket.gethostbyname(host), int(port)), latency=latency, jitter=jitter, loss=args.loss)
+        print(f"Connecting to {host}:{port}...")
+        seed = None
+        playerIndex = 1
+
+    seed = handshake(link, playerIndex == 0, 0, seed)
+    if seed is None:
+        link.close()
+        return None
+    # Headless players without a bot stand still.
+    readInput = Bot(playerIndex) if args.bot else (rP.TickInput if args.headless else None)
+    return RollbackSession(game, link, playerIndex, seed, inputDelay=args.delay, readInput=readInput)
+
+
+def runTest(args):
+    """Runs a headless host and client on localhost and checks that they end in the same state."""
+    conditions = ['--latency', str(args.latency), '--jitter', str(args.jitter), '--loss', str(args.loss),
+                  '--ticks', str(args.ticks), '--headless', '--bot']
+    if args.delay is not None:
+        conditions += ['--delay', str(args.delay)]
+    command = [sys.executable, os.path.abspath(__file__)]
+    seed = args.seed if args.seed is not None else 0
+    players = [
+        subprocess.Popen(command + ['host', '--port', str(args.port), '--seed', str(seed)] + conditions,
+                         stdout=subprocess.PIPE, text=True),
+        subprocess.Popen(command + ['join', f'127.0.0.1:{args.port}'] + conditions,
+                         stdout=subprocess.PIPE, text=True),
+    ]
+
+    results = []
+    for name, process in zip(('host', 'client'), players):
+        output, _ = process.communicate()
+        result = None
+        for line in output.splitlines():
+            if line.startswith('result '):
+                result = json.loads(line[len('result '):])
+            elif line.startswith('Warning'):
+                print(f"{name}: {line}")
+        print(f"{name}: {result}")
+        results.append(result)
+
+    if None in results or not all('checksum' in result for result in results):
+        print("FAILED: a player did not finish.")
+        return 1
+    host, client = results
+    if (host['tick'], host['checksum']) != (client['tick'], client['checksum']) or host['desyncs']:
+        print("FAILED: the games ended in different states.")
+        return 1
+    print(f"OK: both games ended at step {host['tick']} with checksum {host['checksum']:08x}.")
+    return 0
+
+
+def main(argv=None):
+    """Command-line entry point: hosts, joins or tests a co-op game."""
+    parser = argparse.ArgumentParser(description="Play Meteor Dodger co-op over the network.")
+    parser.add_argument('role', choices=('host', 'join', 'test'))
+    parser.add_argument('address', nargs='?', help="The host's address, as HOST[:PORT] (join only).")
+    parser.add_argument('--port', type=int, default=gS.netplayPort, help="The host's UDP port.")
+    parser.add_argument('--seed', type=int, help="The first match's seed (host only). Random by default.")
+    parser.add_argument('--delay', type=int, help="Input delay in steps. Defaults to netplayInputDelay.")
+    parser.add_argument('--latency', type=float, default=0.0, help="Injected one-way latency (ms).")
+    parser.add_argument('--jitter', type=float, default=0.0, help="Injected extra random latency, up to (ms).")
+    parser.add_argument('--loss', type=float, default=0.0, help="Injected packet loss, as a fraction.")
+    parser.add_argument('--headless', action='store_true', help="Run without a window (with --bot).")
+    parser.add_argument('--bot', action='store_true', help="Play with seeded random input.")
+    parser.add_argument('--ticks', type=int, default=2400, help="Steps to play headlessly.")
+    args = parser.parse_args(argv)
+
+    if args.role == 'test':
+        return runTest(args)
+    if args.role == 'join' and not args.address:
+        parser.error("join needs the host's address")
+
+    if args.headless:
+        # SDL reads these when pygame is initialized, so they must be set before the game starts.
+        os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+        os.environ.setdefault('SDL_AUDIODRIVER', 'dummy')
+    if not args.headless:
+        pygame.display.set_mode(gS.screenSize)
+    game = Shooter(headless=args.headless, players=2)
+
+    session = connect(game, args)
+    if session is None:
+        return 1
+    try:
+        if args.headless:
+            print('result ' + json.dumps(runHeadless(session, args.ticks)), flush=True)
+        else:
+            game.run()
+    finally:
+        session.close()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,118 @@
+# =====================================================================
+# METEOR DODGER - OBJECT POOLS
+# =====================================================================
+# Keeps free lists of sprites that are spawned and destroyed constantly
+# (meteors, lasers and pickups). A sprite that leaves the screen or is hit
+# goes back to its pool instead of being thrown away, and the next spawn
+# reuses it, so steady-state play does not allocate a new object per spawn.
+
+# --- Standard Library Imports ---
+from abc import ABC, abstractmethod  # Used to require reset() from every pooled class.
+
+
+class Pooled(ABC):
+    """
+    A mixin for sprites that live in an ObjectPool.
+
+    It must come before pygame.sprite.Sprite in the class bases. Calling
+    kill() removes the sprite from its groups as usual and then returns it
+    to the pool it came from. Pooled classes must implement reset(), which
+    the pool calls with the spawn arguments every time the object is reused.
+    """
+
+    # The pool this object returns to when it is killed (None = not pooled).
+    pool = None
+
+    def kill(self):
+        """Removes the sprite from all groups and releases it back to its pool."""
+        # Only live sprites are released, so killing twice can't free an object twice.
+        if not self.alive():
+            return
+        super().kill()
+        if self.pool is not None:
+            self.pool.release(self)
+
+    @abstractmethod
+    def reset(self, *args):
+        """Re-initializes the object for a new spawn, with the arguments given to acquire()."""
+
+
+class ObjectPool:
+    """
+    A pre-sized free list of reusable objects of one type.
+
+    Objects are created by a factory function, either up front when the pool
+    is filled or on demand when the free list runs out. acquire() always calls
+    the object's reset() method so a reused object behaves exactly like a
+    newly constructed one.
+    """
+
+    def __init__(self, factory, size=0):
+        """
+        Initializes the pool and pre-fills its free list.
+
+        Args:
+            factory (callable): Creates a new object when called with no arguments.
+            size (int): The number of objects to create up front.
+        """
+        self.factory = factory
+        # Objects ready to be handed out.
+        self.free = []
+
+        # --- Statistics ---
+        self.created = 0             # Total objects ever created by this pool.
+        self.inUse = 0               # Objects currently handed out.
+        self.highWater = 0           # The largest number of objects in use at once.
+        self.allocationsAvoided = 0  # Acquires that reused a free object.
+
+        self.fill(size)
+
+    def fill(self, size):
+        """Creates objects until the pool holds at least 'size' of them in total."""
+        while self.created < size:
+            self.free.append(self._create())
+
+    def _create(self):
+        """Creates a new object and links it back to this pool."""
+        obj = self.factory()
+        obj.pool = self
+        self.created += 1
+        return obj
+
+    def acquire(self, *args):
+        """
+        Hands out an object, reusing a free one when possible.
+
+        Args:
+            *args: Passed to the object's reset() method.
+
+        Returns:
+            object: The reset object, ready to use.
+        """
+        if self.free:
+            obj = self.free.pop()
+            self.allocationsAvoided += 1
+        else:
+            obj = self._create()
+
+        obj.reset(*args)
+
+        self.inUse += 1
+        if self.inUse > self.highWater:
+            self.highWater = self.inUse
+        return obj
+
+    def release(self, obj):
+        """Returns an object to the free list so it can be reused."""
+        self.free.append(obj)
+        self.inUse -= 1
+
+    def stats(self):
+        """Returns a dictionary with the pool's size and usage counters."""
+        return {
+            'size': self.created,
+            'free': len(self.free),
+            'inUse': self.inUse,
+            'highWater': self.highWater,
+            'allocationsAvoided': self.allocationsAvoided,
+        }
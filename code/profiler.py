@@ -0,0 +1,254 @@
+# =====================================================================
+# METEOR DODGER - FRAME PROFILER
+# =====================================================================
+# Times every phase of a frame (spawning, input, sprite updates,
+# collisions, drawing, capturing and presenting) into a fixed-size ring
+# buffer, so the source of a frame-time spike can be seen instead of
+# guessed. The recorded frames can be shown in an on-screen overlay
+# (frame-time graph, p50/p99 and entity counts, toggled with F3) and
+# exported to CSV.
+#
+# When the profiler is disabled every call returns after a single
+# attribute check, so leaving the calls in the game loop costs next to
+# nothing.
+
+# --- Standard Library Imports ---
+import csv  # Used to export the recorded frames.
+import os  # Used to create the folder the CSV file is written into.
+from array import array  # Used for the compact, preallocated ring buffer columns.
+from time import perf_counter  # Used for high-resolution timestamps.
+
+# --- Third-Party Imports ---
+import pygame  # Used to draw the overlay.
+
+# --- Local Application Imports ---
+import gameSettings as gS
+
+# The timed phases of a frame, in the order they happen.
+phases = ('spawn', 'events', 'update', 'collision', 'draw', 'capture', 'present')
+# The entity counts recorded with every frame.
+counters = ('meteors', 'lasers', 'pickups')
+
+
+def percentile(values, fraction):
+    """
+    Returns the nearest-rank percentile of a list of numbers.
+
+    Args:
+        values (list): The numbers. They don't need to be sorted.
+        fraction (float): The percentile as a fraction (e.g., 0.99 for p99).
+
+    Returns:
+        float: The percentile, or 0.0 for an empty list.
+    """
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, max(0, int(round(fraction * len(ordered))) - 1))
+    return ordered[index]
+
+
+class FrameProfiler:
+    """
+    Records per-phase frame timings in a ring buffer.
+
+    A frame is timed by calling beginFrame(), then lap(phase) at the end of
+    each phase, then endFrame(). The time since the previous mark is added to
+    the phase, so a phase that runs several times per frame (e.g., one
+    simulation step per lap) is summed. Only the most recent 'capacity'
+    frames are kept.
+    """
+
+    def __init__(self, counter=None, capacity=gS.profilerFrames, enabled=False, details=None):
+        """
+        Initializes the profiler.
+
+        Args:
+            counter (callable): Called at the end of each recorded frame; returns one
+                number per entry in 'counters' (e.g., the number of meteors).
+            capacity (int): The number of frames kept in the ring buffer.
+            enabled (bool): Whether frames are recorded from the start.
+            details (callable): Called when the overlay text is refreshed; returns more lines
+                to show below the timings (e.g., input latency).
+        """
+        self.counter = counter
+        self.details = details
+        self.capacity = capacity
+        self.enabled = enabled
+        # Whether the overlay is shown. Showing it also turns recording on.
+        self.overlay = False
+        # Recording stays on while the overlay is hidden only if it was requested up front.
+        self.keepRecording = enabled
+
+        # 1. The ring buffer: one preallocated column per phase, the frame total and each counter.
+        self.columns = {name: array('d', bytes(8 * capacity)) for name in phases + ('total',) + counters}
+        self.phaseIndex = {name: index for index, name in enumerate(phases)}
+        self.next = 0       # The slot the next frame is written to.
+        self.count = 0      # The number of valid slots.
+        self.frames = 0     # The number of frames recorded since the profiler was created.
+
+        # 2. The frame being timed.
+        self.current = [0.0] * len(phases)
+        self.frameStart = 0.0
+        self.last = 0.0
+
+        # 3. Overlay state: the rendered statistics text is only refreshed a few times per second.
+        self.font = None
+        self.statLines = []
+        self.statsFrame = -1
+
+    def setEnabled(self, enabled):
+        """Turns recording on or off. The overlay is hidden when recording stops."""
+        self.enabled = enabled
+        self.keepRecording = enabled
+        if not enabled:
+            self.overlay = False
+
+    def toggleOverlay(self):
+        """Shows or hides the overlay. Recording runs while the overlay is visible."""
+        self.overlay = not self.overlay
+        self.enabled = self.overlay or self.keepRecording
+
+    def beginFrame(self):
+        """Starts timing a new frame."""
+        if not self.enabled:
+            return
+        now = perf_counter()
+        self.frameStart = now
+        self.last = now
+        current = self.current
+        for index in range(len(current)):
+            current[index] = 0.0
+
+    def lap(self, phase):
+        """
+        Ends a phase: the time since the previous mark is added to it.
+
+        Args:
+            phase (str): One of the names in 'phases'.
+        """
+        if not self.enabled:
+            return
+        now = perf_counter()
+        self.current[self.phaseIndex[phase]] += now - self.last
+        self.last = now
+
+    def endFrame(self):
+        """Stores the timed frame (in milliseconds) and the entity counts in the ring buffer."""
+        if not self.enabled:
+            return
+        slot = self.next
+        columns = self.columns
+        for name, seconds in zip(phases, self.current):
+            columns[name][slot] = seconds * 1000
+        columns['total'][slot] = (perf_counter() - self.frameStart) * 1000
+        if self.counter is not None:
+            for name, value in zip(counters, self.counter()):
+                columns[name][slot] = value
+
+        self.next = (slot + 1) % self.capacity
+        self.count = min(self.count + 1, self.capacity)
+        self.frames += 1
+
+    def history(self, name):
+        """Returns the recorded values of one column, oldest frame first."""
+        column = self.columns[name]
+        if self.count < self.capacity:
+            return column[:self.count].tolist()
+        return column[self.next:].tolist() + column[:self.next].tolist()
+
+    def stats(self):
+        """Returns the p50 and p99 of the frame total and of every phase, in milliseconds."""
+        result = {}
+        for name in ('total',) + phases:
+            values = self.history(name)
+            result[name] = {'p50': percentile(values, 0.50), 'p99': percentile(values, 0.99)}
+        result['frames'] = self.count
+        return result
+
+    def exportCsv(self, filePath):
+        """
+        Writes every recorded frame to a CSV file, oldest first.
+
+        Args:
+            filePath (str): The file to write. Its folder is created if needed.
+
+        Returns:
+            int: The number of frames written.
+        """
+        folder = os.path.dirname(filePath)
+        if folder:
+            os.makedirs(folder, exist_ok=True)
+
+        names = ('total',) + phases + counters
+        columns = [self.history(name) for name in names]
+        firstFrame = self.frames - self.count
+        with open(filePath, 'w', newline='') as f:
+            writer = csv.writer(f)
+            writer.writerow(['frame'] + [f'{name}_ms' for name in ('total',) + phases] + list(counters))
+            for offset, row in enumerate(zip(*columns)):
+                timings = [f'{value:.4f}' for value in row[:len(phases) + 1]]
+                counts = [int(value) for value in row[len(phases) + 1:]]
+                writer.writerow([firstFrame + offset] + timings + counts)
+        return self.count
+
+    def drawOverlay(self, surface):
+        """
+        Draws the frame-time graph and statistics panel.
+
+        Args:
+            surface (pygame.Surface): The surface to draw on.
+
+        Returns:
+            pygame.Rect | None: The area covered by the panel, or None if the overlay is hidden.
+        """
+        if not self.overlay:
+            return None
+
+        width, height = gS.profilerOverlaySize
+        panel = pygame.Rect(0, 0, width, height)
+        panel.topright = (surface.get_width() - 10, 10)
+        surface.fill((0, 0, 0), panel)
+
+        # 1. The frame-time graph: one point per frame, scaled so the top is two frame budgets.
+        budget = 1000 / gS.fps
+        graph = pygame.Rect(panel.left + 5, panel.top + 5, width - 10, height // 2)
+        scale = graph.height / (budget * 2)
+        budgetY = graph.bottom - budget * scale
+        pygame.draw.line(surface, (90, 90, 90), (graph.left, budgetY), (graph.right, budgetY))
+
+        totals = self.history('total')[-graph.width:]
+        if len(totals) > 1:
+            points = [
+                (graph.left + index, graph.bottom - min(value * scale, graph.height))
+                for index, value in enumerate(totals)
+            ]
+            pygame.draw.lines(surface, (0, 255, 0), False, points)
+
+        # 2. The statistics text, re-rendered twice per second instead of every frame.
+        if self.font is None:
+            self.font = pygame.font.Font(None, 20)
+        if self.frames - self.statsFrame >= gS.fps // 2 or not self.statLines:
+            self.statsFrame = self.frames
+            self.statLines = [self.font.render(line, True, (255, 255, 255)) for line in self._statText()]
+
+        y = graph.bottom + 5
+        for line in self.statLines:
+            surface.blit(line, (panel.left + 5, y))
+            y += line.get_height()
+        return panel
+
+    def _statText(self):
+        """Returns the lines of text shown under the graph."""
+        stats = self.stats()
+        total = stats['total']
+        lines = [f"frame  p50 {total['p50']:.2f} ms   p99 {total['p99']:.2f} ms"]
+        for name in phases:
+            lines.append(f"{name:<10} p50 {stats[name]['p50']:.2f}   p99 {stats[name]['p99']:.2f}")
+        if self.count:
+            slot = (self.next - 1) % self.capacity
+            counts = ', '.join(f"{name} {int(self.columns[name][slot])}" for name in counters)
+            lines.append(counts)
+        if self.details is not None:
+            lines.extend(self.details())
+        return lines
@@ -0,0 +1,167 @@
+# =====================================================================
+# METEOR DODGER - RENDER TARGET
+# =====================================================================
+# The game's logic always works in logical coordinates: screenSize from
+# gameSettings.py (1920x1080). Frames, however, are drawn at the internal
+# render resolution (renderSize), which may be smaller, and shown in a
+# window of its own size (windowSize).
+#
+# RenderTarget owns the window and the surface frames are drawn on, and
+# converts logical positions, rectangles and images to render resolution.
+# Images are scaled once and cached, so drawing a scaled frame costs the
+# same blits as an unscaled one, over fewer pixels. When the window size
+# differs from the render size, the frame is stretched to the window by
+# SDL's renderer (the SCALED display mode) on the GPU, letterboxed if the
+# aspect ratios differ; mouse positions are mapped back by SDL.
+#
+# Gameplay, movement and hitboxes never see the render resolution, so a
+# run plays out identically at every resolution.
+
+# --- Standard Library Imports ---
+import os  # Used to pass the scaling filter to SDL.
+import weakref  # Used to cache scaled images without keeping their originals alive.
+
+# --- Third-Party Imports ---
+import pygame  # Used for the window, the display surface and scaling images.
+
+# --- Local Application Imports ---
+import gameSettings as gS
+
+# The SDL scaling hint value for each 'renderFilter' setting.
+sdlFilters = {'nearest': 'nearest', 'smooth': 'linear'}
+
+
+class RenderTarget:
+    """The window, the surface frames are drawn on, and the logical-to-render coordinate mapping."""
+
+    def __init__(self, renderSize=None, windowSize=None, renderFilter=gS.renderFilter):
+        """
+        Opens the game window.
+
+        Args:
+            renderSize (tuple): The (width, height) frames are drawn at. None = screenSize.
+            windowSize (tuple): The (width, height) of the window. None = screenSize.
+            renderFilter (str): How images and frames are scaled: 'smooth' or 'nearest'.
+
+        Raises:
+            ValueError: If renderFilter is not one of the known filters.
+        """
+        if renderFilter not in sdlFilters:
+            raise ValueError(f"Unknown renderFilter {renderFilter!r}, expected one of {sorted(sdlFilters)}")
+        self.logicalSize = tuple(gS.screenSize)
+        self.renderSize = tuple(renderSize or self.logicalSize)
+        self.windowSize = tuple(windowSize or self.logicalSize)
+        self.smooth = renderFilter == 'smooth'
+
+        # 1. The factors from logical to render coordinates.
+        self.scaleX = self.renderSize[0] / self.logicalSize[0]
+        self.scaleY = self.renderSize[1] / self.logicalSize[1]
+        # True when drawing has to convert coordinates and images at all.
+        self.scaled = self.renderSize != self.logicalSize
+
+        # 2. The window. A window larger (or smaller) than the render size is scaled by SDL.
+        self.surface = self._openWindow()
+
+        # 3. Scaled copies of images, keyed by the original image.
+        self.images = weakref.WeakKeyDictionary()
+
+    def _openWindow(self):
+        """Sets the display mode and returns the surface frames are drawn on."""
+        if self.windowSize == self.renderSize:
+            return pygame.display.set_mode(self.renderSize)
+
+        # The filter hint has to be set before the scaled display (and its texture) is created.
+        os.environ['SDL_RENDER_SCALE_QUALITY'] = sdlFilters['smooth' if self.smooth else 'nearest']
+        try:
+            surface = pygame.display.set_mode(self.renderSize, pygame.SCALED)
+            pygame.Window.from_display_module().size = self.windowSize
+        except pygame.error as error:
+            # Without a scaling renderer the window simply has the render size.
+            print(f"Warning: The window can't be scaled, using {self.renderSize} ({error}).")
+            surface = pygame.display.set_mode(self.renderSize)
+            self.windowSize = self.renderSize
+        return surface
+
+    # --- Logical to render coordinates ---
+
+    def point(self, position):
+        """Returns a logical (x, y) position in render coordinates."""
+        if not self.scaled:
+            return position
+        return position[0] * self.scaleX, position[1] * self.scaleY
+
+    def rect(self, rect):
+        """Returns the render-resolution pygame.Rect covering a logical rectangle."""
+        if not self.scaled:
+            return pygame.Rect(rect)
+        left, top = self.point(rect[:2])
+        right, bottom = self.point((rect[0] + rect[2], rect[1] + rect[3]))
+        return pygame.Rect(round(left), round(top), round(right) - round(left), round(bottom) - round(top))
+
+    def toLogical(self, position):
+        """
+        Returns a render-coordinate position (e.g., the mouse) in logical coordinates.
+
+        SDL already maps window positions to the render surface, so only the
+        render-to-logical factor is applied here.
+        """
+        if not self.scaled:
+            return position
+        return position[0] / self.scaleX, position[1] / self.scaleY
+
+    def image(self, image):
+        """
+        Returns an image at render resolution, scaling and caching it the first time.
+
+        Args:
+            image (pygame.Surface): An image sized in logical pixels.
+
+        Returns:
+            pygame.Surface: The image to draw on the render surface.
+        """
+        if not self.scaled:
+            return image
+        scaled = self.images.get(image)
+        if scaled is None:
+            width, height = image.get_size()
+            size = (max(1, round(width * self.scaleX)), max(1, round(height * self.scaleY)))
+            scaled = self.scaleSurface(image, size)
+            self.images[image] = scaled
+        return scaled
+
+    def scaleSurface(self, surface, size=None, smooth=None):
+        """
+        Scales a surface without caching it, e.g., a full-screen background layer.
+
+        Args:
+            surface (pygame.Surface): The surface to scale.
+            size (tuple): The new size. None = the render size.
+            smooth (bool): Overrides the filter. Surfaces that rely on exact color keys
+                or on fully opaque/transparent pixels must be scaled with smooth=False.
+
+        Returns:
+            pygame.Surface: The scaled surface (the same surface if nothing changes).
+        """
+        size = tuple(size or self.renderSize)
+        if surface.get_size() == size:
+            return surface
+        if smooth is None:
+            smooth = self.smooth
+        # smoothscale only handles 24 and 32-bit surfaces.
+        if smooth and surface.get_bitsize() >= 24:
+            return pygame.transform.smoothscale(surface, size)
+        return pygame.transform.scale(surface, size)
+
+    # --- Presentation ---
+
+    def present(self, rects=None):
+        """
+        Shows the drawn frame in the window.
+
+        Args:
+            rects (list): The render-resolution areas that changed, or None for the whole frame.
+        """
+        if rects is None:
+            pygame.display.flip()
+        else:
+            pygame.display.update(rects)
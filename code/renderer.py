@@ -0,0 +1,202 @@
+# =====================================================================
+# METEOR DODGER - RENDERERS
+# =====================================================================
+# Two interchangeable ways of getting a frame onto the screen:
+#   * FullRenderer redraws the whole window and flips it every frame.
+#   * DirtyRectRenderer only restores and redraws the areas that changed
+#     (moving sprites, the player's health bar and changed UI text) and
+#     pushes just those rectangles with pygame.display.update().
+# The 'dirtyRects' setting in gameSettings.py picks which one is used.
+# Both draw at the render target's resolution and present through it.
+
+# --- Third-Party Imports ---
+import pygame  # Used for drawing surfaces and updating the display.
+
+# --- Local Application Imports ---
+import gameSettings as gS
+
+
+def interpolate(sprite, alpha):
+    """
+    Returns the top-left position to draw a sprite at, between two simulation steps.
+
+    Args:
+        sprite (pygame.sprite.Sprite): A sprite with 'rect' and 'previous' attributes.
+        alpha (float): 0.0 draws at the previous step's position, 1.0 at the current one.
+    """
+    previousX, previousY = sprite.previous
+    x, y = sprite.rect.topleft
+    return previousX + (x - previousX) * alpha, previousY + (y - previousY) * alpha
+
+
+def spriteRect(rect):
+    """
+    Returns the integer screen area covered by a (possibly float) rectangle.
+
+    The area is grown by one pixel on each side so rounding never leaves a
+    sliver of an old frame behind.
+    """
+    return pygame.Rect(int(rect.x) - 1, int(rect.y) - 1, int(rect.width) + 3, int(rect.height) + 3)
+
+
+class FullRenderer:
+    """Redraws the entire frame and flips the whole display every frame."""
+
+    def __init__(self, game):
+        """
+        Initializes the renderer.
+
+        Args:
+            game (Shooter): The game whose state is drawn.
+        """
+        self.game = game
+
+    def invalidate(self):
+        """Requests a full redraw. Every frame is a full redraw, so nothing to do."""
+
+    def draw(self, alpha=1.0):
+        """
+        Draws the complete frame onto the display surface.
+
+        Args:
+            alpha (float): The interpolation factor between simulation steps.
+        """
+        self.game.draw(alpha)
+        # The profiler overlay, when shown, goes on top of everything.
+        self.game.profiler.drawOverlay(self.game.displaySurface)
+
+    def present(self):
+        """Shows the drawn frame on screen."""
+        self.game.target.present()
+
+
+class DirtyRectRenderer:
+    """
+    Redraws and updates only the parts of the screen that changed.
+
+    The cached background from the game's BackgroundCompositor is used to
+    erase the areas sprites covered last frame. The sidebar overlay is
+    re-applied on top of any area that was redrawn, and the UI text is only
+    redrawn when the score, health or ammo values change. When the
+    background itself changes (it was rebuilt, or parallax layers are
+    scrolling) the whole frame is redrawn instead.
+    """
+
+    def __init__(self, game):
+        """
+        Initializes the renderer.
+
+        Args:
+            game (Shooter): The game whose state is drawn.
+        """
+        self.game = game
+        self.screenRect = game.displaySurface.get_rect()
+
+        # Areas drawn last frame, which must be erased this frame.
+        self.previousRects = []
+        # Areas changed this frame, to be pushed to the display.
+        self.dirtyRects = []
+        # The UI values and text areas from the last time the UI text was drawn.
+        self.uiValues = None
+        self.uiRects = []
+        # The background version drawn last frame, to notice when it is rebuilt.
+        self.backgroundVersion = None
+        # When True, the next frame is drawn and presented in full.
+        self.fullRefresh = True
+
+    def invalidate(self):
+        """Requests a full redraw, e.g. after another screen has drawn over the game."""
+        self.fullRefresh = True
+
+    def draw(self, alpha=1.0):
+        """
+        Erases last frame's sprites and draws this frame's sprites and UI.
+
+        Args:
+            alpha (float): The interpolation factor between simulation steps.
+        """
+        game = self.game
+        surface = game.displaySurface
+        background = game.background
+
+        # A rebuilt or scrolling background means every pixel may have changed.
+        background.refresh()
+        if background.animated or background.version != self.backgroundVersion:
+            self.fullRefresh = True
+            self.backgroundVersion = background.version
+
+        # 1. Erase: restore the background wherever sprites were drawn last frame.
+        cached = background.surface
+        if self.fullRefresh:
+            background.draw(surface, game.gameTime)
+            self.previousRects = []
+            self.uiRects = []
+            self.uiValues = None
+        else:
+            for rect in self.previousRects:
+                surface.blit(cached, rect, rect)
+
+        # 2. Draw all moving sprites and remember the areas they cover.
+        target = game.target
+        latchedSprite, latched = game.latched
+        drawnRects = []
+        if game.entities is not None:
+            drawnRects.extend(spriteRect(rect) for rect in game.entities.draw(surface, alpha, returnRects=True,
+                                                                              target=target))
+        for sprite in game.allSprites:
+            if sprite is game.stars:
+                # The starfield is already part of the background.
+                continue
+            position = target.point(latched if sprite is latchedSprite else interpolate(sprite, alpha))
+            # Every ship draws itself, with its health bar below it.
+            if hasattr(sprite, 'draw'):
+                drawnRects.append(spriteRect(sprite.draw(surface, position, target)))
+            else:
+                drawnRects.append(spriteRect(surface.blit(target.image(sprite.image), position)))
+
+        # 3. Put the sidebars back on top of everything that was touched.
+        if self.fullRefresh:
+            background.drawOverlay(surface)
+        else:
+            overlay = background.overlay
+            for rect in self.previousRects:
+                surface.blit(overlay, rect, rect)
+            for rect in drawnRects:
+                surface.blit(overlay, rect, rect)
+
+        # 4. Redraw the UI text only when one of its values changed.
+        uiValues = (int(game.gameTime), int(game.localPlayer.health), game.ammo)
+        uiRects = []
+        if uiValues != self.uiValues:
+            for rect in self.uiRects:
+                surface.blit(cached, rect, rect)
+            newRects = game.ui.draw(surface, *uiValues)
+            uiRects = self.uiRects + newRects
+            self.uiRects = newRects
+            self.uiValues = uiValues
+
+        # 5. The profiler overlay, when shown, goes on top and is erased like a sprite next frame.
+        overlayRect = game.profiler.drawOverlay(surface)
+        if overlayRect is not None:
+            drawnRects.append(overlayRect)
+
+        # 6. Everything erased or drawn this frame has to reach the screen.
+        self.dirtyRects = self.previousRects + drawnRects + uiRects
+        self.previousRects = drawnRects
+
+    def present(self):
+        """Pushes the changed areas (or the whole frame) to the display."""
+        target = self.game.target
+        if self.fullRefresh:
+            target.present()
+            self.fullRefresh = False
+        else:
+            screenRect = self.screenRect
+            target.present([rect.clip(screenRect) for rect in self.dirtyRects])
+
+
+def createRenderer(game):
+    """Returns the renderer selected by the 'dirtyRects' setting."""
+    if gS.dirtyRects:
+        return DirtyRectRenderer(game)
+    return FullRenderer(game)
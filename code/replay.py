@@ -0,0 +1,299 @@
+# =====================================================================
+# METEOR DODGER - REPLAYS
+# =====================================================================
+# Records the player's input for every simulation step into a compact
+# binary log, and plays such a log back. Because the simulation runs on a
+# fixed timestep and all gameplay randomness comes from the game's own
+# seeded random number streams, the seed plus the per-step input is
+# enough to re-simulate a whole session exactly, headlessly and far
+# faster than real time (see headless.py --replay).
+#
+# File layout (little-endian):
+#   header:  magic b'MDRP', format version (uint16), seed (uint32),
+#            simulation rate (float64), flags (uint16, bit 0 = mouse controls)
+#   body:    one record per run of steps, see ReplayRecorder.record()
+
+# --- Standard Library Imports ---
+import os  # Used to create the folder a replay is saved into.
+import struct  # Used to pack the fixed-size file header.
+
+# The file signature and format version written at the start of every replay.
+magic = b'MDRP'
+formatVersion = 1
+headerFormat = '<4sHIdH'
+headerSize = struct.calcsize(headerFormat)
+
+# Header flag: the session was played with mouse controls.
+flagMouse = 1
+
+# Bits of a record's first byte.
+keyBits = 0x0F      # The W, A, S, D keys held during the step.
+mouseMoved = 0x10   # A zigzag-encoded (dx, dy) mouse delta follows.
+fired = 0x20        # A varint with the number of shots fired follows.
+repeat = 0x80       # Repeat the previous step's input; a varint count follows.
+unusedBits = 0x40   # Never written; set only in a damaged file.
+
+# The bit used for each movement key in the 'keys' mask.
+keyW = 1
+keyA = 2
+keyS = 4
+keyD = 8
+
+
+class TickInput:
+    """The player's input for one simulation step."""
+
+    __slots__ = ('keys', 'mouse', 'fires')
+
+    def __init__(self, keys=0, mouse=None, fires=0):
+        """
+        Initializes the input.
+
+        Args:
+            keys (int): A bit mask of the held movement keys (keyW, keyA, keyS, keyD).
+            mouse (tuple): The mouse position, or None when playing with the keyboard.
+            fires (int): The number of shots fired during the step.
+        """
+        self.keys = keys
+        self.mouse = mouse
+        self.fires = fires
+
+    def __eq__(self, other):
+        if not isinstance(other, TickInput):
+            return NotImplemented
+        return (self.keys, self.mouse, self.fires) == (other.keys, other.mouse, other.fires)
+
+    def __repr__(self):
+        return f"TickInput(keys={self.keys}, mouse={self.mouse}, fires={self.fires})"
+
+
+def writeVarint(buffer, value):
+    """Appends an unsigned integer to 'buffer' using 7 bits per byte."""
+    while value >= 0x80:
+        buffer.append((value & 0x7F) | 0x80)
+        value >>= 7
+    buffer.append(value)
+
+
+def readVarint(data, position):
+    """
+    Reads an unsigned varint from 'data' at 'position'. Returns (value, newPosition).
+
+    Raises:
+        ValueError: If the data ends in the middle of the varint.
+    """
+    value = 0
+    shift = 0
+    end = len(data)
+    while True:
+        if position >= end:
+            raise ValueError("The replay is damaged: a record is cut off")
+        byte = data[position]
+        position += 1
+        value |= (byte & 0x7F) << shift
+        if byte < 0x80:
+            return value, position
+        shift += 7
+
+
+def zigzag(value):
+    """Maps a signed integer to an unsigned one so small negative numbers stay small."""
+    return (value << 1) ^ (value >> 63)
+
+
+def unzigzag(value):
+    """Reverses zigzag()."""
+    return (value >> 1) ^ -(value & 1)
+
+
+class ReplayRecorder:
+    """
+    Encodes the input of every simulation step into a compact byte log.
+
+    Each record starts with one byte holding the held keys and flags. A mouse
+    position is stored as a delta from the previous step, and consecutive
+    steps with identical input collapse into a single repeat record, so idle
+    stretches cost a few bytes no matter how long they are.
+    """
+
+    def __init__(self, seed, simulationRate, mouse=False):
+        """
+        Initializes an empty recording.
+
+        Args:
+            seed (int): The seed of the recorded session.
+            simulationRate (float): The simulation steps per second of the session.
+            mouse (bool): Whether the session uses mouse controls.
+        """
+        self.seed = seed
+        self.simulationRate = simulationRate
+        self.mouse = mouse
+        self.body = bytearray()
+        self.ticks = 0
+        # The last written input, and how many repeats of it are waiting to be written.
+        self.previous = None
+        self.pendingRepeats = 0
+        self.lastMouse = (0, 0)
+
+    def record(self, tickInput):
+        """Appends the input of one simulation step."""
+        self.ticks += 1
+        if tickInput == self.previous and not tickInput.fires:
+            self.pendingRepeats += 1
+            return
+        self._flushRepeats()
+
+        body = self.body
+        flags = tickInput.keys & keyBits
+        mouse = tickInput.mouse
+        if mouse is not None and mouse != self.lastMouse:
+            flags |= mouseMoved
+        if tickInput.fires:
+            flags |= fired
+        body.append(flags)
+
+        if flags & mouseMoved:
+            writeVarint(body, zigzag(int(mouse[0]) - self.lastMouse[0]))
+            writeVarint(body, zigzag(int(mouse[1]) - self.lastMouse[1]))
+            self.lastMouse = (int(mouse[0]), int(mouse[1]))
+        if flags & fired:
+            writeVarint(body, tickInput.fires)
+
+        self.previous = TickInput(tickInput.keys, mouse, 0)
+
+    def _flushRepeats(self):
+        """Writes the pending run of repeated steps, if any."""
+        if self.pendingRepeats:
+            self.body.append(repeat)
+            writeVarint(self.body, self.pendingRepeats)
+            self.pendingRepeats = 0
+
+    def mark(self):
+        """Returns how far the recording has got, to go back to with rewindTo()."""
+        return len(self.body), self.ticks, self.previous, self.pendingRepeats, self.lastMouse
+
+    def rewindTo(self, mark):
+        """Forgets every step recorded after mark() returned 'mark' (e.g., after rewinding the game)."""
+        length, self.ticks, self.previous, self.pendingRepeats, self.lastMouse = mark
+        del self.body[length:]
+
+    def continuation(self):
+        """
+        Returns the recording so far as plain data, to carry on with resume() (e.g., in a saved game).
+
+        Returns:
+            tuple: The seed, simulation rate, mouse flag, body, step count, last input and mouse position.
+        """
+        self._flushRepeats()
+        previous = None if self.previous is None else (self.previous.keys, self.previous.mouse)
+        return (self.seed, self.simulationRate, self.mouse, bytes(self.body), self.ticks, previous,
+                self.lastMouse)
+
+    @classmethod
+    def resume(cls, continuation):
+        """
+        Returns a recorder that carries on a recording saved by continuation().
+
+        Args:
+            continuation (tuple): The saved recording.
+
+        Returns:
+            ReplayRecorder: The recorder, ready to record the next step.
+        """
+        seed, simulationRate, mouse, body, ticks, previous, lastMouse = continuation
+        recorder = cls(seed, simulationRate, mouse)
+        recorder.body = bytearray(body)
+        recorder.ticks = ticks
+        recorder.previous = None if previous is None else TickInput(previous[0], previous[1], 0)
+        recorder.lastMouse = lastMouse
+        return recorder
+
+    def toBytes(self):
+        """Returns the complete replay file contents."""
+        self._flushRepeats()
+        flags = flagMouse if self.mouse else 0
+        header = struct.pack(headerFormat, magic, formatVersion, self.seed, self.simulationRate, flags)
+        return header + bytes(self.body)
+
+    def save(self, filePath):
+        """Writes the replay to a file, creating its folder if needed."""
+        folder = os.path.dirname(filePath)
+        if folder:
+            os.makedirs(folder, exist_ok=True)
+        with open(filePath, 'wb') as f:
+            f.write(self.toBytes())
+
+
+class Replay:
+    """A loaded replay that hands out the recorded input one step at a time."""
+
+    def __init__(self, data):
+        """
+        Parses replay data.
+
+        Args:
+            data (bytes): The contents of a replay file.
+
+        Raises:
+            ValueError: If the data is not a replay or uses an unknown format version.
+        """
+        if len(data) < headerSize:
+            raise ValueError("Not a replay file: too short")
+        fileMagic, version, seed, simulationRate, flags = struct.unpack_from(headerFormat, data)
+        if fileMagic != magic:
+            raise ValueError("Not a replay file: bad signature")
+        if version != formatVersion:
+            raise ValueError(f"Unsupported replay format version {version}")
+
+        self.seed = seed
+        self.simulationRate = simulationRate
+        self.mouse = bool(flags & flagMouse)
+        self.data = data
+        self.size = len(data)
+
+    @classmethod
+    def load(cls, filePath):
+        """Reads a replay from a file."""
+        with open(filePath, 'rb') as f:
+            return cls(f.read())
+
+    def inputs(self):
+        """
+        Yields the TickInput of every recorded step, in order.
+
+        Raises:
+            ValueError: If the body is damaged (a record is cut off or has unknown flags).
+        """
+        data = self.data
+        position = headerSize
+        end = len(data)
+        lastMouse = (0, 0)
+        previous = TickInput(0, lastMouse if self.mouse else None, 0)
+        while position < end:
+            flags = data[position]
+            position += 1
+            if flags & unusedBits or (flags & repeat and flags != repeat):
+                raise ValueError(f"The replay is damaged: unknown record flags {flags:#04x}")
+
+            if flags & repeat:
+                count, position = readVarint(data, position)
+                for _ in range(count):
+                    yield previous
+                continue
+
+            mouse = lastMouse if self.mouse else None
+            if flags & mouseMoved:
+                dx, position = readVarint(data, position)
+                dy, position = readVarint(data, position)
+                lastMouse = (lastMouse[0] + unzigzag(dx), lastMouse[1] + unzigzag(dy))
+                mouse = lastMouse
+            fires = 0
+            if flags & fired:
+                fires, position = readVarint(data, position)
+
+            yield TickInput(flags & keyBits, mouse, fires)
+            previous = TickInput(flags & keyBits, mouse, 0)
+
+    def __len__(self):
+        """Returns the number of recorded steps (decodes the whole log)."""
+        return sum(1 for _ in self.inputs())
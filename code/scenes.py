@@ -0,0 +1,292 @@
+# =====================================================================
+# METEOR DODGER - SCENES
+# =====================================================================
+# The game moves between a few scenes: playing, paused and game over.
+# SceneManager runs one scene at a time; each scene runs until it names
+# the next one.
+#
+# Only the play scene runs a frame loop. Static screens (pause and game
+# over) block in pygame.event.wait() and only redraw when an event changes
+# what they show (a click, a key, the mouse moving on or off a button, or
+# the window being uncovered), so a machine left on one of them uses close
+# to no CPU. Losing window focus pauses the game (or, if that is turned
+# off, throttles it), and minimizing the window always pauses it.
+
+# --- Standard Library Imports ---
+from abc import ABC, abstractmethod  # Used to require run() and draw() from every scene.
+
+# --- Third-Party Imports ---
+import pygame  # Used for events, drawing and the display.
+
+# --- Local Application Imports ---
+import gameSettings as gS
+
+# Window events after which a static screen has to be drawn again.
+exposeEvents = (pygame.WINDOWEXPOSED, pygame.WINDOWRESTORED, pygame.WINDOWSIZECHANGED)
+# Window focus changes, which the game needs to know about even while a static screen is shown.
+focusEvents = (pygame.WINDOWFOCUSGAINED, pygame.WINDOWFOCUSLOST)
+# Posted (from the leaderboard's background thread) when the stored runs change.
+leaderboardChanged = pygame.event.custom_type()
+# The longest the game over screen waits (in seconds) for the stored runs to be loaded.
+leaderboardWait = 0.25
+
+
+class Scene(ABC):
+    """A part of the game that takes over the window until it hands over to another scene."""
+
+    def __init__(self, game):
+        """
+        Initializes the scene.
+
+        Args:
+            game (Shooter): The game the scene belongs to.
+        """
+        self.game = game
+
+    @abstractmethod
+    def run(self):
+        """
+        Runs the scene until it is done.
+
+        Returns:
+            str: The name of the next scene, or 'quit' to end the game.
+        """
+
+
+class StaticScene(Scene):
+    """
+    A screen that only changes in response to input.
+
+    Instead of redrawing every frame, it sleeps in pygame.event.wait() and
+    only redraws when handleEvent() reports that the picture changed.
+    """
+
+    def enter(self):
+        """Called when the scene starts, before it is first drawn."""
+
+    @abstractmethod
+    def draw(self, surface):
+        """Draws the whole screen onto 'surface'."""
+
+    def handleEvent(self, event):
+        """
+        Responds to one event.
+
+        Args:
+            event (pygame.event.Event): The event.
+
+        Returns:
+            str | bool: The next scene's name to leave this scene, True if the screen
+                must be redrawn, or False if nothing changed.
+        """
+        return False
+
+    def run(self):
+        """Draws the screen, then waits for events and redraws only when something changed."""
+        self.enter()
+        surface = self.game.displaySurface
+        redraw = True
+        while True:
+            if redraw:
+                self.draw(surface)
+                self.game.target.present()
+                redraw = False
+
+            # Sleep until something happens, then handle everything that is queued.
+            events = [pygame.event.wait()]
+            events.extend(pygame.event.get())
+            # Only the play scene reads input, so keep the game's focus state current here. The
+            # whole batch is checked first: the events after one that leaves the scene are dropped.
+            for event in events:
+                if event.type in focusEvents:
+                    self.game.focused = event.type == pygame.WINDOWFOCUSGAINED
+            for event in events:
+                if event.type == pygame.QUIT:
+                    return 'quit'
+                if event.type in exposeEvents:
+                    redraw = True
+                    continue
+                result = self.handleEvent(event)
+                if isinstance(result, str):
+                    return result
+                redraw = redraw or result
+
+
+class PlayScene(Scene):
+    """The game itself: runs frames until the player dies, pauses or quits."""
+
+    def run(self):
+        """Resumes the frame loop. Returns 'gameOver', 'pause' or 'quit'."""
+        game = self.game
+        # Time spent in other scenes must not be simulated as one long catch-up frame.
+        game.clock.tick()
+        game.renderer.invalidate()
+        return game.playFrames()
+
+
+class PauseScene(StaticScene):
+    """The paused game: a dimmed copy of the last frame until the player resumes."""
+
+    def enter(self):
+        """Dims a snapshot of the game once, so redrawing the screen is a single blit."""
+        game = self.game
+        game.sfx.pauseMusic()
+        self.snapshot = game.displaySurface.copy()
+        self.snapshot.fill((110, 110, 110), special_flags=pygame.BLEND_MULT)
+
+    def draw(self, surface):
+        surface.blit(self.snapshot, (0, 0))
+        ui = self.game.ui
+        ui.drawText(surface, "Paused", gS.screenCenter)
+        ui.drawText(surface, "Press Esc or P, or click, to resume",
+                    (gS.screenCenter[0], gS.screenCenter[1] + 50))
+
+    def handleEvent(self, event):
+        resume = (
+            (event.type == pygame.KEYDOWN and event.key in (pygame.K_ESCAPE, pygame.K_p))
+            or (event.type == pygame.MOUSEBUTTONDOWN and event.button == 1)
+        )
+        if resume:
+            self.game.sfx.resumeMusic()
+            return 'play'
+        return False
+
+
+class GameOverScene(StaticScene):
+    """Shows the final score, the high score and the leaderboard, with a retry button."""
+
+    # --- Screen & Button Setup ---
+    textColor = (255, 255, 255)
+    buttonColor = (0, 100, 0)
+    buttonHoverColor = (0, 150, 0)
+    newHighscoreColor = (255, 215, 0)  # Gold color
+
+    def __init__(self, game):
+        super().__init__(game)
+        buttonWidth = 200
+        buttonHeight = 50
+        buttonX = (gS.screenWidth / 2) - (buttonWidth / 2)
+        buttonY = gS.screenHeight / 2 + 100
+        self.retryButton = pygame.Rect(buttonX, buttonY, buttonWidth, buttonHeight)
+
+    def enter(self):
+        """Records the finished run and works out what the screen shows."""
+        game = self.game
+        # Keep the replay of the run that just ended.
+        game.saveRecording()
+
+        # --- High Score Logic ---
+        # 1. Capture the final score before it gets reset.
+        self.finalScore = int(game.gameTime)
+
+        # 2. Read the best stored score from the leaderboard's in-memory copy (no disk access).
+        # It is filled in once the background thread has opened the database, which only
+        # takes long if the first run ends right after startup; then wait for it briefly.
+        game.leaderboard.ready.wait(leaderboardWait)
+        self.highScore = game.leaderboard.highScore
+
+        # 3. Check if the current score is a new high score.
+        self.newHighscore = self.finalScore > self.highScore
+        if self.newHighscore:
+            self.highScore = self.finalScore
+
+        # 4. Store the run. The leaderboard writes it on its own thread and posts a
+        # leaderboardChanged event when it is done, which redraws the list.
+        game.leaderboard.submit(self.finalScore, game.gameTime, game.seed, game.difficultyLevel)
+
+        # Whether the mouse is over the retry button, so only changes to that cause a redraw.
+        self.hovered = self.retryButton.collidepoint(game.target.toLogical(pygame.mouse.get_pos()))
+
+    def draw(self, surface):
+        game = self.game
+        ui = game.ui
+        textColor = self.textColor
+        retryButton = self.retryButton
+
+        surface.fill(game.screenColor)
+
+        # Display "Game Over" text
+        ui.drawText(surface, "Game Over", (gS.screenWidth / 2, gS.screenHeight / 4), color=textColor)
+
+        # Display the player's final score
+        ui.drawText(surface, f"Your Score: {self.finalScore}", (gS.screenWidth / 2, gS.screenHeight / 3),
+                    color=textColor)
+
+        # Display the High Score
+        ui.drawText(surface, f"High Score: {self.highScore}", (gS.screenWidth / 2, gS.screenHeight / 3 + 50),
+                    color=textColor)
+
+        # If a new high score was achieved, display a special message.
+        if self.newHighscore:
+            ui.drawText(surface, "New High Score!", (gS.screenWidth / 2, gS.screenHeight / 3 + 100),
+                        color=self.newHighscoreColor)
+
+        # Draw Retry Button with hover effect
+        pygame.draw.rect(surface, self.buttonHoverColor if self.hovered else self.buttonColor,
+                         game.target.rect(retryButton))
+        ui.drawText(surface, "Retry", retryButton.center, color=textColor)
+
+        # Display the best runs below the button.
+        for rank, run in enumerate(game.leaderboard.top()[:gS.leaderboardShown], start=1):
+            runText = f"{rank}. {run['score']}   (difficulty {run['difficulty']})"
+            ui.drawText(surface, runText, (gS.screenWidth / 2, retryButton.bottom + 40 * rank), color=textColor)
+
+    def handleEvent(self, event):
+        # Mouse positions arrive in render coordinates; the button is laid out in logical ones.
+        toLogical = self.game.target.toLogical
+        clicked = event.type == pygame.MOUSEBUTTONDOWN and event.button == 1
+        if clicked and self.retryButton.collidepoint(toLogical(event.pos)):
+            netplay = self.game.netplay
+            if netplay is None:
+                self.game.reset()
+                return 'play'
+            # A netplay rematch starts when both players clicked retry, from a seed both know.
+            surface = self.game.displaySurface
+            self.draw(surface)
+            self.game.ui.drawText(surface, "Waiting for the other player...",
+                                  (gS.screenWidth / 2, self.retryButton.top - 40), color=self.textColor)
+            self.game.target.present()
+            return 'play' if netplay.rematch() else 'quit'
+
+        # The finished run has been stored, so the leaderboard list changed. If the stored
+        # runs were not loaded in time in enter(), the high score is corrected here.
+        if event.type == leaderboardChanged:
+            self.highScore = max(self.highScore, self.game.leaderboard.highScore)
+            if self.highScore > self.finalScore:
+                self.newHighscore = False
+            return True
+
+        # Only redraw when the mouse moves onto or off the button.
+        if event.type == pygame.MOUSEMOTION:
+            hovered = self.retryButton.collidepoint(toLogical(event.pos))
+            if hovered != self.hovered:
+                self.hovered = hovered
+                return True
+        return False
+
+
+class SceneManager:
+    """Runs scenes one after another, by name, until one of them returns 'quit'."""
+
+    def __init__(self, scenes):
+        """
+        Initializes the manager.
+
+        Args:
+            scenes (dict): Maps each scene name (e.g., 'play') to its Scene.
+        """
+        self.scenes = scenes
+        self.current = None
+
+    def run(self, start):
+        """
+        Runs scenes starting with 'start' until one returns 'quit'.
+
+        Args:
+            start (str): The name of the first scene.
+        """
+        name = start
+        while name != 'quit':
+            self.current = name
+            name = self.scenes[name].run()
+        self.current = None
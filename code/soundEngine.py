@@ -0,0 +1,264 @@
+# =====================================================================
+# METEOR DODGER - SOUND ENGINE
+# =====================================================================
+# Plays the game's music and sound effects.
+#   * Background music is streamed from disk with pygame.mixer.music
+#     instead of being decoded into memory.
+#   * Sound effects are decoded the first time they are played, so
+#     startup doesn't wait for (or hold memory for) sounds never heard.
+#   * Effects play on a fixed pool of mixer channels. Each effect has a
+#     priority and a cooldown: a burst of lasers is throttled by the
+#     cooldown, and when every channel is busy a new sound may only take
+#     over a channel playing something of lower or equal priority.
+# A missing file or a missing audio device never stops the game; the
+# affected sounds just stay silent.
+
+# --- Standard Library Imports ---
+from os import path  # Used to build the paths of the audio files.
+from time import perf_counter  # Used to enforce the per-effect cooldowns.
+
+# --- Third-Party Imports ---
+import pygame  # Used for the mixer, its channels and music streaming.
+
+# --- Local Application Imports ---
+import gameSettings as gS
+
+# The folder holding all audio files.
+audioDir = path.join(path.dirname(path.dirname(path.abspath(__file__))), 'audio')
+
+
+class SoundEffect:
+    """A sound effect that is decoded from its file the first time it is needed."""
+
+    def __init__(self, name, filePath, volume=1.0, priority=0, cooldown=0.0):
+        """
+        Initializes the effect without loading it.
+
+        Args:
+            name (str): The short name used to play the effect (e.g., 'laser').
+            filePath (str): The audio file.
+            volume (float): The playback volume, from 0.0 to 1.0.
+            priority (int): Higher priority sounds may take channels from lower priority ones.
+            cooldown (float): The shortest time in seconds between two plays of this effect.
+        """
+        self.name = name
+        self.filePath = filePath
+        self.volume = volume
+        self.priority = priority
+        self.cooldown = cooldown
+        # The decoded sound, once loaded, and whether loading it failed.
+        self.sound = None
+        self.missing = False
+        # When the effect last started playing, for the cooldown.
+        self.lastPlayed = float('-inf')
+
+    def load(self):
+        """
+        Decodes the effect if it hasn't been yet.
+
+        Returns:
+            pygame.mixer.Sound | None: The decoded sound, or None if the file couldn't be loaded.
+        """
+        if self.sound is None and not self.missing:
+            try:
+                self.sound = pygame.mixer.Sound(self.filePath)
+                self.sound.set_volume(self.volume)
+            except (pygame.error, FileNotFoundError) as error:
+                # Only warn once; the effect stays silent from now on.
+                self.missing = True
+                print(f"Warning: Sound '{self.name}' could not be loaded ({error}).")
+        return self.sound
+
+
+class ChannelPool:
+    """
+    A fixed number of mixer channels shared by every sound effect.
+
+    A new sound plays on a free channel if there is one. Otherwise it
+    replaces the lowest priority sound that is playing (the oldest one among
+    equals), as long as that sound's priority isn't higher than its own;
+    if it is, the new sound is dropped.
+    """
+
+    def __init__(self, count):
+        """
+        Initializes the pool.
+
+        Args:
+            count (int): The number of channels (the most sounds playing at once).
+        """
+        pygame.mixer.set_num_channels(count)
+        self.channels = [pygame.mixer.Channel(index) for index in range(count)]
+        # The (priority, start time) of the sound each channel was last given.
+        self.playing = [(0, 0.0)] * count
+        # Counters for stats().
+        self.started = 0
+        self.stolen = 0
+        self.dropped = 0
+
+    def play(self, sound, priority, now, loops=0):
+        """
+        Plays a sound on a free channel, or on one taken from a lower priority sound.
+
+        Args:
+            sound (pygame.mixer.Sound): The sound to play.
+            priority (int): The sound's priority.
+            now (float): The current time in seconds.
+            loops (int): The number of times to repeat the sound.
+
+        Returns:
+            pygame.mixer.Channel | None: The channel used, or None if the sound was dropped.
+        """
+        # 1. Use a free channel if there is one.
+        channels = self.channels
+        for index, channel in enumerate(channels):
+            if not channel.get_busy():
+                return self._start(index, sound, priority, now, loops)
+
+        # 2. Otherwise take over the least important, oldest sound, unless it outranks this one.
+        playing = self.playing
+        victim = min(range(len(channels)), key=playing.__getitem__)
+        if playing[victim][0] > priority:
+            self.dropped += 1
+            return None
+        self.stolen += 1
+        return self._start(victim, sound, priority, now, loops)
+
+    def _start(self, index, sound, priority, now, loops):
+        """Plays a sound on a channel (stopping what it was playing) and records it."""
+        channel = self.channels[index]
+        channel.play(sound, loops)
+        self.playing[index] = (priority, now)
+        self.started += 1
+        return channel
+
+    def stats(self):
+        """Returns a dictionary with the pool's size and counters."""
+        return {
+            'channels': len(self.channels),
+            'busy': sum(1 for channel in self.channels if channel.get_busy()),
+            'started': self.started,
+            'stolen': self.stolen,
+            'dropped': self.dropped,
+        }
+
+
+class Sound:
+    """
+    The game's sound manager: streamed music and pooled, lazily loaded effects.
+
+    Effects are described by gS.soundEffects and played by name.
+    """
+
+    def __init__(self, enabled=True, root=audioDir):
+        """
+        Initializes the sound system. No effect is decoded yet.
+
+        Args:
+            enabled (bool): When False, nothing is played. Used by the headless simulation.
+                The sound system also disables itself if no audio device is available.
+            root (str): The folder holding the audio files.
+        """
+        self.root = root
+        self.effects = {}
+        self.channels = None
+        # Effects skipped because they were played again within their cooldown.
+        self.throttled = 0
+        # While True, effects are silent (e.g., while netplay re-simulates steps already heard).
+        self.muted = False
+
+        # 1. Start the mixer. Without an audio device the game simply runs silently.
+        self.enabled = enabled
+        if enabled and not pygame.mixer.get_init():
+            try:
+                pygame.mixer.init()
+            except pygame.error as error:
+                print(f"Warning: Audio is disabled, the mixer could not start ({error}).")
+                self.enabled = False
+        if not self.enabled:
+            return
+
+        # 2. Describe every effect; each one is decoded on its first play.
+        for name, spec in gS.soundEffects.items():
+            self.effects[name] = SoundEffect(
+                name,
+                path.join(root, spec['file']),
+                volume=spec.get('volume', 1.0),
+                priority=spec.get('priority', 0),
+                cooldown=spec.get('cooldown', 0.0),
+            )
+
+        # 3. The shared pool of effect channels.
+        self.channels = ChannelPool(gS.soundChannels)
+
+    def playMusic(self, loops=-1):
+        """
+        Streams the background music from disk.
+
+        Args:
+            loops (int): The number of times to repeat the music. -1 means loop forever.
+        """
+        if not self.enabled or not gS.musicFile:
+            return
+        musicPath = path.join(self.root, gS.musicFile)
+        try:
+            pygame.mixer.music.load(musicPath)
+            pygame.mixer.music.set_volume(gS.musicVolume)
+            pygame.mixer.music.play(loops)
+        except (pygame.error, FileNotFoundError) as error:
+            print(f"Warning: Background music '{gS.musicFile}' could not be played ({error}).")
+
+    def stopMusic(self):
+        """Stops the background music."""
+        if self.enabled:
+            pygame.mixer.music.stop()
+
+    def pauseMusic(self):
+        """Pauses the background music (e.g., while the game is paused)."""
+        if self.enabled:
+            pygame.mixer.music.pause()
+
+    def resumeMusic(self):
+        """Continues the background music where it was paused."""
+        if self.enabled:
+            pygame.mixer.music.unpause()
+
+    def play(self, soundName, loops=0):
+        """
+        Plays a sound effect by its name, respecting its cooldown and the channel limit.
+
+        Args:
+            soundName (str): The name of the effect in gS.soundEffects.
+            loops (int): The number of times to repeat the sound. -1 means loop forever.
+        """
+        # A disabled or muted sound system stays silent.
+        if not self.enabled or self.muted:
+            return
+
+        effect = self.effects.get(soundName)
+        if effect is None:
+            # Print a warning to the console for debugging.
+            print(f"Warning: Sound '{soundName}' not found.")
+            return
+
+        # Skip the sound if it was played too recently (e.g., during laser spam).
+        now = perf_counter()
+        if now - effect.lastPlayed < effect.cooldown:
+            self.throttled += 1
+            return
+
+        sound = effect.load()
+        if sound is None:
+            return
+        if self.channels.play(sound, effect.priority, now, loops) is not None:
+            effect.lastPlayed = now
+
+    def stats(self):
+        """Returns a dictionary describing what has been loaded and played."""
+        if not self.enabled:
+            return {'enabled': False}
+        result = self.channels.stats()
+        result['enabled'] = True
+        result['decoded'] = sum(1 for effect in self.effects.values() if effect.sound is not None)
+        result['throttled'] = self.throttled
+        return result
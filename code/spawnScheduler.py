@@ -0,0 +1,172 @@
+# =====================================================================
+# METEOR DODGER - SPAWN SCHEDULER
+# =====================================================================
+# Decides when meteors and power-ups appear. Instead of drawing a new
+# random threshold for every spawn type on every frame, the scheduler
+# keeps a priority queue of precomputed next-spawn times. Each frame it
+# only looks at the earliest entry, so the per-frame cost stays the same
+# no matter how many spawn types are registered. Each interval is drawn
+# once, and the next spawn is scheduled from when the previous one was
+# due, so time that overshoots a spawn carries over instead of being lost.
+
+# --- Standard Library Imports ---
+import heapq  # Used for the priority queue of upcoming spawns.
+import random  # Used for the default random number generator.
+
+# --- Local Application Imports ---
+import gameSettings as gS
+
+# The shortest interval ever scheduled, so a rate of zero can't stall the game loop.
+minimumInterval = 0.001
+
+
+def randGenForProb(n, rng=random):
+    """
+    Takes a number 'n' and returns a new, slightly randomized version of it.
+
+    This function applies a random variance to the input number based on
+    the 'randomProbability' value from the game settings. For example, it
+    can turn a fixed spawn time into a slightly unpredictable one.
+
+    Args:
+        n (float): The base number to randomize (e.g., a spawn rate).
+        rng (random.Random): The random number generator to draw from.
+
+    Returns:
+        float: The new, randomized number.
+    """
+    # 1. Scale the number up to work with integers for more precise calculations.
+    n *= 1000
+
+    # 2. Calculate the lower and upper bounds for the random range.
+    # This creates a range around 'n' based on the percentage from game settings.
+    randSmall = n - gS.randomProbability / 100 * n
+    randLarge = n + gS.randomProbability / 100 * n
+
+    # 3. Pick a random integer within the calculated bounds.
+    randomValue = rng.randint(int(randSmall), int(randLarge))
+
+    # 4. Scale the result back down to its original magnitude and return it.
+    return randomValue / 1000
+
+
+class SpawnType:
+    """A registered kind of spawn: how often it happens and what it does."""
+
+    def __init__(self, name, rate, callback):
+        """
+        Initializes the spawn type.
+
+        Args:
+            name (str): A unique name (e.g., 'meteor').
+            rate (callable): Called with the current game time; returns the base number
+                of seconds between spawns. This is the spawn type's rate curve.
+            callback (callable): Called with no arguments to perform one spawn.
+        """
+        self.name = name
+        self.rate = rate
+        self.callback = callback
+        # The number of times this type has spawned.
+        self.spawned = 0
+
+
+class SpawnScheduler:
+    """
+    A priority queue of upcoming spawns, ordered by the game time they are due.
+
+    Every spawn type has exactly one entry in the queue. When an entry is due,
+    its callback runs and the next spawn is scheduled one randomized interval
+    after the time it was due.
+    """
+
+    def __init__(self, rng=random):
+        """
+        Initializes an empty scheduler.
+
+        Args:
+            rng (random.Random): The random number generator used to vary the intervals.
+        """
+        self.rng = rng
+        self.types = {}
+        # Heap entries are (dueTime, order, name); 'order' breaks ties in registration order.
+        self.queue = []
+        self.order = 0
+
+    def register(self, name, rate, callback, now=0.0):
+        """
+        Adds a new spawn type and schedules its first spawn.
+
+        Args:
+            name (str): A unique name for the spawn type.
+            rate (callable): The rate curve: called with the game time, returns the
+                base number of seconds between spawns.
+            callback (callable): Performs one spawn.
+            now (float): The current game time.
+
+        Returns:
+            SpawnType: The registered spawn type.
+        """
+        if name in self.types:
+            raise ValueError(f"Spawn type '{name}' is already registered")
+        spawnType = SpawnType(name, rate, callback)
+        self.types[name] = spawnType
+        self._schedule(spawnType, now)
+        return spawnType
+
+    def unregister(self, name):
+        """Removes a spawn type and its pending spawn."""
+        del self.types[name]
+        self.queue = [entry for entry in self.queue if entry[2] != name]
+        heapq.heapify(self.queue)
+
+    def _schedule(self, spawnType, fromTime):
+        """Queues the next spawn of a type, one randomized interval after 'fromTime'."""
+        interval = max(randGenForProb(spawnType.rate(fromTime), self.rng), minimumInterval)
+        self.order += 1
+        heapq.heappush(self.queue, (fromTime + interval, self.order, spawnType.name))
+
+    def reset(self, now=0.0):
+        """Reschedules every spawn type from scratch, e.g. when a new game starts."""
+        self.queue = []
+        for spawnType in self.types.values():
+            spawnType.spawned = 0
+            self._schedule(spawnType, now)
+
+    def reschedule(self, now):
+        """Replaces every pending spawn with one scheduled from 'now', e.g. after the rates changed."""
+        self.queue = []
+        for spawnType in self.types.values():
+            self._schedule(spawnType, now)
+
+    def nextSpawn(self):
+        """Returns (dueTime, name) of the next pending spawn, or None if nothing is registered."""
+        if not self.queue:
+            return None
+        dueTime, _, name = self.queue[0]
+        return dueTime, name
+
+    def advance(self, now):
+        """
+        Runs every spawn that is due at or before the given game time.
+
+        If more than one interval of a type has passed (e.g., after a long
+        step), it spawns once for each interval, in time order.
+
+        Args:
+            now (float): The current game time.
+
+        Returns:
+            int: The number of spawns performed.
+        """
+        queue = self.queue
+        performed = 0
+        # The common case costs a single comparison: nothing is due yet.
+        while queue and queue[0][0] <= now:
+            dueTime, _, name = heapq.heappop(queue)
+            spawnType = self.types[name]
+            spawnType.callback()
+            spawnType.spawned += 1
+            performed += 1
+            # Schedule from the time the spawn was due, carrying the overshoot over.
+            self._schedule(spawnType, dueTime)
+        return performed
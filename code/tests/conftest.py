@@ -0,0 +1,13 @@
+# =====================================================================
+# METEOR DODGER - TEST SETUP
+# =====================================================================
+# Runs the game without a screen or sound card, and lets the tests import
+# the game's modules, which live in the folder above this one.
+
+# --- Standard Library Imports ---
+import os  # Used to select SDL's dummy video and audio drivers.
+import sys  # Used to make the game's modules importable.
+
+os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+os.environ.setdefault('SDL_AUDIODRIVER', 'dummy')
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
@@ -0,0 +1,45 @@
+# =====================================================================
+# METEOR DODGER - CO-OP TESTS
+# =====================================================================
+
+# --- Third-Party Imports ---
+import pytest  # Used to run the test with both entity backends.
+
+# --- Local Application Imports ---
+import gameSettings as gS
+import main
+import replay as rP
+
+
+def fallingCount(game, kind):
+    """Returns how many falling objects of one kind are in play, with either backend."""
+    if game.entities is None:
+        return len(game.droppings[kind])
+    entities = game.entities
+    return int((entities.kind[:entities.count] == entities.kindIndex[kind]).sum())
+
+
+@pytest.mark.parametrize('backend', ['sprites', 'numpy'])
+def test_ship_out_of_play_is_not_hit(monkeypatch, backend):
+    """The first ship, once out of play, neither takes hits nor collects pickups."""
+    monkeypatch.setattr(gS, 'entityBackend', backend)
+    game = main.Shooter(headless=True, players=2)
+    game.reset(seed=1)
+    # Nothing else spawns, and neither ship moves.
+    monkeypatch.setattr(game.spawner, 'advance', lambda time: None)
+    game.inputSource = lambda: [rP.TickInput(), rP.TickInput()]
+
+    # 1. The first ship is taken out of play, as collision('player') does in co-op.
+    host = game.players[0]
+    host.health = 0
+    host.kill()
+
+    # 2. A meteor and a health pack land right on it.
+    game.spawnMeteor(*host.rect.center)
+    game.spawnHealth(*host.rect.center)
+    game.step(1 / gS.simulationRate)
+
+    assert fallingCount(game, 'meteor') == 1
+    assert fallingCount(game, 'health') == 1
+    assert host.health <= 0
+    assert not game.gameOver
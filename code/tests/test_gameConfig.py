@@ -0,0 +1,82 @@
+# =====================================================================
+# METEOR DODGER - SETTINGS FILE TESTS
+# =====================================================================
+
+# --- Standard Library Imports ---
+import os  # Used to move the settings file's modification time forward.
+
+# --- Third-Party Imports ---
+import pytest  # Used for the temporary folder and error checks.
+
+# --- Local Application Imports ---
+import gameConfig as gC
+import gameSettings as gS
+import main
+
+
+@pytest.fixture(autouse=True)
+def restoreSettings():
+    """Puts every setting back to its default after each test, since loading changes gameSettings."""
+    yield
+    values = dict(gC.defaults)
+    values.update(gC.deriveSettings(values))
+    for name, value in values.items():
+        setattr(gS, name, value)
+
+
+def writeSettings(filePath, text):
+    """Writes a settings file and makes sure its modification time changes."""
+    filePath.write_text(text)
+    stamp = os.stat(filePath).st_mtime_ns + 1_000_000_000
+    os.utime(filePath, ns=(stamp, stamp))
+
+
+@pytest.mark.parametrize('text', [
+    'meteorSpeed = "fast"\n',        # The wrong type.
+    'meteorSpawnRate = -1\n',        # Outside the allowed range.
+    'meteorSpeed = 700\nmeteorSped = 700\n',  # An unknown name next to a valid value.
+])
+def test_invalid_file_is_rejected_and_defaults_kept(tmp_path, text):
+    """An invalid file raises ConfigError and changes no setting at all."""
+    filePath = tmp_path / 'settings.toml'
+    writeSettings(filePath, text)
+    with pytest.raises(gC.ConfigError):
+        gC.GameConfig(str(filePath)).load()
+    assert gS.meteorSpeed == gC.defaults['meteorSpeed']
+    assert gS.meteorSpawnRate == gC.defaults['meteorSpawnRate']
+
+
+def test_profile_is_applied_over_the_file(tmp_path):
+    """The file's own profile is applied on top of its values, unless another one is asked for."""
+    filePath = tmp_path / 'settings.toml'
+    writeSettings(filePath, 'profile = "hard"\nmeteorSpeed = 600\n'
+                            '[profiles.hard]\nmeteorSpeed = 700\n'
+                            '[profiles.easy]\nmeteorSpeed = 400\n')
+    gC.GameConfig(str(filePath)).load()
+    assert gS.meteorSpeed == 700
+    gC.GameConfig(str(filePath), profile='easy').load()
+    assert gS.meteorSpeed == 400
+
+
+def test_reload_updates_the_running_game(tmp_path):
+    """A changed file is picked up by the next poll and applied to the running game."""
+    filePath = tmp_path / 'settings.toml'
+    writeSettings(filePath, 'meteorSpawnRate = 1.0\n')
+    config = gC.GameConfig(str(filePath))
+    config.load()
+    game = main.Shooter(headless=True)
+    game.reset(seed=1)
+    game.difficultyLevel = 2
+
+    # 1. The file changes while the game runs.
+    writeSettings(filePath, 'meteorSpawnRate = 0.5\ndifficultyIncrement = 20\n')
+    changed = config.poll()
+    assert {'meteorSpawnRate', 'difficultyIncrement', 'difficultyMultiplier'} <= changed
+    game.applySettings(changed)
+
+    # 2. The derived multiplier and the game's own copy of the spawn rate follow it.
+    assert gS.difficultyMultiplier == pytest.approx(0.8)
+    assert game.meteorSpawnRate == pytest.approx(0.5 * 0.8 ** 2)
+
+    # 3. An unchanged file is not applied again.
+    assert config.poll() == set()
@@ -0,0 +1,23 @@
+# =====================================================================
+# METEOR DODGER - LEADERBOARD TESTS
+# =====================================================================
+
+# --- Standard Library Imports ---
+from os import path  # Used to work out the project folder.
+
+# --- Local Application Imports ---
+import leaderboard as lB
+
+
+def test_legacy_file_is_read_from_the_project_folder(tmp_path, monkeypatch):
+    """The old high score file is looked for in the project folder, whatever the working directory."""
+    projectRoot = path.dirname(path.dirname(path.dirname(path.abspath(__file__))))
+    monkeypatch.chdir(tmp_path)
+    (tmp_path / 'highscore.txt').write_text('7')
+
+    board = lB.Leaderboard(filePath=str(tmp_path / 'leaderboard.db'))
+    assert board.ready.wait(5)
+    assert board.legacyFile == path.join(projectRoot, 'highscore.txt')
+    # The file of the same name in the working directory was not imported.
+    assert 7 not in [run['score'] for run in board.top()]
+    board.close()
@@ -0,0 +1,61 @@
+# =====================================================================
+# METEOR DODGER - OBJECT POOL TESTS
+# =====================================================================
+
+# --- Third-Party Imports ---
+import pygame  # Used for the sprite base class and groups.
+import pytest  # Used to check that an incomplete pooled class is rejected.
+
+# --- Local Application Imports ---
+import objectPool as oP
+
+
+class Dot(oP.Pooled, pygame.sprite.Sprite):
+    """A minimal pooled sprite that remembers its spawn position."""
+
+    def __init__(self):
+        super().__init__()
+        self.position = None
+
+    def reset(self, x, y):
+        self.position = (x, y)
+
+
+def test_killed_object_is_reused():
+    """A killed object goes back to the free list and the next acquire() hands it out again."""
+    pool = oP.ObjectPool(Dot, size=1)
+    group = pygame.sprite.Group()
+    assert pool.stats() == {'size': 1, 'free': 1, 'inUse': 0, 'highWater': 0, 'allocationsAvoided': 0}
+
+    # 1. The pre-filled object is handed out and reset.
+    first = pool.acquire(1, 2)
+    group.add(first)
+    assert first.position == (1, 2)
+    assert pool.stats() == {'size': 1, 'free': 0, 'inUse': 1, 'highWater': 1, 'allocationsAvoided': 1}
+
+    # 2. Killing it returns it to the pool, once.
+    first.kill()
+    first.kill()
+    assert pool.stats() == {'size': 1, 'free': 1, 'inUse': 0, 'highWater': 1, 'allocationsAvoided': 1}
+
+    # 3. The same object comes back, reset for the new spawn.
+    again = pool.acquire(3, 4)
+    group.add(again)
+    assert again is first
+    assert again.position == (3, 4)
+    assert pool.stats() == {'size': 1, 'free': 0, 'inUse': 1, 'highWater': 1, 'allocationsAvoided': 2}
+
+    # 4. An empty free list creates a new object.
+    second = pool.acquire(5, 6)
+    assert second is not first
+    assert pool.stats() == {'size': 2, 'free': 0, 'inUse': 2, 'highWater': 2, 'allocationsAvoided': 2}
+
+
+def test_pooled_class_must_implement_reset():
+    """A pooled class without reset() can't be created."""
+
+    class Incomplete(oP.Pooled, pygame.sprite.Sprite):
+        pass
+
+    with pytest.raises(TypeError):
+        Incomplete()
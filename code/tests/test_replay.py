@@ -0,0 +1,86 @@
+# =====================================================================
+# METEOR DODGER - REPLAY TESTS
+# =====================================================================
+
+# --- Standard Library Imports ---
+import random  # Used for the seeded test input.
+
+# --- Third-Party Imports ---
+import pytest  # Used to run with both control schemes and to check errors.
+
+# --- Local Application Imports ---
+import gameSettings as gS
+import headless
+import main
+import replay as rP
+import worldState as wS
+
+
+def seededInput(seed, mouse):
+    """Returns an input source that moves, turns and shoots at random, the same way every time."""
+    rng = random.Random(seed)
+    state = {'keys': 0, 'mouse': (960, 900)}
+
+    def nextInput():
+        if rng.random() < 0.05:
+            state['keys'] = rng.randrange(16)
+            state['mouse'] = (rng.randint(0, gS.screenWidth), rng.randint(0, gS.screenHeight))
+        fires = int(rng.random() < 0.05)
+        if mouse:
+            return rP.TickInput(mouse=state['mouse'], fires=fires)
+        return rP.TickInput(keys=state['keys'], fires=fires)
+
+    return nextInput
+
+
+def recordSession(seed, steps):
+    """Plays a short headless session with seeded input. Returns the game and its replay bytes."""
+    game = main.Shooter(headless=True)
+    game.reset(seed=seed)
+    game.startRecording()
+    game.inputSource = seededInput(seed, gS.mouse)
+    for _ in range(steps):
+        game.step(1 / gS.simulationRate)
+        if game.gameOver:
+            break
+    return game, game.recorder.toBytes()
+
+
+@pytest.mark.parametrize('mouse', [False, True])
+def test_replay_reproduces_the_session(monkeypatch, mouse):
+    """A session encoded to bytes, decoded and replayed ends with the same score and state."""
+    monkeypatch.setattr(gS, 'mouse', mouse)
+    # playReplay() sets these from the replay; monkeypatch puts them back afterwards.
+    monkeypatch.setattr(gS, 'simulationRate', gS.simulationRate)
+
+    live, data = recordSession(seed=11, steps=1500)
+    recording = rP.Replay(data)
+    assert (recording.seed, recording.simulationRate, recording.mouse) == (11, gS.simulationRate, mouse)
+    assert len(recording) == live.recorder.ticks
+
+    replayed = main.Shooter(headless=True)
+    result = headless.playReplay(replayed, recording)
+    assert result['score'] == int(live.gameTime)
+    assert wS.checksum(wS.capture(replayed)) == wS.checksum(wS.capture(live))
+
+
+def test_damaged_replay_raises_value_error():
+    """A cut-off or corrupted file raises ValueError, not IndexError."""
+    _, data = recordSession(seed=3, steps=300)
+
+    # 1. A record with a mouse delta or a repeat count, cut off in the middle of its varint.
+    recorder = rP.ReplayRecorder(seed=0, simulationRate=120, mouse=True)
+    recorder.record(rP.TickInput(mouse=(5000, 5000), fires=1))
+    with pytest.raises(ValueError):
+        list(rP.Replay(recorder.toBytes()[:-2]).inputs())
+
+    # 2. A record with flags that are never written.
+    damaged = data[:rP.headerSize] + bytes([rP.unusedBits]) + data[rP.headerSize:]
+    with pytest.raises(ValueError):
+        list(rP.Replay(damaged).inputs())
+
+    # 3. A header that is cut off or isn't a replay's.
+    with pytest.raises(ValueError):
+        rP.Replay(data[:rP.headerSize - 1])
+    with pytest.raises(ValueError):
+        rP.Replay(b'NOPE' + data[4:])
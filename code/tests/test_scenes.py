@@ -0,0 +1,27 @@
+# =====================================================================
+# METEOR DODGER - SCENE TESTS
+# =====================================================================
+
+# --- Third-Party Imports ---
+import pygame  # Used to post window and key events.
+
+# --- Local Application Imports ---
+import gameSettings as gS
+import main
+
+
+def test_focus_regained_while_paused_restores_frame_rate():
+    """A window that gets focus back on the pause screen plays at full speed after resuming."""
+    game = main.Shooter(headless=True)
+    pygame.event.clear()
+
+    # 1. Losing focus pauses the game and drops it to the unfocused frame rate.
+    pygame.event.post(pygame.event.Event(pygame.WINDOWFOCUSLOST))
+    assert game.scenes.scenes['play'].run() == 'pause'
+    assert game.frameRate() == (gS.unfocusedFps, 'sleep')
+
+    # 2. The player resumes, and the focus comes back while the pause screen is still up.
+    pygame.event.post(pygame.event.Event(pygame.KEYDOWN, key=pygame.K_ESCAPE))
+    pygame.event.post(pygame.event.Event(pygame.WINDOWFOCUSGAINED))
+    assert game.scenes.scenes['pause'].run() == 'play'
+    assert game.frameRate() == (gS.fps, gS.framePacing)
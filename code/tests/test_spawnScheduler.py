@@ -0,0 +1,68 @@
+# =====================================================================
+# METEOR DODGER - SPAWN SCHEDULER TESTS
+# =====================================================================
+
+# --- Third-Party Imports ---
+import pytest  # Used to fix the interval variance and compare times.
+
+# --- Local Application Imports ---
+import gameSettings as gS
+import spawnScheduler as sS
+
+
+@pytest.fixture(autouse=True)
+def exactIntervals(monkeypatch):
+    """Turns off the random variance, so every interval is exactly its rate."""
+    monkeypatch.setattr(gS, 'randomProbability', 0)
+
+
+def register(scheduler, log, name, rate):
+    """
+    Registers a spawn type that notes each spawn in 'log'.
+
+    Each spawn is noted as (name, time it was due): the scheduler asks the rate
+    curve for the next interval at the time the spawn was due, right after it.
+    """
+    def curve(time):
+        log.append((name, time))
+        return rate(time)
+    scheduler.register(name, curve, lambda: None)
+    log.clear()
+
+
+def test_large_advance_fires_every_spawn_in_order():
+    """One long jump spawns once per interval passed, in time order, and keeps the overshoot."""
+    scheduler = sS.SpawnScheduler()
+    log = []
+    register(scheduler, log, 'ammo', lambda time: 2.0)
+    register(scheduler, log, 'meteor', lambda time: 0.5)
+
+    # 1. Ten meteors and two ammo packs are due by 5.2. At a tie the type queued first goes first.
+    assert scheduler.advance(5.2) == 12
+    expected = [('meteor', 0.5 * step) for step in range(1, 11)] + [('ammo', 2.0), ('ammo', 4.0)]
+    assert log == sorted(expected, key=lambda spawn: (spawn[1], spawn[0] != 'ammo'))
+    assert scheduler.types['meteor'].spawned == 10
+    assert scheduler.types['ammo'].spawned == 2
+
+    # 2. The next spawns follow from when the last ones were due, not from 5.2.
+    assert scheduler.nextSpawn() == (5.5, 'meteor')
+    assert scheduler.advance(5.4) == 0
+
+
+def test_changed_rates_apply_from_the_next_interval():
+    """A rate curve that changes inside a jump, or a reschedule, sets the intervals that follow."""
+    scheduler = sS.SpawnScheduler()
+    log = []
+    rates = {'meteor': 1.0}
+    # 1. As after difficulty(): the rate drops at 3 seconds, in the middle of the jump.
+    register(scheduler, log, 'meteor', lambda time: rates['meteor'] if time < 3 else rates['meteor'] / 2)
+    assert scheduler.advance(5.0) == 7
+    assert [time for _, time in log] == [1.0, 2.0, 3.0, 3.5, 4.0, 4.5, 5.0]
+
+    # 2. As after a settings reload: the pending spawn is replaced by one at the new rate.
+    rates['meteor'] = 0.5
+    scheduler.reschedule(5.2)
+    assert scheduler.nextSpawn() == (pytest.approx(5.45), 'meteor')
+    log.clear()
+    assert scheduler.advance(6.0) == 3
+    assert [time for _, time in log] == pytest.approx([5.45, 5.7, 5.95])
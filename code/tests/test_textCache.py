@@ -0,0 +1,28 @@
+# =====================================================================
+# METEOR DODGER - TEXT CACHE TESTS
+# =====================================================================
+
+# --- Third-Party Imports ---
+import pygame  # Used for the surface the text is drawn on.
+
+# --- Local Application Imports ---
+import main
+
+
+def test_hit_rate_is_shown_in_the_overlay():
+    """The text cache's hit rate and the HUD's reused draws are listed in the F3 overlay."""
+    game = main.Shooter(headless=True)
+    ui = game.ui
+    surface = pygame.Surface((100, 100))
+
+    # 1. The same text twice: one miss, then one hit.
+    ui.drawText(surface, "Game Over", (50, 50))
+    ui.drawText(surface, "Game Over", (50, 50))
+    # 2. The same score twice: the second draw reuses the widget's surface without a lookup.
+    ui.scoreText.draw(surface, 3)
+    ui.scoreText.draw(surface, 3)
+
+    lines = game.overlayDetails()
+    assert lines[0].startswith("text cache 33.3% hits (1 of 3)")
+    assert lines[1] == "hud text   1 draws reused"
+    assert lines[0] in game.profiler._statText()
@@ -0,0 +1,140 @@
+# =====================================================================
+# METEOR DODGER - TEXT RENDER CACHE
+# =====================================================================
+# Rendering text with pygame's font module is slow compared to a blit.
+# TextCache keeps recently rendered text surfaces in a bounded LRU cache,
+# and HudText is a HUD widget that only re-renders when its value changes,
+# so drawing an unchanged HUD costs one blit per line.
+
+# --- Standard Library Imports ---
+from collections import OrderedDict  # Used to keep cache entries in least-recently-used order.
+
+
+class TextCache:
+    """
+    A bounded least-recently-used cache of rendered text surfaces.
+
+    Entries are keyed by (text, color, font, antialias). When the cache is
+    full, the entry that was used least recently is dropped.
+    """
+
+    def __init__(self, maxSize=128):
+        """
+        Initializes an empty cache.
+
+        Args:
+            maxSize (int): The largest number of rendered surfaces to keep.
+        """
+        self.maxSize = maxSize
+        self.entries = OrderedDict()
+        # Lookup counters used to report the hit rate.
+        self.hits = 0
+        self.misses = 0
+
+    def render(self, font, text, color, antialias=True):
+        """
+        Returns the rendered surface for a piece of text, rendering it only on a miss.
+
+        Args:
+            font (pygame.font.Font): The font to render with.
+            text (str): The text to render.
+            color (tuple | str): The text color. Must be hashable (an RGB tuple or color name).
+            antialias (bool): Whether to render with anti-aliasing.
+
+        Returns:
+            pygame.Surface: The shared rendered text. Callers must not draw onto it.
+        """
+        key = (text, color, font, antialias)
+        entries = self.entries
+        surface = entries.get(key)
+        if surface is not None:
+            self.hits += 1
+            entries.move_to_end(key)
+            return surface
+
+        self.misses += 1
+        surface = font.render(text, antialias, color)
+        entries[key] = surface
+        if len(entries) > self.maxSize:
+            # Drop the least recently used entry.
+            entries.popitem(last=False)
+        return surface
+
+    @property
+    def hitRate(self):
+        """The fraction of lookups that were served from the cache (0.0 to 1.0)."""
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else 0.0
+
+    def clear(self):
+        """Removes every cached surface."""
+        self.entries.clear()
+
+    def stats(self):
+        """Returns a dictionary with the cache's size and lookup counters."""
+        return {
+            'size': len(self.entries),
+            'maxSize': self.maxSize,
+            'hits': self.hits,
+            'misses': self.misses,
+            'hitRate': self.hitRate,
+        }
+
+    def report(self):
+        """Returns the statistics as lines of text, for the profiler overlay."""
+        return [f"text cache {self.hitRate:.1%} hits ({self.hits} of {self.hits + self.misses}), "
+                f"{len(self.entries)}/{self.maxSize} kept"]
+
+
+class HudText:
+    """
+    A single line of HUD text that shows a changing value (e.g., 'Score: 12').
+
+    The widget remembers the last value it rendered and keeps the rendered
+    surface, so it only asks the text cache for a new surface when the value
+    actually changes.
+    """
+
+    def __init__(self, cache, font, template, center, color=(255, 255, 255)):
+        """
+        Initializes the widget.
+
+        Args:
+            cache (TextCache): The cache used to render the text.
+            font (pygame.font.Font): The font to render with.
+            template (str): A format string with one '{}' for the value (e.g., 'Score: {}').
+            center (tuple): The (x, y) center position of the text.
+            color (tuple | str): The text color.
+        """
+        self.cache = cache
+        self.font = font
+        self.template = template
+        self.center = center
+        self.color = color
+        # The value shown and its rendered surface and position.
+        self.value = None
+        self.surface = None
+        self.rect = None
+        # The number of draws that reused the held surface without asking the cache.
+        self.reuses = 0
+
+    def draw(self, surface, value):
+        """
+        Draws the widget, re-rendering the text only if the value changed.
+
+        Args:
+            surface (pygame.Surface): The surface to draw on.
+            value: The value to show.
+
+        Returns:
+            pygame.Rect: The area covered by the text.
+        """
+        if value != self.value or self.surface is None:
+            self.value = value
+            self.surface = self.cache.render(self.font, self.template.format(value), self.color)
+            self.rect = self.surface.get_rect(center=self.center)
+        else:
+            # No cache lookup happens here, so this is counted by the widget, not the cache.
+            self.reuses += 1
+        surface.blit(self.surface, self.rect)
+        return self.rect
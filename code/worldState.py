@@ -0,0 +1,357 @@
+# =====================================================================
+# METEOR DODGER - WORLD STATE
+# =====================================================================
+# Captures everything a simulation step reads and writes (timers, spawn
+# rates, ammo, every ship, every falling object, laser and explosion, the
+# pending spawns and both random number streams) as plain tuples of
+# numbers, and puts a game back into a captured state.
+#
+# Netplay saves the state before every step so it can roll back to the
+# step where a remote input was mispredicted and re-simulate from there.
+# History keeps the last few seconds of states, for rewinding, and save()
+# and load() keep one on disk (quick save and quick load).
+#
+# Capturing and restoring take microseconds:
+#   * The random number streams are RandomStreams, which only copy their
+#     state after they were drawn from. Objects only spawn a few times a
+#     second, so most states share the same copy.
+#   * Restoring moves the sprites that are already alive into place, and
+#     only takes sprites from (or returns them to) the pools when the
+#     numbers differ, so it allocates nothing once the pools are warm.
+# Settings (speeds, rates in gameSettings.py) are not part of the state.
+
+# --- Standard Library Imports ---
+import marshal  # Used to turn a state into bytes for checksums and save files.
+import os  # Used to create the folder a save file is written into.
+import random  # Used as the base of the game's random number streams.
+import struct  # Used to pack the save file header.
+import zlib  # Used for the state checksum and to compress save files.
+
+# --- Local Application Imports ---
+import replay as rP
+
+# The sprite groups of objects restored from the pools, by kind, in state order.
+spriteKinds = ('laser', 'meteor', 'ammo', 'health', 'life')
+# The game attributes that are plain numbers, in state order.
+scalarNames = (
+    'gameTime', 'gameOver', 'ammo', 'difficultyTime', 'difficultyLevel', 'meteorSpawnRate',
+    'ammoSpawnRate', 'healthSpawnRate', 'lifeSpawnRate', 'ammoIncrement', 'stormCarry', 'seed',
+)
+
+# The save file signature and format version, followed by the zlib-compressed state.
+magic = b'MDWS'
+formatVersion = 1
+headerFormat = '<4sH'
+headerSize = struct.calcsize(headerFormat)
+# marshal format 2 writes shared objects out in full every time, so equal states always give
+# equal bytes. Later formats refer back to objects already written, which depends on identity.
+marshalVersion = 2
+
+
+class RandomStream(random.Random):
+    """
+    A random.Random that knows when its state last changed, so capturing it
+    costs nothing until it is drawn from again.
+
+    getstate() copies all 625 words of the generator's state, which takes
+    far longer than the rest of a capture put together.
+    """
+
+    # Bumped whenever the state changes.
+    version = 0
+    # The last captured state and the version it was captured at.
+    captured = None
+    capturedVersion = -1
+
+    def seed(self, *args, **kwargs):
+        super().seed(*args, **kwargs)
+        self.version += 1
+
+    def setstate(self, state):
+        super().setstate(state)
+        self.version += 1
+
+    def random(self):
+        self.version += 1
+        return super().random()
+
+    def getrandbits(self, k):
+        # randint() and the other integer methods draw through here.
+        self.version += 1
+        return super().getrandbits(k)
+
+    def capture(self):
+        """Returns the stream's state, copying it only if it changed since the last capture."""
+        if self.capturedVersion != self.version:
+            self.captured = self.getstate()
+            self.capturedVersion = self.version
+        return self.captured
+
+    def restore(self, state):
+        """Puts the stream back into a captured state (nothing to do if it is already in it)."""
+        if state is self.captured and self.capturedVersion == self.version:
+            return
+        self.setstate(state)
+        self.captured = state
+        self.capturedVersion = self.version
+
+
+def spriteGroups(game):
+    """Returns the sprite group of each kind in spriteKinds, in the same order."""
+    return (game.lasers, game.meteors, game.ammoG, game.healthG, game.lifeG)
+
+
+def capture(game):
+    """
+    Captures the game's simulation state.
+
+    Args:
+        game (Shooter): The game.
+
+    Returns:
+        tuple: The state. It only holds numbers, strings, bytes and tuples, so it is
+            immutable and can be written with marshal (see toBytes()).
+    """
+    # 1. Timers, rates and counters.
+    scalars = tuple(getattr(game, name) for name in scalarNames)
+
+    # 2. The ships: position, interpolation start, health, whether it is in play and its animation.
+    players = []
+    for player in game.players:
+        animator = player.animator
+        players.append((
+            player.rect.x, player.rect.y, player.previous, player.health, player.alive(),
+            None if animator is None else (animator.index, animator.elapsed),
+        ))
+
+    # 3. Every sprite: top-left position, interpolation start and speed (lasers use the setting).
+    lasers, *droppings = spriteGroups(game)
+    groups = (tuple((laser.rect.x, laser.rect.y, laser.previous, None) for laser in lasers),) + tuple(
+        tuple((sprite.rect.x, sprite.rect.y, sprite.previous, sprite.speed) for sprite in group)
+        for group in droppings
+    )
+    explosions = tuple(
+        (explosion.rect.x, explosion.rect.y, explosion.animator.index, explosion.animator.elapsed)
+        for explosion in game.explosions
+    )
+
+    # 4. The NumPy entity store, if it is in use.
+    entities = None if game.entities is None else game.entities.snapshot()
+
+    # 5. The spawn queue and the random number streams.
+    spawner = game.spawner
+    spawns = (tuple(spawner.queue), spawner.order,
+              tuple(spawnType.spawned for spawnType in spawner.types.values()))
+    return (scalars, tuple(players), groups, explosions, entities, spawns,
+            game.rng.capture(), spawner.rng.capture())
+
+
+def restore(game, state):
+    """
+    Puts the game back into a captured state.
+
+    Args:
+        game (Shooter): The game the state was captured from (or one built with the same settings).
+        state (tuple): A state returned by capture().
+    """
+    scalars, players, groups, explosions, entities, spawns, rngState, spawnRngState = state
+    for name, value in zip(scalarNames, scalars):
+        setattr(game, name, value)
+
+    # 1. The ships. A ship that was out of play is taken out of (or put back into) the sprite group.
+    for player, (x, y, previous, health, alive, animation) in zip(game.players, players):
+        player.rect.topleft = (x, y)
+        player.previous = previous
+        player.health = health
+        if alive and not player.alive():
+            game.allSprites.add(player)
+        elif not alive and player.alive():
+            player.kill()
+        if animation is not None:
+            animator = player.animator
+            animator.index, animator.elapsed = animation
+            player.image, player.mask = animator.image, animator.mask
+
+    # 2. Sprites: move the live ones into place, then return the extra ones to their pools
+    # or take the missing ones out. Group order (which decides collision order) is kept.
+    allSprites = game.allSprites
+    for kind, group, sprites in zip(spriteKinds, spriteGroups(game), groups):
+        live = group.sprites()
+        for sprite in live[len(sprites):]:
+            sprite.kill()
+        for index in range(len(live), len(sprites)):
+            sprite = game.pools[kind].acquire(game.assets.get(f'{kind}.png'), 0, 0)
+            group.add(sprite)
+            allSprites.add(sprite)
+            live.append(sprite)
+        for sprite, (x, y, previous, speed) in zip(live, sprites):
+            sprite.rect.topleft = (x, y)
+            sprite.previous = previous
+            if speed is not None:
+                sprite.speed = speed
+
+    live = game.explosions.sprites()
+    for explosion in live[len(explosions):]:
+        explosion.kill()
+    for index in range(len(live), len(explosions)):
+        explosion = game.pools['explosion'].acquire((0, 0))
+        game.explosions.add(explosion)
+        allSprites.add(explosion)
+        live.append(explosion)
+    for explosion, (x, y, index, elapsed) in zip(live, explosions):
+        explosion.rect.topleft = (x, y)
+        explosion.previous = explosion.rect.topleft
+        animator = explosion.animator
+        animator.index, animator.elapsed, animator.finished = index, elapsed, False
+        explosion.image = animator.image
+
+    # 3. The entity store.
+    if game.entities is not None:
+        game.entities.restore(entities)
+
+    # 4. The spawn queue and the random number streams.
+    spawner = game.spawner
+    queue, spawner.order, spawned = spawns
+    spawner.queue = list(queue)
+    for spawnType, count in zip(spawner.types.values(), spawned):
+        spawnType.spawned = count
+    game.rng.restore(rngState)
+    spawner.rng.restore(spawnRngState)
+
+
+def checksum(state):
+    """Returns a 32-bit checksum of a state, to check that two games are in step."""
+    return zlib.crc32(marshal.dumps(state, marshalVersion))
+
+
+def toBytes(value):
+    """
+    Returns a state (or any value made of the same plain types) as compact bytes.
+
+    Args:
+        value (tuple): The value, e.g. a state returned by capture().
+
+    Returns:
+        bytes: A header followed by the compressed value.
+    """
+    return struct.pack(headerFormat, magic, formatVersion) + zlib.compress(marshal.dumps(value, marshalVersion), 1)
+
+
+def fromBytes(data):
+    """
+    Reads a value written by toBytes().
+
+    Raises:
+        ValueError: If the data is not a saved state or uses an unknown format version.
+    """
+    if len(data) < headerSize:
+        raise ValueError("Not a saved game: the file is too short")
+    fileMagic, version = struct.unpack_from(headerFormat, data)
+    if fileMagic != magic:
+        raise ValueError("Not a saved game")
+    if version != formatVersion:
+        raise ValueError(f"Unsupported saved game version {version}")
+    try:
+        return marshal.loads(zlib.decompress(data[headerSize:]))
+    except (zlib.error, EOFError, TypeError, ValueError) as error:
+        raise ValueError(f"The saved game is damaged ({error})") from error
+
+
+def save(game, filePath):
+    """
+    Writes the game's state to a file (quick save), with the replay recorded so far.
+
+    Args:
+        game (Shooter): The game.
+        filePath (str): The file to write. Its folder is created if needed.
+    """
+    recording = None if game.recorder is None else game.recorder.continuation()
+    data = toBytes((len(game.players), capture(game), recording))
+    folder = os.path.dirname(filePath)
+    if folder:
+        os.makedirs(folder, exist_ok=True)
+    with open(filePath, 'wb') as f:
+        f.write(data)
+
+
+def load(game, filePath):
+    """
+    Puts the game into the state saved in a file (quick load).
+
+    A replay being recorded continues from the one saved with the state, so it
+    still plays back to the loaded state and beyond.
+
+    Args:
+        game (Shooter): The game, built with the same settings and number of players.
+        filePath (str): The file written by save().
+
+    Raises:
+        OSError: If the file can't be read.
+        ValueError: If the file is not a saved game or was saved with a different number of players.
+    """
+    with open(filePath, 'rb') as f:
+        players, state, recording = fromBytes(f.read())
+    if players != len(game.players):
+        raise ValueError(f"The game was saved with {players} players, not {len(game.players)}")
+    restore(game, state)
+    if game.recorder is not None:
+        # Without the inputs that led to the state, the replay can't reproduce it.
+        game.recorder = None if recording is None else rP.ReplayRecorder.resume(recording)
+
+
+class History:
+    """
+    A ring of the game's most recent states, one after each simulation step, for rewinding.
+
+    Each entry also remembers how far the replay recording had got, so rewinding
+    takes the rewound steps back out of the replay too.
+    """
+
+    def __init__(self, seconds, simulationRate):
+        """
+        Initializes an empty history.
+
+        Args:
+            seconds (float): How much game time is kept.
+            simulationRate (float): Simulation steps per second.
+        """
+        self.capacity = max(1, round(seconds * simulationRate))
+        self.entries = [None] * self.capacity
+        # The slot the next state goes into, and how many slots hold states.
+        self.next = 0
+        self.count = 0
+
+    def __len__(self):
+        return self.count
+
+    def clear(self):
+        """Forgets every state, e.g. when a new game starts."""
+        self.entries = [None] * self.capacity
+        self.next = 0
+        self.count = 0
+
+    def record(self, game):
+        """Keeps the game's current state, replacing the oldest one when the ring is full."""
+        recorder = game.recorder
+        self.entries[self.next] = (capture(game), None if recorder is None else recorder.mark())
+        self.next = (self.next + 1) % self.capacity
+        self.count = min(self.count + 1, self.capacity)
+
+    def rewind(self, game):
+        """
+        Puts the game back one step. The most recent state is the game's current one, so
+        it is forgotten and the game goes back to the one before it.
+
+        Returns:
+            bool: False if there was nothing left to rewind to.
+        """
+        if self.count < 2:
+            return False
+        self.next = (self.next - 1) % self.capacity
+        self.entries[self.next] = None
+        self.count -= 1
+        state, mark = self.entries[(self.next - 1) % self.capacity]
+        restore(game, state)
+        if game.recorder is not None and mark is not None:
+            game.recorder.rewindTo(mark)
+        return True